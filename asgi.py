@@ -0,0 +1,43 @@
+from contextlib import asynccontextmanager
+from fastapi import FastAPI
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.wsgi import WSGIMiddleware
+
+from app import create_app
+from backend.routes.asgi_routes import asgi_router
+from backend.services.aio import http_client
+
+
+@asynccontextmanager
+async def lifespan(_app):
+    yield
+    await http_client.close()
+
+
+def create_asgi_app():
+    """
+    App ASGI: los endpoints que esperan APIs externas corren sobre
+    asyncio; el resto de la API Flask se sirve montada como WSGI.
+
+    uvicorn asgi:app --port 5000
+    """
+    flask_app = create_app()
+
+    api = FastAPI(title="Travel Calculator API", lifespan=lifespan)
+    api.state.flask_app = flask_app
+
+    api.add_middleware(
+        CORSMiddleware,
+        allow_origins=["http://localhost:5173"],
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+
+    api.include_router(asgi_router, prefix="/api")
+    api.mount("/", WSGIMiddleware(flask_app))
+
+    return api
+
+
+app = create_asgi_app()
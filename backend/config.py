@@ -11,3 +11,103 @@ if not GOOGLE_MAPS_API_KEY:
 
 if not OPENWEATHER_API_KEY:
     print("⚠️ OPENWEATHER_API_KEY no encontrada")
+
+# Cliente HTTP compartido (timeouts en segundos)
+HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "3.05"))
+HTTP_READ_TIMEOUT = float(os.getenv("HTTP_READ_TIMEOUT", "10"))
+HTTP_MAX_RETRIES = int(os.getenv("HTTP_MAX_RETRIES", "2"))
+HTTP_BACKOFF_FACTOR = float(os.getenv("HTTP_BACKOFF_FACTOR", "0.3"))
+HTTP_POOL_MAXSIZE = int(os.getenv("HTTP_POOL_MAXSIZE", "10"))
+
+# Consultas paralelas del cálculo de viaje (timeouts en segundos)
+LOOKUP_MAX_WORKERS = int(os.getenv("LOOKUP_MAX_WORKERS", "12"))
+DISTANCE_LOOKUP_TIMEOUT = float(os.getenv("DISTANCE_LOOKUP_TIMEOUT", "8"))
+ELEVATION_LOOKUP_TIMEOUT = float(os.getenv("ELEVATION_LOOKUP_TIMEOUT", "5"))
+WEATHER_LOOKUP_TIMEOUT = float(os.getenv("WEATHER_LOOKUP_TIMEOUT", "4"))
+
+# Caché de distancias (Distance Matrix)
+DISTANCE_CACHE_PRECISION = int(os.getenv("DISTANCE_CACHE_PRECISION", "7"))  # geohash
+DISTANCE_CACHE_TTL = float(os.getenv("DISTANCE_CACHE_TTL", str(24 * 3600)))
+DISTANCE_CACHE_MAXSIZE = int(os.getenv("DISTANCE_CACHE_MAXSIZE", "10000"))
+
+# Caché de clima por celda geográfica
+WEATHER_CACHE_PRECISION = int(os.getenv("WEATHER_CACHE_PRECISION", "5"))  # geohash ~4.9 km
+WEATHER_CACHE_TTL = float(os.getenv("WEATHER_CACHE_TTL", "600"))
+WEATHER_CACHE_MAXSIZE = int(os.getenv("WEATHER_CACHE_MAXSIZE", "5000"))
+
+# Modelo digital de elevación local (tiles SRTM .hgt)
+DEM_TILES_DIR = os.getenv("DEM_TILES_DIR")
+
+# Matriz de distancias (muchos orígenes × muchos destinos)
+DISTANCE_MATRIX_MAX_ELEMENTS = int(os.getenv("DISTANCE_MATRIX_MAX_ELEMENTS", "2500"))
+DISTANCE_MATRIX_WORKERS = int(os.getenv("DISTANCE_MATRIX_WORKERS", "8"))
+
+# Perfil de elevación a lo largo de la ruta
+ROUTE_PROFILE_SAMPLES = int(os.getenv("ROUTE_PROFILE_SAMPLES", "256"))
+ROUTE_PROFILE_CACHE_TTL = float(os.getenv("ROUTE_PROFILE_CACHE_TTL", str(24 * 3600)))
+ROUTE_PROFILE_CACHE_MAXSIZE = int(os.getenv("ROUTE_PROFILE_CACHE_MAXSIZE", "2000"))
+
+# Tramos con velocidad media ≥ este valor se simulan como carretera
+HIGHWAY_SPEED_KMH = float(os.getenv("HIGHWAY_SPEED_KMH", "70"))
+
+# Estimador local de distancia (haversine × factor de circuidad)
+CIRCUITY_DEFAULT = float(os.getenv("CIRCUITY_DEFAULT", "1.3"))
+CIRCUITY_REGION_PRECISION = int(os.getenv("CIRCUITY_REGION_PRECISION", "3"))  # geohash ~156 km
+
+# Circuit breaker por API externa
+BREAKER_FAILURE_THRESHOLD = int(os.getenv("BREAKER_FAILURE_THRESHOLD", "5"))
+BREAKER_RECOVERY_TIMEOUT = float(os.getenv("BREAKER_RECOVERY_TIMEOUT", "30"))
+
+# Límites de salida por API: "tokens_por_segundo,ráfaga,presupuesto_diario"
+# (tasa y ráfaga > 0; presupuesto 0 = sin límite diario; Distance Matrix cuenta elementos)
+RATE_LIMITS = {
+    "google_distance_matrix": os.getenv("RATE_LIMIT_GOOGLE_DISTANCE_MATRIX", "500,1000,0"),
+    "google_directions": os.getenv("RATE_LIMIT_GOOGLE_DIRECTIONS", "50,100,0"),
+    "google_elevation": os.getenv("RATE_LIMIT_GOOGLE_ELEVATION", "50,100,0"),
+    "openweathermap": os.getenv("RATE_LIMIT_OPENWEATHERMAP", "1,60,30000"),
+    "nhtsa": os.getenv("RATE_LIMIT_NHTSA", "5,10,0"),
+}
+RATE_LIMIT_MAX_WAIT = float(os.getenv("RATE_LIMIT_MAX_WAIT", "2"))  # segundos en cola
+RATE_LIMIT_MAX_QUEUE = int(os.getenv("RATE_LIMIT_MAX_QUEUE", "50"))  # esperando a la vez
+
+# Máximo de viajes por request en /calculate/batch
+CALCULATE_BATCH_MAX_ROWS = int(os.getenv("CALCULATE_BATCH_MAX_ROWS", "10000"))
+
+# Máximo de celdas de la grilla en /calculate/sweep
+CALCULATE_SWEEP_MAX_CELLS = int(os.getenv("CALCULATE_SWEEP_MAX_CELLS", "200000"))
+
+# Itinerarios multi-parada (/trips/itinerary)
+ITINERARY_MAX_STOPS = int(os.getenv("ITINERARY_MAX_STOPS", "50"))
+ITINERARY_TIME_BUDGET = float(os.getenv("ITINERARY_TIME_BUDGET", "1.0"))  # segundos de optimización
+
+# Comparación de flota (/trips/compare)
+FLEET_COMPARE_MAX_K = int(os.getenv("FLEET_COMPARE_MAX_K", "100"))
+FLEET_COMPARE_CHUNK_CELLS = int(os.getenv("FLEET_COMPARE_CHUNK_CELLS", "1000000"))  # vehículos × tramos por pasada
+
+# Modo incertidumbre (Monte Carlo) de los cálculos de viaje
+UNCERTAINTY_SAMPLES = int(os.getenv("UNCERTAINTY_SAMPLES", "10000"))
+UNCERTAINTY_MAX_SAMPLES = int(os.getenv("UNCERTAINTY_MAX_SAMPLES", "200000"))
+UNCERTAINTY_TIME_BUDGET = float(os.getenv("UNCERTAINTY_TIME_BUDGET", "0.25"))  # segundos (estimados)
+UNCERTAINTY_CHUNK_COST = float(os.getenv("UNCERTAINTY_CHUNK_COST", "0.01"))  # segundos por bloque; 0 = sin tope
+UNCERTAINTY_FUEL_PRICE_SD = float(os.getenv("UNCERTAINTY_FUEL_PRICE_SD", "0.05"))  # relativo al precio
+UNCERTAINTY_PAYLOAD_SD = float(os.getenv("UNCERTAINTY_PAYLOAD_SD", "0.10"))  # relativo al peso extra
+UNCERTAINTY_GRADE_SD = float(os.getenv("UNCERTAINTY_GRADE_SD", "0.5"))  # puntos porcentuales
+UNCERTAINTY_CLIMATE_KEEP = float(os.getenv("UNCERTAINTY_CLIMATE_KEEP", "0.7"))  # prob. de mantener el clima
+
+# Snapshot en memoria del catálogo de vehículos: se recarga al
+# cambiar el catálogo en este proceso o, como máximo, tras este TTL
+# (cambios hechos por otros procesos / scripts)
+VEHICLE_CATALOG_TTL = float(os.getenv("VEHICLE_CATALOG_TTL", "300"))
+
+# Historial de viajes (GET /trips): página por cursor y modo streaming
+TRIPS_PAGE_SIZE = int(os.getenv("TRIPS_PAGE_SIZE", "100"))
+TRIPS_PAGE_MAX = int(os.getenv("TRIPS_PAGE_MAX", "1000"))
+TRIPS_STREAM_YIELD_PER = int(os.getenv("TRIPS_STREAM_YIELD_PER", "500"))  # filas por fetch
+
+# Importación masiva de viajes (POST /trips/import)
+TRIP_IMPORT_CHUNK_SIZE = int(os.getenv("TRIP_IMPORT_CHUNK_SIZE", "1000"))  # filas por insert / commit
+TRIP_IMPORT_MAX_ERRORS = int(os.getenv("TRIP_IMPORT_MAX_ERRORS", "1000"))  # errores detallados en la respuesta
+
+# Exportación de viajes (GET /trips/export): filas por fetch del
+# cursor y por row group / record batch
+TRIP_EXPORT_BATCH_ROWS = int(os.getenv("TRIP_EXPORT_BATCH_ROWS", "10000"))
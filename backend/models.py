@@ -1,5 +1,18 @@
 from datetime import datetime
+from sqlalchemy.orm import validates
 from backend.extensions import db, bcrypt
+from backend.utils.text_utils import normalize
+
+
+def _normalized_default(column):
+    """
+    Default de columna normalizada para inserts sin pasar por el ORM
+    (bulk_insert_mappings, insert() de Core).
+    """
+    def default(context):
+        value = context.get_current_parameters().get(column)
+        return normalize(value) if value is not None else None
+    return default
 
 
 class User(db.Model):
@@ -41,6 +54,7 @@ class Vehicle(db.Model):
 
     __table_args__ = (
         db.UniqueConstraint("make", "model", "year", name="uq_vehicle_make_model_year"),
+        db.Index("ix_vehicle_normalized_lookup", "make_normalized", "model_normalized", "year"),
     )
 
     id = db.Column(db.Integer, primary_key=True)
@@ -49,6 +63,10 @@ class Vehicle(db.Model):
     model = db.Column(db.String(100), nullable=False)
     year = db.Column(db.Integer, nullable=False)
 
+    # make / model con normalize() (minúsculas, sin tildes) para búsquedas indexadas
+    make_normalized = db.Column(db.String(100), nullable=False, default=_normalized_default("make"))
+    model_normalized = db.Column(db.String(100), nullable=False, default=_normalized_default("model"))
+
     fuel_type = db.Column(db.String(50), nullable=False)
     engine_cc = db.Column(db.Integer)
     engine_cylinders = db.Column(db.Integer)
@@ -85,6 +103,12 @@ class Vehicle(db.Model):
             "transmission": self.transmission,
             "data_source": self.data_source,
         }
+
+    @validates("make", "model")
+    def _sync_normalized(self, key, value):
+        setattr(self, f"{key}_normalized", normalize(value) if value is not None else None)
+        return value
+
     def __repr__(self):
            return f"<Vehicle {self.make} {self.model} {self.year}>"
 
@@ -99,6 +123,11 @@ class UserVehicle(db.Model):
 class Trip(db.Model):
     __tablename__ = "trip"
 
+    __table_args__ = (
+        # historial por usuario con paginación keyset (user_id, id DESC)
+        db.Index("ix_trip_user_id_id", "user_id", "id"),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
 
     user_id = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=False)
@@ -153,6 +182,26 @@ class Trip(db.Model):
         }
 
 
+class TripSummary(db.Model):
+    """
+    Totales de viajes por usuario, mes y vehículo. Se mantiene en la
+    misma transacción que crea / borra el viaje (trip_summary_service).
+    """
+    __tablename__ = "trip_summary"
+
+    user_id = db.Column(db.Integer, db.ForeignKey("user.id", ondelete="CASCADE"), primary_key=True)
+    month = db.Column(db.Date, primary_key=True)  # primer día del mes (UTC)
+
+    brand = db.Column(db.String(100), primary_key=True)  # normalize()
+    model = db.Column(db.String(100), primary_key=True)
+    year = db.Column(db.Integer, primary_key=True)
+
+    trips = db.Column(db.Integer, nullable=False, default=0)
+    distance_km = db.Column(db.Float, nullable=False, default=0)
+    fuel_litres = db.Column(db.Float, nullable=False, default=0)
+    total_cost = db.Column(db.Float, nullable=False, default=0)
+
+
 class Role(db.Model):
     __tablename__ = "role"
 
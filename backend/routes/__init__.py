@@ -5,6 +5,9 @@ from .trip_routes import trip_bp
 from .distance_routes import distance_bp
 from .weather_routes import weather_bp
 from .elevation_routes import elevation_bp
+from .status_routes import status_bp
+from .itinerary_routes import itinerary_bp
+from .fleet_routes import fleet_bp
 
 main_bp = Blueprint("main_bp", __name__)
 
@@ -14,6 +17,9 @@ main_bp.register_blueprint(trip_bp)
 main_bp.register_blueprint(distance_bp)
 main_bp.register_blueprint(weather_bp)
 main_bp.register_blueprint(elevation_bp)
+main_bp.register_blueprint(status_bp)
+main_bp.register_blueprint(itinerary_bp)
+main_bp.register_blueprint(fleet_bp)
 
 @main_bp.route("/", methods=["GET"])
 def home():
@@ -0,0 +1,246 @@
+from fastapi import APIRouter, Request
+from fastapi.responses import JSONResponse
+from starlette.concurrency import run_in_threadpool
+from flask_jwt_extended import decode_token
+from sqlalchemy.exc import SQLAlchemyError
+from backend.models import db
+from backend.services.aio.distance_service import get_distance_km
+from backend.services.aio.directions_service import get_directions_route
+from backend.services.aio.elevation_service import get_elevations
+from backend.services.aio.weather_service import get_weather_from_coords
+from backend.services.aio.nhtsa_service import get_all_makes, get_models_for_make
+from backend.services.aio.route_context_service import fetch_route_context
+from backend.services.brand_service import (
+    brand_options,
+    fallback_brand_options,
+    resolve_allowed_make,
+    model_options,
+)
+from backend.services.nhtsa_service import NhtsaError
+from backend.services.resilience import UPSTREAM_UNAVAILABLE
+from backend.services.trip_service import (
+    TripInputError,
+    parse_calculate_and_save_input,
+    find_vehicle,
+    save_calculated_trip,
+)
+from backend.services.weather_service import weather_fallback
+from backend.utils.geo import parse_lat_lng
+from backend.utils.polyline import decode_polyline, encode_polyline, simplify_polyline
+
+# Variantes asyncio de los endpoints que esperan APIs externas.
+# Mismas rutas y respuestas que los blueprints Flask equivalentes.
+asgi_router = APIRouter()
+
+
+def _error(message, status_code):
+    return JSONResponse({"error": message}, status_code=status_code)
+
+
+def _in_app_context(flask_app, func, *args):
+    with flask_app.app_context():
+        return func(*args)
+
+
+# ===============================
+# DISTANCE
+# ===============================
+@asgi_router.get("/distance")
+async def get_distance(request: Request):
+    origin = request.query_params.get("origin")
+    destination = request.query_params.get("destination")
+
+    if not origin or not destination:
+        return _error("Parámetros 'origin' y 'destination' son requeridos", 400)
+
+    try:
+        tolerance_m = float(request.query_params.get("simplify", 0))
+    except ValueError:
+        return _error("Parámetro 'simplify' debe ser numérico (metros)", 400)
+
+    try:
+        distance_km = await get_distance_km(
+            parse_lat_lng(origin) or origin,
+            parse_lat_lng(destination) or destination,
+        )
+
+        route = await get_directions_route(origin, destination)
+        route_polyline = route["overview_polyline"]["points"]
+        response = {"distance_km": distance_km}
+
+        if tolerance_m > 0:
+            coords = decode_polyline(route_polyline)
+            simplified = simplify_polyline(coords, tolerance_m)
+            route_polyline = encode_polyline(simplified)
+            response.update({
+                "simplify_tolerance_m": tolerance_m,
+                "points_original": len(coords),
+                "points": len(simplified),
+            })
+
+        response["route_polyline"] = route_polyline
+        return response
+
+    except Exception as e:
+        return _error(str(e), 500)
+
+
+# ===============================
+# ELEVATION
+# ===============================
+@asgi_router.get("/elevation")
+async def get_elevation(request: Request):
+    origin = request.query_params.get("origin")
+    destination = request.query_params.get("destination")
+    locations = request.query_params.get("locations")
+
+    if locations:
+        raw_points = locations.split("|")
+    elif origin and destination:
+        raw_points = [origin, destination]
+    else:
+        return _error("Faltan parámetros 'origin' y 'destination'", 400)
+
+    points = [parse_lat_lng(p) for p in raw_points]
+    if any(p is None for p in points):
+        return _error("Coordenadas inválidas, formato esperado 'lat,lng'", 400)
+
+    try:
+        elevations, source = await get_elevations(points)
+
+        return {
+            "status": "OK",
+            "source": source,
+            "results": [
+                {"elevation": elevation, "location": point}
+                for elevation, point in zip(elevations, points)
+            ],
+        }
+
+    except Exception as e:
+        return _error(str(e), 500)
+
+
+# ===============================
+# WEATHER
+# ===============================
+@asgi_router.get("/weather")
+async def get_weather(request: Request):
+    lat = request.query_params.get("lat")
+    lng = request.query_params.get("lng")
+
+    if not lat or not lng:
+        return _error("Faltan parámetros de latitud o longitud", 400)
+
+    try:
+        return await get_weather_from_coords({"lat": float(lat), "lng": float(lng)})
+
+    except Exception as e:
+        print(f"❌ [ERROR] /weather: {e}")
+        return {**weather_fallback("fallback_due_to_exception"), "error": str(e)}
+
+
+# ===============================
+# CARS (NHTSA)
+# ===============================
+@asgi_router.get("/cars/brands")
+async def get_car_brands():
+    try:
+        all_brands = await get_all_makes()
+    except NhtsaError:
+        return JSONResponse([], status_code=500)
+    except UPSTREAM_UNAVAILABLE:
+        return fallback_brand_options()
+    except Exception as e:
+        return _error(str(e), 500)
+
+    return brand_options(all_brands)
+
+
+@asgi_router.get("/cars/models")
+async def get_car_models(request: Request):
+    make = request.query_params.get("make_id")
+    if not make:
+        return _error("Falta el parámetro make_id", 400)
+
+    mapped_make = resolve_allowed_make(make)
+    if mapped_make is None:
+        return _error(f"Marca '{make}' no permitida", 400)
+
+    try:
+        models = await get_models_for_make(mapped_make)
+    except NhtsaError:
+        return JSONResponse([], status_code=500)
+    except Exception as e:
+        return _error(str(e), 500)
+
+    return model_options(models)
+
+
+# ===============================
+# CALCULATE AND SAVE
+# ===============================
+def _current_user_id(authorization):
+    """
+    Valida el JWT (mismo secreto y formato que flask_jwt_extended).
+    """
+    if not authorization or not authorization.startswith("Bearer "):
+        raise PermissionError("Missing Authorization Header")
+
+    return decode_token(authorization[len("Bearer "):])["sub"]
+
+
+def _lookup_vehicle_id(trip_input):
+    vehicle = find_vehicle(trip_input["brand"], trip_input["model"], trip_input["year"])
+    return vehicle.id if vehicle else None
+
+
+def _save(user_id, trip_input, route_context):
+    try:
+        vehicle = find_vehicle(trip_input["brand"], trip_input["model"], trip_input["year"])
+        return save_calculated_trip(user_id, trip_input, vehicle, route_context)
+    except SQLAlchemyError:
+        db.session.rollback()
+        raise
+
+
+@asgi_router.post("/trips/calculate-and-save")
+async def calculate_and_save_trip(request: Request):
+    flask_app = request.app.state.flask_app
+
+    try:
+        user_id = await run_in_threadpool(
+            _in_app_context, flask_app, _current_user_id, request.headers.get("Authorization")
+        )
+    except Exception as e:
+        return JSONResponse({"msg": str(e)}, status_code=401)
+
+    try:
+        try:
+            trip_input = parse_calculate_and_save_input(await request.json())
+        except TripInputError as e:
+            return _error(str(e), 400)
+
+        vehicle_id = await run_in_threadpool(_in_app_context, flask_app, _lookup_vehicle_id, trip_input)
+        if vehicle_id is None:
+            return _error("Vehículo no encontrado", 404)
+
+        # ⚡ Distancia, elevación y clima concurrentes en el event loop
+        route_context = await fetch_route_context(
+            trip_input["origin"],
+            trip_input["destination"],
+            estimate_only=trip_input["estimate_only"],
+        )
+
+        result = await run_in_threadpool(
+            _in_app_context, flask_app, _save, user_id, trip_input, route_context
+        )
+        return JSONResponse(result, status_code=201)
+
+    except SQLAlchemyError as e:
+        print("❌ DB error:", e)
+        return _error("Error de base de datos", 500)
+
+    except Exception as e:
+        print("❌ Error cálculo viaje:", e)
+        return _error(str(e), 500)
@@ -1,39 +1,22 @@
-import os
-import json
-import requests
-import unicodedata
 from flask import Blueprint, request, jsonify
 from flask_cors import cross_origin
-from backend.extensions import cache, db
-from backend.models import Vehicle
+from backend.extensions import cache
+from backend.services.brand_service import (
+    NORMALIZED_BRAND_MAP,
+    brand_options,
+    fallback_brand_options,
+    resolve_allowed_make,
+    model_options,
+)
+from backend.services.nhtsa_service import get_all_makes, get_models_for_make, NhtsaError
+from backend.services.resilience import UPSTREAM_UNAVAILABLE
+from backend.services.trip_service import find_vehicle
+from backend.services.vehicle_catalog import get_vehicle_catalog
+from backend.utils.text_utils import normalize
 
 car_bp = Blueprint("car_bp", __name__)
-NHTSA_BASE_URL = "https://vpic.nhtsa.dot.gov/api/vehicles"
-
-# ===============================
-# CARGA DE CONFIGURACIÓN
-# ===============================
-TOP_BRANDS_PATH = os.path.join(os.path.dirname(__file__), "../data/top_50_brands.json")
-NORMALIZED_MAP_PATH = os.path.join(os.path.dirname(__file__), "../data/normalized_brands.json")
-
-with open(TOP_BRANDS_PATH, encoding="utf-8") as f:
-    ALLOWED_BRANDS_ORIGINAL = json.load(f)
-
-with open(NORMALIZED_MAP_PATH, encoding="utf-8") as f:
-    NORMALIZED_BRAND_MAP = json.load(f)
-
-ALLOWED_BRANDS_NORMALIZED = set(NORMALIZED_BRAND_MAP.keys())
 
 
-def normalize(text):
-    return (
-        unicodedata.normalize("NFKD", text)
-        .encode("ascii", "ignore")
-        .decode("utf-8")
-        .strip()
-        .lower()
-    )
-
 # ===============================
 # BRANDS
 # ===============================
@@ -41,21 +24,15 @@ def normalize(text):
 @cross_origin()
 def get_car_brands():
     try:
-        response = requests.get(f"{NHTSA_BASE_URL}/getallmakes?format=json")
-        if response.status_code != 200:
+        try:
+            all_brands = get_all_makes()
+        except NhtsaError:
             return jsonify([]), 500
+        except UPSTREAM_UNAVAILABLE:
+            # NHTSA caído o sin cuota → lista local de marcas permitidas
+            return jsonify(fallback_brand_options()), 200
 
-        all_brands = response.json().get("Results", [])
-        filtered = []
-
-        for b in all_brands:
-            make_name = b["Make_Name"]
-            norm = normalize(make_name)
-            if norm in ALLOWED_BRANDS_NORMALIZED:
-                original = NORMALIZED_BRAND_MAP[norm]
-                filtered.append({"label": original, "value": original})
-
-        return jsonify(sorted(filtered, key=lambda x: x["label"])), 200
+        return jsonify(brand_options(all_brands)), 200
 
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -72,22 +49,16 @@ def get_car_models():
         if not make:
             return jsonify({"error": "Falta el parámetro make_id"}), 400
 
-        normalized = normalize(make)
-        if normalized not in NORMALIZED_BRAND_MAP:
+        mapped_make = resolve_allowed_make(make)
+        if mapped_make is None:
             return jsonify({"error": f"Marca '{make}' no permitida"}), 400
 
-        mapped_make = NORMALIZED_BRAND_MAP[normalized]
-
-        response = requests.get(
-            f"{NHTSA_BASE_URL}/getmodelsformake/{mapped_make}?format=json"
-        )
-        if response.status_code != 200:
-            return jsonify([], 500)
-
-        models = response.json().get("Results", [])
-        result = [{"label": m["Model_Name"], "value": m["Model_Name"]} for m in models]
+        try:
+            models = get_models_for_make(mapped_make)
+        except NhtsaError:
+            return jsonify([]), 500
 
-        return jsonify(sorted(result, key=lambda x: x["label"])), 200
+        return jsonify(model_options(models)), 200
 
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -110,11 +81,7 @@ def get_model_details():
         norm_make = normalize(make)
         mapped_make = NORMALIZED_BRAND_MAP.get(norm_make, make)
 
-        vehicle = Vehicle.query.filter(
-            db.func.lower(Vehicle.make) == mapped_make.lower(),
-            db.func.lower(Vehicle.model) == model.lower(),
-            Vehicle.year == year
-        ).first()
+        vehicle = find_vehicle(mapped_make, model, year)
 
         if not vehicle:
             return jsonify({
@@ -146,7 +113,7 @@ def get_model_details():
 @car_bp.route("/vehicles", methods=["GET"])
 @cache.cached(timeout=300, key_prefix="all_vehicles")
 def get_vehicles():
-    vehicles = Vehicle.query.all()
+    vehicles = get_vehicle_catalog().records
     return jsonify([
         {
             "id": v.id,
@@ -1,7 +1,12 @@
 from flask import Blueprint, request, jsonify
 from flask_cors import cross_origin
-import requests
 import os
+import numpy as np
+from backend.config import DISTANCE_MATRIX_MAX_ELEMENTS
+from backend.services.distance_service import get_distance_km, get_distance_matrix_km
+from backend.services.directions_service import get_directions_route
+from backend.utils.geo import parse_lat_lng
+from backend.utils.polyline import decode_polyline, encode_polyline, simplify_polyline
 
 distance_bp = Blueprint("distance_bp", __name__)
 
@@ -11,6 +16,9 @@ def get_distance():
     """
     Calcula la distancia en kilómetros entre dos coordenadas usando Google Distance Matrix API,
     y retorna además la polilínea de la ruta mediante Google Directions API.
+
+    Query opcional `simplify=<metros>`: simplifica la polilínea
+    (Douglas–Peucker) con esa tolerancia antes de devolverla.
     """
     origin = request.args.get("origin")
     destination = request.args.get("destination")
@@ -18,40 +26,93 @@ def get_distance():
     if not origin or not destination:
         return jsonify({"error": "Parámetros 'origin' y 'destination' son requeridos"}), 400
 
+    try:
+        tolerance_m = float(request.args.get("simplify", 0))
+    except ValueError:
+        return jsonify({"error": "Parámetro 'simplify' debe ser numérico (metros)"}), 400
+
     try:
         GOOGLE_API_KEY = os.getenv("VITE_GOOGLE_MAPS_API_KEY")
         if not GOOGLE_API_KEY:
             return jsonify({"error": "Falta la clave de API de Google Maps"}), 500
 
-        # 📏 Obtener distancia con Distance Matrix API
-        distance_url = (
-            "https://maps.googleapis.com/maps/api/distancematrix/json"
-            f"?units=metric&origins={origin}&destinations={destination}&key={GOOGLE_API_KEY}"
+        # 📏 Distancia (Distance Matrix, con caché si son coordenadas)
+        distance_km = get_distance_km(
+            parse_lat_lng(origin) or origin,
+            parse_lat_lng(destination) or destination,
         )
-        distance_response = requests.get(distance_url)
-        distance_data = distance_response.json()
 
-        if distance_data["status"] != "OK" or distance_data["rows"][0]["elements"][0]["status"] != "OK":
-            return jsonify({"error": "Error en Google Distance Matrix API"}), 500
+        route = get_directions_route(origin, destination)
+        route_polyline = route["overview_polyline"]["points"]
+        original_points = None
 
-        distance_meters = distance_data["rows"][0]["elements"][0]["distance"]["value"]
-        distance_km = distance_meters / 1000.0
+        if tolerance_m > 0:
+            coords = decode_polyline(route_polyline)
+            simplified = simplify_polyline(coords, tolerance_m)
+            original_points = len(coords)
+            route_polyline = encode_polyline(simplified)
 
-        directions_url = (
-            "https://maps.googleapis.com/maps/api/directions/json"
-            f"?origin={origin}&destination={destination}&key={GOOGLE_API_KEY}"
-        )
-        directions_response = requests.get(directions_url)
-        directions_data = directions_response.json()
+        response = {
+            "distance_km": distance_km,
+            "route_polyline": route_polyline
+        }
+
+        if original_points is not None:
+            response["simplify_tolerance_m"] = tolerance_m
+            response["points_original"] = original_points
+            response["points"] = len(simplified)
+
+        return jsonify(response), 200
+
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+@distance_bp.route("/distance/matrix", methods=["POST"])
+@cross_origin()
+def get_distance_matrix():
+    """
+    Matriz densa de distancias (km) entre N orígenes y M destinos.
 
-        if directions_data["status"] != "OK":
-            return jsonify({"error": "Error en Google Directions API"}), 500
+    Body:
+    {
+        "origins": [{ "lat": float, "lng": float }, ...],
+        "destinations": [{ "lat": float, "lng": float }, ...]
+    }
+
+    Las celdas sin ruta se devuelven como null.
+    """
+    data = request.get_json(silent=True) or {}
+    origins = data.get("origins")
+    destinations = data.get("destinations")
 
-        route_polyline = directions_data["routes"][0]["overview_polyline"]["points"]
+    if not isinstance(origins, list) or not isinstance(destinations, list) or not origins or not destinations:
+        return jsonify({"error": "Parámetros 'origins' y 'destinations' deben ser listas no vacías"}), 400
 
+    if len(origins) * len(destinations) > DISTANCE_MATRIX_MAX_ELEMENTS:
         return jsonify({
-            "distance_km": distance_km,
-            "route_polyline": route_polyline
+            "error": f"La matriz supera el máximo de {DISTANCE_MATRIX_MAX_ELEMENTS} elementos"
+        }), 400
+
+    try:
+        origins = [{"lat": float(p["lat"]), "lng": float(p["lng"])} for p in origins]
+        destinations = [{"lat": float(p["lat"]), "lng": float(p["lng"])} for p in destinations]
+    except (KeyError, TypeError, ValueError):
+        return jsonify({"error": "Cada punto debe tener 'lat' y 'lng' numéricos"}), 400
+
+    try:
+        result = get_distance_matrix_km(origins, destinations)
+        matrix = result["distances_km"]
+
+        distances = np.where(np.isnan(matrix), None, np.round(matrix, 3)).tolist()
+
+        return jsonify({
+            "origins": len(origins),
+            "destinations": len(destinations),
+            "distances_km": distances,
+            "cache_hits": result["cache_hits"],
+            "api_calls": result["api_calls"],
+            "estimated_cells": result["estimated_cells"],
         }), 200
 
     except Exception as e:
@@ -1,34 +1,50 @@
 from flask import Blueprint, request, jsonify
 from flask_cors import cross_origin
-import requests
-import os
+from backend.services.elevation_service import get_elevations
 
 elevation_bp = Blueprint("elevation_bp", __name__)
 
+
+def _parse_point(text):
+    lat, lng = text.split(",")
+    return {"lat": float(lat), "lng": float(lng)}
+
+
 @elevation_bp.route("/elevation", methods=["GET"])
 @cross_origin()
 def get_elevation():
+    """
+    Elevación de origin/destination ("lat,lng") o de una lista
+    `locations` ("lat,lng|lat,lng|..."). Usa el DEM local y recurre
+    a Google Elevation solo fuera de las tiles cubiertas.
+    """
     origin = request.args.get("origin")
     destination = request.args.get("destination")
-    api_key = os.getenv("VITE_GOOGLE_MAPS_API_KEY")
+    locations = request.args.get("locations")
 
-    if not origin or not destination:
+    if locations:
+        raw_points = locations.split("|")
+    elif origin and destination:
+        raw_points = [origin, destination]
+    else:
         return jsonify({"error": "Faltan parámetros 'origin' y 'destination'"}), 400
-    if not api_key:
-        return jsonify({"error": "API Key de Google no configurada"}), 500
 
     try:
-        url = (
-            "https://maps.googleapis.com/maps/api/elevation/json"
-            f"?locations={origin}|{destination}&key={api_key}"
-        )
-        response = requests.get(url)
-        data = response.json()
+        points = [_parse_point(p) for p in raw_points]
+    except ValueError:
+        return jsonify({"error": "Coordenadas inválidas, formato esperado 'lat,lng'"}), 400
 
-        if data["status"] != "OK":
-            return jsonify({"error": "Error en Google Elevation API"}), 500
+    try:
+        elevations, source = get_elevations(points)
 
-        return jsonify(data), 200
+        return jsonify({
+            "status": "OK",
+            "source": source,
+            "results": [
+                {"elevation": elevation, "location": point}
+                for elevation, point in zip(elevations, points)
+            ],
+        }), 200
 
     except Exception as e:
         return jsonify({"error": str(e)}), 500
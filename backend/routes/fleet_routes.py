@@ -0,0 +1,89 @@
+from flask import Blueprint, request, jsonify
+from flask_jwt_extended import jwt_required
+from flask_cors import cross_origin
+from sqlalchemy.exc import SQLAlchemyError
+from backend.config import FLEET_COMPARE_MAX_K
+from backend.services.fleet_service import FleetFilterError, fleet_mask, compare_fleet
+from backend.services.route_context_service import fetch_route_context
+from backend.services.trip_service import PASSENGER_WEIGHT
+from backend.services.vehicle_coefficients import get_coefficient_table
+from backend.utils.text_utils import parse_bool
+
+fleet_bp = Blueprint("fleet_bp", __name__)
+
+
+@fleet_bp.route("/trips/compare", methods=["POST"])
+@cross_origin()
+@jwt_required()
+def compare_fleet_for_route():
+    """
+    Ranking de vehículos del catálogo por consumo para una ruta.
+
+    Body:
+    {
+        "origin": { lat, lng }, "destination": { lat, lng },
+        "passengers": int, "extra_weight": float, "fuel_price": float,
+        "estimate_only": bool,
+        "filters": { "make", "year", "fuel_type" },   # opcional
+        "top_k": int                                  # default 10
+    }
+
+    La ruta (distancia, perfil, clima) se resuelve una sola vez.
+    """
+    data = request.get_json(silent=True) or {}
+
+    for field in ["origin", "destination"]:
+        if field not in data:
+            return jsonify({"error": f"Falta el campo '{field}'"}), 400
+
+    try:
+        origin = {"lat": float(data["origin"]["lat"]), "lng": float(data["origin"]["lng"])}
+        destination = {"lat": float(data["destination"]["lat"]), "lng": float(data["destination"]["lng"])}
+        passengers = int(data.get("passengers", 0))
+        extra_weight = float(data.get("extra_weight", 0))
+        fuel_price = float(data.get("fuel_price", 0))
+        top_k = min(max(1, int(data.get("top_k", 10))), FLEET_COMPARE_MAX_K)
+        estimate_only = parse_bool(data.get("estimate_only", False))
+    except (KeyError, TypeError, ValueError):
+        return jsonify({"error": "Valores inválidos en la solicitud"}), 400
+
+    try:
+        table = get_coefficient_table()
+
+        try:
+            mask = fleet_mask(table, data.get("filters"))
+        except FleetFilterError as e:
+            return jsonify({"error": str(e)}), 400
+
+        # ⚡ Distancia, elevación y clima en paralelo (una vez para toda la flota)
+        route_context = fetch_route_context(origin, destination, estimate_only=estimate_only)
+
+        evaluated, results = compare_fleet(
+            table,
+            mask,
+            route_context,
+            extra_weight=max(0, extra_weight + passengers * PASSENGER_WEIGHT),
+            fuel_price=fuel_price,
+            top_k=top_k,
+        )
+
+        return jsonify({
+            "route": {
+                "distance": round(route_context["distance_km"], 2),
+                "distanceSource": route_context["distance_source"],
+                "climbM": route_context["climb_m"],
+                "descentM": route_context["descent_m"],
+                "elevationSource": route_context["elevation_source"],
+                "weather": route_context["weather"]["climate"],
+            },
+            "evaluated": evaluated,
+            "results": results,
+        }), 200
+
+    except SQLAlchemyError as db_err:
+        print(f"❌ SQLAlchemy error: {db_err}")
+        return jsonify({"error": "Error interno de base de datos"}), 500
+
+    except Exception as e:
+        print(f"❌ Error general en /trips/compare: {e}")
+        return jsonify({"error": str(e)}), 500
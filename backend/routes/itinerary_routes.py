@@ -0,0 +1,93 @@
+from flask import Blueprint, request, jsonify
+from flask_jwt_extended import jwt_required
+from flask_cors import cross_origin
+from sqlalchemy.exc import SQLAlchemyError
+from backend.config import ITINERARY_MAX_STOPS
+from backend.services.itinerary_service import plan_itinerary
+from backend.services.trip_service import PASSENGER_WEIGHT
+from backend.services.vehicle_coefficients import get_coefficient_table
+from backend.services.weather_service import get_weather_from_coords
+from backend.utils.text_utils import parse_bool
+
+itinerary_bp = Blueprint("itinerary_bp", __name__)
+
+
+@itinerary_bp.route("/trips/itinerary", methods=["POST"])
+@cross_origin()
+@jwt_required()
+def optimize_itinerary():
+    """
+    Orden de visita más barato para una lista de paradas.
+
+    Body:
+    {
+        "brand", "model", "year",
+        "stops": [{ "lat": float, "lng": float }, ...],   # la primera es el inicio
+        "passengers": int, "extra_weight": float, "fuel_price": float,
+        "return_to_start": bool,
+        "climate": str    # opcional; por defecto el clima en la primera parada
+    }
+    """
+    data = request.get_json(silent=True) or {}
+
+    for field in ["brand", "model", "year", "stops"]:
+        if field not in data:
+            return jsonify({"error": f"Falta el campo '{field}'"}), 400
+
+    stops = data["stops"]
+    if not isinstance(stops, list) or not 2 <= len(stops) <= ITINERARY_MAX_STOPS:
+        return jsonify({
+            "error": f"'stops' debe ser una lista de 2 a {ITINERARY_MAX_STOPS} paradas"
+        }), 400
+
+    try:
+        stops = [{"lat": float(p["lat"]), "lng": float(p["lng"])} for p in stops]
+    except (KeyError, TypeError, ValueError):
+        return jsonify({"error": "Cada parada debe tener 'lat' y 'lng' numéricos"}), 400
+
+    try:
+        brand = data["brand"].strip().lower()
+        model = data["model"].strip().lower()
+        year = int(data["year"])
+        passengers = int(data.get("passengers", 0))
+        extra_weight = float(data.get("extra_weight", 0))
+        fuel_price = float(data.get("fuel_price", 0))
+        return_to_start = parse_bool(data.get("return_to_start", False))
+        climate = data.get("climate")
+        climate = climate.lower() if climate else None
+    except (AttributeError, TypeError, ValueError):
+        return jsonify({"error": "Valores inválidos en la solicitud"}), 400
+
+    try:
+        table = get_coefficient_table()
+        row = table.find(brand, model, year)
+        error = table.vehicle_error(row)
+        if error:
+            return jsonify({"error": error}), 404 if row is None else 400
+
+        if climate is None:
+            climate = get_weather_from_coords(stops[0])["climate"]
+
+        plan = plan_itinerary(
+            stops,
+            table,
+            row,
+            extra_weight=max(0, extra_weight + passengers * PASSENGER_WEIGHT),
+            climate=climate,
+            fuel_price=fuel_price,
+            return_to_start=return_to_start,
+        )
+
+        plan["stops"] = [stops[i] for i in plan["order"]]
+        plan["weather"] = climate
+        plan["vehicleId"] = int(table.ids[row])
+
+        return jsonify(plan), 200
+
+    except SQLAlchemyError as db_err:
+        print(f"❌ SQLAlchemy error: {db_err}")
+        return jsonify({"error": "Error interno de base de datos"}), 500
+
+    except Exception as e:
+        print(f"❌ Error general en /trips/itinerary: {e}")
+        return jsonify({"error": str(e)}), 500
@@ -0,0 +1,30 @@
+from flask import Blueprint, jsonify
+from flask_cors import cross_origin
+from backend.services.resilience import get_breakers_snapshot, get_single_flight_stats
+from backend.services.distance_service import get_distance_cache_stats
+from backend.services.weather_service import get_weather_cache_stats
+from backend.services.route_profile_service import get_route_profile_cache_stats
+from backend.services.distance_estimator import get_circuity_stats
+from backend.services.rate_limiter import get_rate_limits_snapshot
+
+status_bp = Blueprint("status_bp", __name__)
+
+
+@status_bp.route("/status/upstreams", methods=["GET"])
+@cross_origin()
+def get_upstreams_status():
+    """
+    Estado de las APIs externas: circuit breakers, límites de cuota,
+    llamadas compartidas (single-flight) y cachés.
+    """
+    return jsonify({
+        "breakers": get_breakers_snapshot(),
+        "rate_limits": get_rate_limits_snapshot(),
+        "single_flight": get_single_flight_stats(),
+        "caches": [
+            get_distance_cache_stats(),
+            get_weather_cache_stats(),
+            get_route_profile_cache_stats(),
+        ],
+        "circuity": get_circuity_stats(),
+    }), 200
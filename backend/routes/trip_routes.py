@@ -1,10 +1,40 @@
-from flask import Blueprint, request, jsonify
+import json
+import math
+from decimal import Decimal
+
+from flask import Blueprint, Response, request, jsonify, stream_with_context
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from flask_cors import cross_origin
 from sqlalchemy.exc import SQLAlchemyError
 
-from backend.models import db, Trip, Vehicle, UserVehicle
-from backend.utils.trip_calculation import calculate_fuel_consumption
+import numpy as np
+
+from backend.config import CALCULATE_BATCH_MAX_ROWS, CALCULATE_SWEEP_MAX_CELLS
+from backend.models import db, Trip, User, UserVehicle
+from backend.services.trip_service import PASSENGER_WEIGHT, TripInputError, find_vehicle, parse_trip_record
+from backend.services.trip_export_service import (
+    ExportUnavailableError,
+    TripExportError,
+    export_trips,
+    parse_export_args,
+)
+from backend.services.trip_history_service import iter_trips, parse_history_args, trip_page
+from backend.services.trip_import_service import TripImportError, detect_format, import_trips, iter_records
+from backend.services.trip_summary_service import (
+    SummaryInputError,
+    forget_trip,
+    get_trip_summary,
+    parse_summary_args,
+    record_trip,
+)
+from backend.services.vehicle_coefficients import get_coefficient_table, coefficients_for_vehicle
+from backend.services.uncertainty_service import (
+    UncertaintyInputError,
+    parse_uncertainty,
+    simulate_trip_uncertainty,
+    vehicle_fc_model,
+)
+from backend.utils.trip_calculation import round_like_python
 
 trip_bp = Blueprint("trip_bp", __name__)
 
@@ -42,36 +72,32 @@ def calculate_trip():
         extra_weight = float(data["extraWeight"])
         fuel_price = float(data.get("fuelPrice", 0))
 
+        try:
+            uncertainty = parse_uncertainty(data.get("uncertainty"))
+        except UncertaintyInputError as e:
+            return jsonify({"error": str(e)}), 400
+
         # 🔹 Buscar vehículo
-        vehicle = Vehicle.query.filter(
-            db.func.lower(Vehicle.make) == brand,
-            db.func.lower(Vehicle.model) == model,
-            Vehicle.year == year
-        ).first()
+        vehicle = find_vehicle(brand, model, year)
 
         if not vehicle:
             return jsonify({"error": "No se encontraron detalles del vehículo"}), 404
 
-        if vehicle.fuel_type and "electric" in vehicle.fuel_type.lower():
-            return jsonify({
-                "error": "Este es un vehículo eléctrico. No aplica simulación de combustible."
-            }), 400
+        table, row = coefficients_for_vehicle(vehicle.id)
+        error = table.vehicle_error(row)
+        if error:
+            return jsonify({"error": error}), 400
 
-        if vehicle.lkm_mixed is None:
-            return jsonify({
-                "error": "No hay datos suficientes de consumo para este vehículo."
-            }), 400
-
-        # 🔹 Cálculo real centralizado
-        adjusted_fc = calculate_fuel_consumption(
-            base_fc=vehicle.lkm_mixed,
-            vehicle_weight=vehicle.weight_kg or 1500,
+        # 🔹 Cálculo real centralizado (tabla de coeficientes)
+        base_fc = table.base_fc([row], "mixed")
+        adjusted_fc = float(table.adjusted_fc(
+            [row],
+            base_fc=base_fc,
             extra_weight=max(0, extra_weight),
             road_grade=grade,
             climate=climate,
             distance_km=distance_km,
-            engine_type=vehicle.fuel_type
-        )
+        )[0])
 
         fuel_used = (distance_km * adjusted_fc) / 100
         total_cost = fuel_used * fuel_price
@@ -87,7 +113,7 @@ def calculate_trip():
             ))
             db.session.commit()
 
-        return jsonify({
+        response = {
             "distance": distance_km,
             "fuelConsumptionPer100km": round(adjusted_fc, 3),
             "fuelUsed": round(fuel_used, 3),
@@ -98,7 +124,21 @@ def calculate_trip():
             "adjustedFC": round(adjusted_fc, 2),
             "pricePerLitre": round(fuel_price, 2),
             "vehicleDetails": vehicle.to_dict()
-        }), 200
+        }
+
+        # 🎲 Modo incertidumbre (Monte Carlo)
+        if uncertainty:
+            response["uncertainty"] = simulate_trip_uncertainty(
+                uncertainty,
+                vehicle_fc_model(table, row, base_fc, distance_km),
+                distance_km=distance_km,
+                climate=climate,
+                fuel_price=fuel_price,
+                extra_weight=max(0, extra_weight),
+                road_grade=grade,
+            )
+
+        return jsonify(response), 200
 
     except SQLAlchemyError as db_err:
         print(f"❌ SQLAlchemy error: {db_err}")
@@ -109,6 +149,304 @@ def calculate_trip():
         return jsonify({"error": str(e)}), 500
 
 
+# ==========================================
+# 🔢 Cálculo de viajes en lote (POST)
+# ==========================================
+BATCH_REQUIRED_FIELDS = [
+    "brand", "model", "year",
+    "extraWeight", "distance",
+    "roadGrade", "climate"
+]
+
+
+@trip_bp.route("/calculate/batch", methods=["POST"])
+@cross_origin()
+@jwt_required()
+def calculate_trip_batch():
+    """
+    Igual que /calculate para muchos viajes a la vez, sin asociar
+    vehículos al usuario.
+
+    Body: { "trips": [ <body de /calculate>, ... ] }
+    Opcional por viaje: climbM / descentM (perfil de la ruta).
+
+    Los vehículos se resuelven en la tabla de coeficientes (sin
+    consultas por viaje) y el consumo se calcula en una sola pasada
+    vectorizada. Los viajes inválidos devuelven
+    "error" en su posición sin afectar al resto.
+    """
+    data = request.get_json(silent=True) or {}
+    trips = data.get("trips")
+
+    if not isinstance(trips, list) or not trips:
+        return jsonify({"error": "Parámetro 'trips' debe ser una lista no vacía"}), 400
+
+    if len(trips) > CALCULATE_BATCH_MAX_ROWS:
+        return jsonify({
+            "error": f"Máximo {CALCULATE_BATCH_MAX_ROWS} viajes por request"
+        }), 400
+
+    try:
+        table = get_coefficient_table()
+        results = [None] * len(trips)
+        rows = []
+
+        # 🔹 Normalización de entrada y búsqueda de vehículos
+        for index, item in enumerate(trips):
+            if not isinstance(item, dict):
+                results[index] = {"error": "Cada viaje debe ser un objeto"}
+                continue
+
+            missing = next((f for f in BATCH_REQUIRED_FIELDS if f not in item), None)
+            if missing:
+                results[index] = {"error": f"Falta el campo obligatorio '{missing}'"}
+                continue
+
+            try:
+                key = (
+                    item["brand"].strip().lower(),
+                    item["model"].strip().lower(),
+                    int(item["year"]),
+                )
+                row = {
+                    "index": index,
+                    "distance": float(item["distance"]),
+                    "grade": float(item["roadGrade"]),
+                    "climate": item["climate"].lower(),
+                    "extra_weight": max(0, float(item["extraWeight"])),
+                    "fuel_price": float(item.get("fuelPrice", 0)),
+                    "climb_m": None if item.get("climbM") is None else float(item["climbM"]),
+                    "descent_m": None if item.get("descentM") is None else float(item["descentM"]),
+                }
+            except (AttributeError, TypeError, ValueError):
+                results[index] = {"error": "Valores inválidos en el viaje"}
+                continue
+
+            vehicle_row = table.find(*key)
+            error = table.vehicle_error(vehicle_row)
+            if error:
+                results[index] = {"error": error}
+                continue
+
+            row["row"] = vehicle_row
+            rows.append(row)
+
+        # 🔹 Cálculo vectorizado
+        if rows:
+            distance = np.array([r["distance"] for r in rows])
+            fuel_price = np.array([r["fuel_price"] for r in rows])
+
+            vehicle_rows = np.array([r["row"] for r in rows])
+
+            adjusted_fc = table.adjusted_fc(
+                vehicle_rows,
+                base_fc=table.base_fc(vehicle_rows, "mixed"),
+                extra_weight=[r["extra_weight"] for r in rows],
+                road_grade=[r["grade"] for r in rows],
+                climate=[r["climate"] for r in rows],
+                distance_km=distance,
+                climb_m=[r["climb_m"] for r in rows],
+                descent_m=[r["descent_m"] for r in rows],
+            )
+            vehicle_ids = table.ids[vehicle_rows].tolist()
+
+            fuel_used = (distance * adjusted_fc) / 100
+            total_cost = fuel_used * fuel_price
+
+            fuel_used_out = round_like_python(fuel_used, 3).tolist()
+            total_cost_out = round_like_python(total_cost, 2).tolist()
+            adjusted_out = adjusted_fc.tolist()
+
+            for k, r in enumerate(rows):
+                results[r["index"]] = {
+                    "distance": r["distance"],
+                    "fuelConsumptionPer100km": adjusted_out[k],
+                    "fuelUsed": fuel_used_out[k],
+                    "totalCost": total_cost_out[k],
+                    "weather": r["climate"],
+                    "roadSlope": f"{r['grade']}%",
+                    "vehicleId": vehicle_ids[k],
+                }
+
+        return jsonify({
+            "count": len(trips),
+            "calculated": len(rows),
+            "results": results,
+        }), 200
+
+    except SQLAlchemyError as db_err:
+        print(f"❌ SQLAlchemy error: {db_err}")
+        return jsonify({"error": "Error interno de base de datos"}), 500
+
+    except Exception as e:
+        print(f"❌ Error general en /calculate/batch: {e}")
+        return jsonify({"error": str(e)}), 500
+
+
+# ==========================================
+# 🔢 Barrido de escenarios (POST)
+# ==========================================
+class SweepInputError(Exception):
+    pass
+
+
+def _decimals(value):
+    """Decimales con que se escribió un número (0.25 → 2, 3 → 0)."""
+    return max(0, -Decimal(str(value)).as_tuple().exponent)
+
+
+def _sweep_range(field, spec, integer):
+    """
+    Valores de un rango { start, stop, step } (stop incluido), como
+    start + step·k y redondeados a la precisión de la entrada: sin
+    arrastre de np.arange (0.30000000000000004). En ejes enteros
+    (integer=True) start, stop y step deben ser enteros.
+    """
+    try:
+        start, stop = float(spec["start"]), float(spec["stop"])
+        step = float(spec.get("step", 1))
+    except (KeyError, TypeError, ValueError, OverflowError):
+        raise SweepInputError(f"Rango inválido en '{field}'")
+
+    if not all(map(math.isfinite, (start, stop, step))) or step <= 0 or stop < start:
+        raise SweepInputError(f"Rango inválido en '{field}'")
+    if integer and not all(v.is_integer() for v in (start, stop, step)):
+        raise SweepInputError(f"'{field}' solo admite valores enteros")
+
+    count = math.floor((stop - start) / step + 0.5) + 1
+    if count > CALCULATE_SWEEP_MAX_CELLS:
+        raise SweepInputError(f"Rango demasiado grande en '{field}'")
+
+    values = start + step * np.arange(count)
+    return np.round(values, max(_decimals(start), _decimals(step))).tolist()
+
+
+def _sweep_axis(data, field, default, cast=float):
+    """
+    Eje de la grilla: valor único, lista, o rango
+    { "start", "stop", "step" } (stop incluido).
+    """
+    value = data.get(field, default)
+
+    if isinstance(value, dict):
+        value = _sweep_range(field, value, integer=cast is int)
+
+    if not isinstance(value, list):
+        value = [value]
+    if not value:
+        raise SweepInputError(f"'{field}' no puede estar vacío")
+
+    try:
+        return [cast(v) for v in value]
+    except (AttributeError, TypeError, ValueError):
+        raise SweepInputError(f"Valores inválidos en '{field}'")
+
+
+@trip_bp.route("/calculate/sweep", methods=["POST"])
+@cross_origin()
+@jwt_required()
+def calculate_trip_sweep():
+    """
+    Grilla de escenarios para un vehículo y una ruta:
+    pasajeros × carga (extraWeight) × clima × precio.
+
+    Body: brand, model, year, distance, roadGrade (climbM / descentM
+    opcionales) y cada eje como valor, lista o rango
+    { start, stop, step }:
+        passengers (default 0), extraWeight (default 0),
+        climate (default "mild"), fuelPrice (default 0)
+
+    Respuesta compacta: los ejes y arreglos anidados
+    fuelConsumptionPer100km / fuelUsed [pasajeros][carga][clima]
+    y totalCost [pasajeros][carga][clima][precio].
+    """
+    data = request.get_json(silent=True) or {}
+
+    for field in ["brand", "model", "year", "distance", "roadGrade"]:
+        if field not in data:
+            return jsonify({"error": f"Falta el campo obligatorio '{field}'"}), 400
+
+    try:
+        brand = data["brand"].strip().lower()
+        model = data["model"].strip().lower()
+        year = int(data["year"])
+        distance_km = float(data["distance"])
+        grade = float(data["roadGrade"])
+        climb_m = None if data.get("climbM") is None else float(data["climbM"])
+        descent_m = None if data.get("descentM") is None else float(data["descentM"])
+
+        passengers = _sweep_axis(data, "passengers", 0, int)
+        cargo = _sweep_axis(data, "extraWeight", 0)
+        climates = _sweep_axis(data, "climate", "mild", lambda v: v.lower())
+        prices = _sweep_axis(data, "fuelPrice", 0)
+    except SweepInputError as e:
+        return jsonify({"error": str(e)}), 400
+    except (AttributeError, TypeError, ValueError):
+        return jsonify({"error": "Valores inválidos en la solicitud"}), 400
+
+    shape = (len(passengers), len(cargo), len(climates), len(prices))
+    if int(np.prod(shape)) > CALCULATE_SWEEP_MAX_CELLS:
+        return jsonify({
+            "error": f"La grilla supera el máximo de {CALCULATE_SWEEP_MAX_CELLS} escenarios"
+        }), 400
+
+    try:
+        table = get_coefficient_table()
+        row = table.find(brand, model, year)
+        error = table.vehicle_error(row)
+        if error:
+            return jsonify({"error": error}), 404 if row is None else 400
+
+        # 🔹 Peso extra por (pasajeros, carga) → (P, W, 1)
+        extra_weight = np.maximum(
+            0,
+            np.array(passengers, dtype=float)[:, None] * PASSENGER_WEIGHT
+            + np.array(cargo, dtype=float)[None, :],
+        )[:, :, None]
+        climate_grid = np.array(climates)[None, None, :]
+        grid_shape = shape[:3]
+        cells = int(np.prod(grid_shape))
+
+        # El consumo no depende del precio: se calcula sobre P×W×C
+        adjusted_fc = table.adjusted_fc(
+            np.full(cells, row),
+            base_fc=table.base_fc([row], "mixed"),
+            extra_weight=np.broadcast_to(extra_weight, grid_shape).ravel(),
+            road_grade=grade,
+            climate=np.broadcast_to(climate_grid, grid_shape).ravel(),
+            distance_km=distance_km,
+            climb_m=climb_m,
+            descent_m=descent_m,
+        ).reshape(grid_shape)
+
+        fuel_used = (distance_km * adjusted_fc) / 100
+        total_cost = fuel_used[..., None] * np.array(prices)[None, None, None, :]
+
+        return jsonify({
+            "vehicleId": int(table.ids[row]),
+            "distance": distance_km,
+            "roadSlope": f"{grade}%",
+            "shape": list(shape),
+            "axes": {
+                "passengers": passengers,
+                "extraWeight": cargo,
+                "climate": climates,
+                "fuelPrice": prices,
+            },
+            "fuelConsumptionPer100km": adjusted_fc.tolist(),
+            "fuelUsed": round_like_python(fuel_used, 3).tolist(),
+            "totalCost": round_like_python(total_cost, 2).tolist(),
+        }), 200
+
+    except SQLAlchemyError as db_err:
+        print(f"❌ SQLAlchemy error: {db_err}")
+        return jsonify({"error": "Error interno de base de datos"}), 500
+
+    except Exception as e:
+        print(f"❌ Error general en /calculate/sweep: {e}")
+        return jsonify({"error": str(e)}), 500
+
+
 # ==========================================
 # 💾 Guardar viaje (POST)
 # ==========================================
@@ -120,43 +458,13 @@ def save_trip():
         user_id = get_jwt_identity()
         data = request.get_json()
 
-        required = [
-            "brand", "model", "year", "fuel_type",
-            "total_weight", "passengers", "location",
-            "distance", "fuel_consumed", "total_cost",
-            "road_grade", "climate"
-        ]
-
-        for field in required:
-            if field not in data:
-                return jsonify({"error": f"Falta el campo obligatorio '{field}'"}), 400
-
-        valid_climates = ["cold", "hot", "windy", "snowy", "mild"]
-        if data["climate"].lower() not in valid_climates:
-            return jsonify({"error": "Condición climática inválida"}), 400
-
-        is_electric = "electric" in data["fuel_type"].lower()
-        if not is_electric and "fuel_price" not in data:
-            return jsonify({"error": "Falta el campo 'fuel_price' para vehículos no eléctricos"}), 400
-
-        trip = Trip(
-            user_id=user_id,
-            brand=data["brand"].strip().capitalize(),
-            model=data["model"].strip().capitalize(),
-            year=int(data["year"]),
-            fuel_type=data["fuel_type"],
-            fuel_price=float(data.get("fuel_price") or 0),
-            total_weight=float(data["total_weight"]),
-            passengers=int(data["passengers"]),
-            location=data["location"],
-            distance=float(data["distance"]),
-            fuel_consumed=float(data["fuel_consumed"]),
-            total_cost=float(data["total_cost"]),
-            road_grade=float(data["road_grade"]),
-            weather=data["climate"].lower()
-        )
+        try:
+            trip = Trip(user_id=user_id, **parse_trip_record(data))
+        except TripInputError as e:
+            return jsonify({"error": str(e)}), 400
 
         db.session.add(trip)
+        record_trip(trip)
         db.session.commit()
 
         return jsonify({
@@ -169,33 +477,164 @@ def save_trip():
         return jsonify({"error": str(e)}), 500
 
 
+# ==========================================
+# 📥 Importación masiva de viajes (POST)
+# ==========================================
+@trip_bp.route("/trips/import", methods=["POST"])
+@cross_origin()
+@jwt_required()
+def import_trips_file():
+    """
+    Importa viajes históricos desde CSV o NDJSON (archivo multipart
+    "file" o el body crudo), leídos en streaming. Cada fila se valida
+    como en POST /trips; las inválidas vuelven en "errors" con su línea.
+    """
+    try:
+        user_id = get_jwt_identity()
+        upload = request.files.get("file")
+
+        try:
+            if upload is not None:
+                fmt = detect_format(request.args.get("format"), upload.filename, upload.mimetype)
+                stream = upload.stream
+            else:
+                fmt = detect_format(request.args.get("format"), content_type=request.content_type)
+                stream = request.stream
+        except TripImportError as e:
+            return jsonify({"error": str(e)}), 400
+
+        report = import_trips(user_id, iter_records(stream, fmt))
+        return jsonify(report), 200
+
+    except Exception as e:
+        db.session.rollback()
+        print(f"❌ Error interno en /trips/import: {e}")
+        return jsonify({"error": str(e)}), 500
+
+
 # ==========================================
 # 📋 Obtener viajes (GET)
 # ==========================================
 @trip_bp.route("/trips", methods=["GET"])
-@cross_origin()
+@cross_origin(expose_headers=["X-Next-Cursor"])
 @jwt_required()
 def get_trips():
+    """
+    Historial del usuario, del más nuevo al más antiguo.
+
+    - Por defecto: una página (lista JSON); si hay más viajes, el
+      cursor siguiente va en el header X-Next-Cursor (?cursor=...)
+    - ?format=ndjson: un viaje por línea, en streaming
+    """
     try:
         user_id = get_jwt_identity()
-        trips = Trip.query.filter_by(
-            user_id=user_id
-        ).order_by(Trip.id.desc()).all()
 
-        results = []
-        for trip in trips:
-            trip_data = trip.to_dict()
-            if hasattr(trip, "created_at"):
-                trip_data["created_at"] = trip.created_at.strftime("%Y-%m-%d %H:%M:%S")
-            results.append(trip_data)
+        try:
+            params = parse_history_args(request.args)
+        except TripInputError as e:
+            return jsonify({"error": str(e)}), 400
+
+        if params["format"] == "ndjson":
+            rows = iter_trips(user_id, params["cursor"], params["limit"])
 
-        return jsonify(results), 200
+            def generate():
+                try:
+                    for trip_data in rows:
+                        yield json.dumps(trip_data, ensure_ascii=False) + "\n"
+                except SQLAlchemyError as e:
+                    # El status ya se envió: se corta el stream
+                    print(f"❌ Error de base de datos en streaming de /trips: {e}")
+
+            return Response(stream_with_context(generate()), mimetype="application/x-ndjson")
+
+        trips, next_cursor = trip_page(user_id, params["cursor"], params["limit"])
+
+        response = jsonify(trips)
+        if next_cursor is not None:
+            response.headers["X-Next-Cursor"] = str(next_cursor)
+        return response, 200
 
     except Exception as e:
         print(f"❌ Error interno en /trips: {e}")
         return jsonify({"error": str(e)}), 500
 
 
+# ==========================================
+# 📤 Exportación de viajes (GET)
+# ==========================================
+@trip_bp.route("/trips/export", methods=["GET"])
+@cross_origin()
+@jwt_required()
+def export_trips_file():
+    """
+    Exporta viajes en streaming como CSV, Parquet o Arrow IPC.
+    Por defecto los del usuario; ?user_id=<id> de otro usuario o
+    ?user_id=all requieren rol admin. Filtros: from / to (YYYY-MM-DD),
+    vehicle_id, brand, model, year.
+    """
+    try:
+        user_id = int(get_jwt_identity())
+
+        try:
+            fmt, filters = parse_export_args(request.args)
+        except TripExportError as e:
+            return jsonify({"error": str(e)}), 400
+        except ExportUnavailableError as e:
+            return jsonify({"error": str(e)}), 501
+
+        if filters["all_users"] or filters["user_id"] not in (None, user_id):
+            user = User.query.get(user_id)
+            if not user or not user.has_role("admin"):
+                return jsonify({"error": "Acceso denegado"}), 403
+        elif filters["user_id"] is None:
+            filters["user_id"] = user_id
+
+        chunks, mimetype, extension = export_trips(fmt, filters)
+
+        def generate():
+            try:
+                yield from chunks
+            except SQLAlchemyError as e:
+                # El status ya se envió: se corta el archivo
+                print(f"❌ Error de base de datos exportando viajes: {e}")
+
+        return Response(
+            stream_with_context(generate()),
+            mimetype=mimetype,
+            headers={"Content-Disposition": f"attachment; filename=trips.{extension}"},
+        )
+
+    except Exception as e:
+        print(f"❌ Error interno en /trips/export: {e}")
+        return jsonify({"error": str(e)}), 500
+
+
+# ==========================================
+# 📊 Resumen de viajes (GET)
+# ==========================================
+@trip_bp.route("/trips/summary", methods=["GET"])
+@cross_origin()
+@jwt_required()
+def get_trips_summary():
+    """
+    Totales (viajes, km, litros, costo) por mes y por vehículo, desde
+    la tabla trip_summary. Rango opcional: ?from=YYYY-MM&to=YYYY-MM.
+    """
+    try:
+        user_id = get_jwt_identity()
+
+        try:
+            months = parse_summary_args(request.args)
+        except SummaryInputError as e:
+            return jsonify({"error": str(e)}), 400
+
+        return jsonify(get_trip_summary(user_id, months["from"], months["to"])), 200
+
+    except Exception as e:
+        print(f"❌ Error interno en /trips/summary: {e}")
+        return jsonify({"error": str(e)}), 500
+
+
 # ==========================================
 # ❌ Eliminar viaje (DELETE)
 # ==========================================
@@ -204,10 +643,13 @@ def get_trips():
 @jwt_required()
 def delete_trip(trip_id):
     try:
-        trip = Trip.query.get(trip_id)
+        # Solo viajes propios: uno ajeno responde igual que uno inexistente
+        user_id = int(get_jwt_identity())
+        trip = Trip.query.filter_by(id=trip_id, user_id=user_id).first()
         if not trip:
             return jsonify({"error": "El viaje no fue encontrado"}), 404
 
+        forget_trip(trip)
         db.session.delete(trip)
         db.session.commit()
 
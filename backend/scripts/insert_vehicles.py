@@ -1,6 +1,7 @@
-import requests
+from backend.services import http_client
 from backend.models import db, Vehicle
 from backend.extensions import create_app
+from backend.services.vehicle_catalog import invalidate_vehicle_catalog
 
 # Crear la aplicación Flask
 app = create_app()
@@ -19,7 +20,7 @@ vehicle_targets = [
 ]
 
 def fetch_vehicle_data(make, model):
-    response = requests.get(f"{NHTSA_BASE_URL}/GetModelsForMake/{make}")
+    response = http_client.get(f"{NHTSA_BASE_URL}/GetModelsForMake/{make}")
     if response.status_code == 200:
         models = response.json().get("Results", [])
         for vehicle in models:
@@ -35,4 +36,5 @@ with app.app_context():
             db.session.add(vehicle)
 
     db.session.commit()
+    invalidate_vehicle_catalog()
     print("Vehículos insertados correctamente en la base de datos.")
\ No newline at end of file
@@ -1,5 +1,6 @@
 from backend.extensions import db
 from backend.models import Vehicle
+from backend.services.vehicle_catalog import invalidate_vehicle_catalog
 
 def seed_vehicles():
     vehicles = [
@@ -92,4 +93,7 @@ Vehicle(
     db.session.bulk_save_objects(vehicles)
     db.session.commit()
 
+    # bulk_save_objects no dispara los eventos del ORM
+    invalidate_vehicle_catalog()
+
     print("✅ Seed de vehículos ejecutado correctamente.")
@@ -0,0 +1,20 @@
+from backend.services.aio import http_client
+from backend.services.resilience import guarded_async
+from backend.services.directions_service import (
+    DIRECTIONS_URL,
+    format_location,
+    directions_request_params,
+    parse_directions_response,
+)
+
+
+@guarded_async(
+    "google_directions",
+    key=lambda origin, destination: (format_location(origin), format_location(destination)),
+)
+async def get_directions_route(origin, destination):
+    response = await http_client.get(
+        DIRECTIONS_URL,
+        params=directions_request_params(origin, destination),
+    )
+    return parse_directions_response(response.json())
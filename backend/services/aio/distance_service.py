@@ -0,0 +1,43 @@
+from backend.services.aio import http_client
+from backend.services.resilience import guarded_async
+from backend.services.distance_service import (
+    DISTANCE_MATRIX_URL,
+    matrix_request_params,
+    parse_matrix_response,
+    get_cached_distance_km,
+    store_distance_km,
+    single_distance,
+    _format_points,
+)
+
+
+@guarded_async(
+    "google_distance_matrix",
+    key=lambda origins, destinations: (_format_points(origins), _format_points(destinations)),
+    cost=lambda origins, destinations: len(origins) * len(destinations),
+)
+async def _fetch_matrix_block(origins, destinations):
+    response = await http_client.get(
+        DISTANCE_MATRIX_URL,
+        params=matrix_request_params(origins, destinations),
+    )
+    return parse_matrix_response(response.json())
+
+
+async def get_distance_km(origin, destination):
+    """
+    Versión asyncio de distance_service.get_distance_km
+    (misma caché y mismo circuit breaker).
+    """
+
+    if isinstance(origin, str) or isinstance(destination, str):
+        return single_distance(await _fetch_matrix_block([origin], [destination]))
+
+    cached = get_cached_distance_km(origin, destination)
+    if cached is not None:
+        return cached
+
+    distance_km = single_distance(await _fetch_matrix_block([origin], [destination]))
+    store_distance_km(origin, destination, distance_km)
+
+    return distance_km
@@ -0,0 +1,39 @@
+import asyncio
+import numpy as np
+from backend.services.aio import http_client
+from backend.services.resilience import guarded_async
+from backend.services.elevation_service import (
+    ELEVATION_URL,
+    google_location_batches,
+    elevation_request_params,
+    parse_elevation_response,
+    dem_elevations,
+    merge_elevations,
+)
+
+
+@guarded_async("google_elevation", key=lambda locations: locations)
+async def _fetch_google_batch(locations):
+    response = await http_client.get(ELEVATION_URL, params=elevation_request_params(locations))
+    return parse_elevation_response(response.json())
+
+
+async def get_elevations(points):
+    """
+    Versión asyncio de elevation_service.get_elevations:
+    DEM local primero, lotes de Google en paralelo para el resto.
+    """
+
+    elevations = dem_elevations(points)
+    missing = np.flatnonzero(np.isnan(elevations))
+
+    if len(missing) == 0:
+        return elevations.tolist(), "dem"
+
+    batches = await asyncio.gather(*(
+        _fetch_google_batch(locations)
+        for locations in google_location_batches([points[i] for i in missing])
+    ))
+    google_elevations = [elevation for batch in batches for elevation in batch]
+
+    return merge_elevations(elevations, missing, google_elevations, len(points))
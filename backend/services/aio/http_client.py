@@ -0,0 +1,67 @@
+import asyncio
+from urllib.parse import urlsplit
+import httpx
+from backend.config import (
+    HTTP_CONNECT_TIMEOUT,
+    HTTP_READ_TIMEOUT,
+    HTTP_MAX_RETRIES,
+    HTTP_BACKOFF_FACTOR,
+    HTTP_POOL_MAXSIZE,
+)
+from backend.services.http_client import HOST_POOL_SIZES, RETRY_STATUS_CODES
+
+# Un AsyncClient (pool keep-alive propio) por host
+_clients = {}
+
+
+def _build_client(pool_maxsize: int) -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        timeout=httpx.Timeout(HTTP_READ_TIMEOUT, connect=HTTP_CONNECT_TIMEOUT),
+        limits=httpx.Limits(
+            max_connections=pool_maxsize,
+            max_keepalive_connections=pool_maxsize,
+        ),
+    )
+
+
+def get_client(url) -> httpx.AsyncClient:
+    host = urlsplit(url).hostname
+    client = _clients.get(host)
+
+    if client is None:
+        client = _build_client(HOST_POOL_SIZES.get(host, HTTP_POOL_MAXSIZE))
+        _clients[host] = client
+
+    return client
+
+
+async def get(url, params=None, timeout=None) -> httpx.Response:
+    """
+    GET asíncrono con la misma política que el cliente síncrono:
+    reintentos acotados con backoff exponencial ante errores de red
+    y respuestas 429/5xx.
+    """
+    client = get_client(url)
+    kwargs = {"params": params}
+    if timeout is not None:
+        kwargs["timeout"] = timeout
+
+    for attempt in range(HTTP_MAX_RETRIES + 1):
+        is_last = attempt == HTTP_MAX_RETRIES
+
+        try:
+            response = await client.get(url, **kwargs)
+        except httpx.TransportError:
+            if is_last:
+                raise
+        else:
+            if response.status_code not in RETRY_STATUS_CODES or is_last:
+                return response
+
+        await asyncio.sleep(HTTP_BACKOFF_FACTOR * (2 ** attempt))
+
+
+async def close():
+    clients = list(_clients.values())
+    _clients.clear()
+    await asyncio.gather(*(client.aclose() for client in clients))
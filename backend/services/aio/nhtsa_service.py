@@ -0,0 +1,19 @@
+from backend.services.aio import http_client
+from backend.services.resilience import guarded_async
+from backend.services.nhtsa_service import NHTSA_PARAMS, nhtsa_url, parse_nhtsa_response
+
+
+async def _get_results(path):
+    response = await http_client.get(nhtsa_url(path), params=NHTSA_PARAMS)
+    data = response.json() if response.status_code == 200 else None
+    return parse_nhtsa_response(response.status_code, data)
+
+
+@guarded_async("nhtsa", key=lambda: "getallmakes")
+async def get_all_makes():
+    return await _get_results("getallmakes")
+
+
+@guarded_async("nhtsa", key=lambda make: make)
+async def get_models_for_make(make):
+    return await _get_results(f"getmodelsformake/{make}")
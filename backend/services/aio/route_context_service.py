@@ -0,0 +1,113 @@
+import asyncio
+from backend.config import (
+    DISTANCE_LOOKUP_TIMEOUT,
+    ELEVATION_LOOKUP_TIMEOUT,
+    WEATHER_LOOKUP_TIMEOUT,
+)
+from backend.services.aio.distance_service import get_distance_km
+from backend.services.aio.elevation_service import get_elevations
+from backend.services.aio.route_profile_service import get_route_profile
+from backend.services.aio.weather_service import get_weather_from_coords
+from backend.services.distance_estimator import estimate_distance_km
+from backend.services.weather_service import weather_fallback
+
+
+async def _endpoint_profile(origin, destination):
+    try:
+        (elev_origin, elev_dest), source = await get_elevations([origin, destination])
+        return {"elevation_diff": elev_dest - elev_origin, "source": source}
+    except Exception as e:
+        print(f"⚠️ Elevación no disponible, usando 0 m: {e!r}")
+        return {"elevation_diff": 0, "source": "fallback_lookup_failed"}
+
+
+async def _wait(task, deadline):
+    loop = asyncio.get_running_loop()
+    return await asyncio.wait_for(task, timeout=max(0.0, deadline - loop.time()))
+
+
+async def _endpoint_profile_until(origin, destination, deadline):
+    """
+    _endpoint_profile dentro del tiempo que le queda a la elevación;
+    si no alcanza, {} (diferencia 0 m).
+    """
+    if deadline <= asyncio.get_running_loop().time():
+        return {}
+
+    try:
+        return await _wait(_endpoint_profile(origin, destination), deadline)
+    except Exception as e:
+        print(f"⚠️ Elevación origen/destino fuera de plazo, usando 0 m: {e!r}")
+        return {}
+
+
+async def fetch_route_context(origin, destination, estimate_only=False):
+    """
+    Versión asyncio de route_context_service.fetch_route_context:
+    mismas consultas, timeouts y fallbacks, sin bloquear hilos.
+    """
+
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+
+    if estimate_only:
+        distance_task = None
+        profile_task = asyncio.ensure_future(_endpoint_profile(origin, destination))
+    else:
+        distance_task = asyncio.ensure_future(get_distance_km(origin, destination))
+        profile_task = asyncio.ensure_future(get_route_profile(origin, destination))
+    weather_task = asyncio.ensure_future(get_weather_from_coords(origin))
+
+    # 🌦️ Clima
+    try:
+        weather = await _wait(weather_task, started + WEATHER_LOOKUP_TIMEOUT)
+    except Exception as e:
+        print(f"⚠️ Clima no disponible, usando fallback: {e!r}")
+        weather = weather_fallback("fallback_lookup_failed")
+
+    # ⛰️ Elevación a lo largo de la ruta
+    climb_m = None
+    descent_m = None
+    steps = None
+    track = None
+    try:
+        profile = await _wait(profile_task, started + ELEVATION_LOOKUP_TIMEOUT)
+        elevation_diff = profile["elevation_diff"]
+        elevation_source = profile["source"]
+        climb_m = profile.get("climb_m")
+        descent_m = profile.get("descent_m")
+        steps = profile.get("steps")
+        track = profile.get("track")
+    except Exception as e:
+        print(f"⚠️ Perfil de ruta no disponible: {e!r}")
+        profile = (
+            {} if estimate_only
+            else await _endpoint_profile_until(origin, destination, started + ELEVATION_LOOKUP_TIMEOUT)
+        )
+        elevation_diff = profile.get("elevation_diff", 0)
+        elevation_source = profile.get("source", "fallback_lookup_failed")
+
+    # 📏 Distancia
+    if distance_task is None:
+        distance_km = estimate_distance_km(origin, destination)
+        distance_source = "estimate"
+    else:
+        try:
+            distance_km = await _wait(distance_task, started + DISTANCE_LOOKUP_TIMEOUT)
+            distance_source = "google"
+        except Exception as e:
+            print(f"⚠️ Distancia no disponible, usando estimación local: {e!r}")
+            distance_km = estimate_distance_km(origin, destination)
+            distance_source = "estimate"
+
+    return {
+        "distance_km": distance_km,
+        "distance_source": distance_source,
+        "elevation_diff": elevation_diff,
+        "elevation_source": elevation_source,
+        "climb_m": climb_m,
+        "descent_m": descent_m,
+        "steps": steps,
+        "track": track,
+        "weather": weather,
+    }
@@ -0,0 +1,34 @@
+from backend.services.aio.directions_service import get_directions_route
+from backend.services.aio.elevation_service import get_elevations
+from backend.services.distance_service import route_cache_key
+from backend.services.route_profile_service import (
+    route_sample_points,
+    route_steps,
+    finish_profile,
+    get_cached_route_profile,
+    store_route_profile,
+)
+from backend.utils.single_flight import AsyncSingleFlight
+
+_flights = AsyncSingleFlight()
+
+
+async def _load_route_profile(origin, destination):
+    route = await get_directions_route(origin, destination)
+    points, cumulative_km = route_sample_points(route, origin, destination)
+    elevations, source = await get_elevations(points)
+
+    profile = finish_profile(elevations, source, cumulative_km, route_steps(route))
+    store_route_profile(origin, destination, profile)
+    return profile
+
+
+async def get_route_profile(origin, destination):
+    cached = get_cached_route_profile(origin, destination)
+    if cached is not None:
+        return cached
+
+    return await _flights.do(
+        route_cache_key(origin, destination),
+        lambda: _load_route_profile(origin, destination),
+    )
@@ -0,0 +1,52 @@
+from backend.config import OPENWEATHER_API_KEY
+from backend.services.aio import http_client
+from backend.services.resilience import guarded_async, CircuitOpenError, UPSTREAM_UNAVAILABLE
+from backend.services.weather_service import (
+    OPENWEATHER_URL,
+    WeatherStatusError,
+    weather_request_params,
+    parse_weather_response,
+    weather_tile,
+    get_cached_weather,
+    store_weather,
+    weather_fallback,
+)
+
+
+@guarded_async("openweathermap", key=lambda tile, lat, lng: tile)
+async def _fetch_weather(tile, lat, lng):
+    response = await http_client.get(OPENWEATHER_URL, params=weather_request_params(lat, lng))
+    data = response.json() if response.status_code == 200 else None
+
+    result = parse_weather_response(response.status_code, data)
+    store_weather(tile, result)
+    return result
+
+
+async def get_weather_from_coords(coords):
+    """
+    Versión asyncio de weather_service.get_weather_from_coords
+    (misma caché por celda; misses concurrentes de la celda comparten request).
+    """
+    lat = coords["lat"]
+    lng = coords["lng"]
+
+    if not OPENWEATHER_API_KEY:
+        return weather_fallback("fallback_no_api_key")
+
+    tile = weather_tile(lat, lng)
+
+    cached = get_cached_weather(tile)
+    if cached is not None:
+        return cached
+
+    try:
+        return await _fetch_weather(tile, lat, lng)
+
+    except WeatherStatusError as e:
+        return weather_fallback(f"fallback_status_{e.status_code}")
+
+    except UPSTREAM_UNAVAILABLE as e:
+        if isinstance(e, CircuitOpenError):
+            return weather_fallback("fallback_circuit_open")
+        return weather_fallback("fallback_rate_limited")
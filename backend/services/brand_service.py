@@ -0,0 +1,54 @@
+import os
+import json
+from backend.utils.text_utils import normalize
+
+# ===============================
+# CARGA DE CONFIGURACIÓN
+# ===============================
+TOP_BRANDS_PATH = os.path.join(os.path.dirname(__file__), "../data/top_50_brands.json")
+NORMALIZED_MAP_PATH = os.path.join(os.path.dirname(__file__), "../data/normalized_brands.json")
+
+with open(TOP_BRANDS_PATH, encoding="utf-8") as f:
+    ALLOWED_BRANDS_ORIGINAL = json.load(f)
+
+with open(NORMALIZED_MAP_PATH, encoding="utf-8") as f:
+    NORMALIZED_BRAND_MAP = json.load(f)
+
+ALLOWED_BRANDS_NORMALIZED = set(NORMALIZED_BRAND_MAP.keys())
+
+
+def _sorted_options(options):
+    return sorted(options, key=lambda x: x["label"])
+
+
+def brand_options(all_brands):
+    """
+    Filtra las marcas de NHTSA a las permitidas, con su nombre original.
+    """
+    filtered = []
+
+    for b in all_brands:
+        norm = normalize(b["Make_Name"])
+        if norm in ALLOWED_BRANDS_NORMALIZED:
+            original = NORMALIZED_BRAND_MAP[norm]
+            filtered.append({"label": original, "value": original})
+
+    return _sorted_options(filtered)
+
+
+def fallback_brand_options():
+    """
+    Lista local de marcas permitidas (cuando NHTSA no responde).
+    """
+    return _sorted_options([{"label": b, "value": b} for b in ALLOWED_BRANDS_ORIGINAL])
+
+
+def resolve_allowed_make(make):
+    """
+    Nombre canónico de la marca, o None si no está permitida.
+    """
+    return NORMALIZED_BRAND_MAP.get(normalize(make))
+
+
+def model_options(models):
+    return _sorted_options([{"label": m["Model_Name"], "value": m["Model_Name"]} for m in models])
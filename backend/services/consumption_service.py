@@ -1,4 +1,4 @@
-from typing import Literal, Dict
+from typing import Literal
 
 ConsumptionType = Literal["mixed", "highway"]
 
@@ -54,35 +54,3 @@ def resolve_base_consumption(
         return vehicle.lkm_mixed
 
     raise ConsumptionError("Vehículo sin consumo mixed")
-
-
-def calculate_trip_consumption(
-    *,
-    vehicle,
-    total_km: float,
-    highway_km: float | None = None
-) -> Dict:
-    """
-    Función principal usada por el endpoint.
-
-    Retorna:
-    {
-        consumption_type,
-        base_consumption
-    }
-    """
-
-    consumption_type = resolve_consumption_type(
-        total_km=total_km,
-        highway_km=highway_km
-    )
-
-    base_consumption = resolve_base_consumption(
-        vehicle=vehicle,
-        consumption_type=consumption_type
-    )
-
-    return {
-        "consumption_type": consumption_type,
-        "base_consumption": base_consumption
-    }
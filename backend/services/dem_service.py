@@ -0,0 +1,129 @@
+import os
+import threading
+import numpy as np
+from backend.config import DEM_TILES_DIR
+
+SRTM_VOID = -32768
+
+# Bytes de la tile → lado (SRTM3 / SRTM1, int16)
+SRTM_TILE_SIZES = {size * size * 2: size for size in (1201, 3601)}
+
+
+def srtm_tile_name(lat_floor: int, lng_floor: int) -> str:
+    """
+    Nombre SRTM de la tile cuya esquina suroeste es (lat_floor, lng_floor).
+    Ej: (-34, -71) → S34W071.hgt
+    """
+    ns = "N" if lat_floor >= 0 else "S"
+    ew = "E" if lng_floor >= 0 else "W"
+    return f"{ns}{abs(lat_floor):02d}{ew}{abs(lng_floor):03d}.hgt"
+
+
+class DemProvider:
+    """
+    Elevación offline desde tiles SRTM (.hgt) mapeadas en memoria.
+
+    - Cada tile cubre 1°×1°, int16 big-endian, filas de norte a sur
+    - Las tiles se abren (np.memmap) la primera vez que se necesitan
+    - Interpolación bilineal vectorizada para cualquier cantidad de puntos
+    - Puntos sin tile o con celdas vacías → NaN
+    """
+
+    def __init__(self, tiles_dir: str):
+        self.tiles_dir = tiles_dir
+        self._tiles = {}  # (lat_floor, lng_floor) → memmap | None
+        self._lock = threading.Lock()
+
+    def _open_tile(self, key):
+        path = os.path.join(self.tiles_dir, srtm_tile_name(*key))
+        if not os.path.exists(path):
+            return None
+
+        # Archivo truncado o que no es SRTM: se trata como tile faltante
+        # (la consulta cae a Google) en vez de leerlo con otra forma
+        file_size = os.path.getsize(path)
+        size = SRTM_TILE_SIZES.get(file_size)
+        if size is None:
+            print(f"⚠️ Tile DEM inválida ({file_size} bytes), se ignora: {path}")
+            return None
+
+        return np.memmap(path, dtype=">i2", mode="r", shape=(size, size))
+
+    def _get_tile(self, key):
+        tile = self._tiles.get(key, False)
+        if tile is not False:
+            return tile
+
+        with self._lock:
+            if key not in self._tiles:
+                self._tiles[key] = self._open_tile(key)
+            return self._tiles[key]
+
+    def covers(self, lat: float, lng: float) -> bool:
+        key = (int(np.floor(lat)), int(np.floor(lng)))
+        return self._get_tile(key) is not None
+
+    def elevations(self, lats, lngs) -> np.ndarray:
+        """
+        Elevación (m) interpolada para arrays de lat/lng.
+        """
+        lats = np.asarray(lats, dtype=np.float64)
+        lngs = np.asarray(lngs, dtype=np.float64)
+        result = np.full(lats.shape, np.nan)
+
+        lat_floor = np.floor(lats).astype(np.int64)
+        lng_floor = np.floor(lngs).astype(np.int64)
+
+        # Agrupar puntos por tile
+        tile_ids = (lat_floor + 90) * 360 + (lng_floor + 180)
+        for tile_id in np.unique(tile_ids):
+            mask = tile_ids == tile_id
+            key = (int(tile_id // 360) - 90, int(tile_id % 360) - 180)
+
+            tile = self._get_tile(key)
+            if tile is None:
+                continue
+
+            result[mask] = self._interpolate(tile, key, lats[mask], lngs[mask])
+
+        return result
+
+    @staticmethod
+    def _interpolate(tile, key, lats, lngs):
+        size = tile.shape[0]
+        last = size - 1
+
+        # fila 0 = borde norte (lat_floor + 1)
+        rows = (key[0] + 1 - lats) * last
+        cols = (lngs - key[1]) * last
+
+        r0 = np.clip(np.floor(rows).astype(np.int64), 0, last - 1)
+        c0 = np.clip(np.floor(cols).astype(np.int64), 0, last - 1)
+        fr = rows - r0
+        fc = cols - c0
+
+        z00 = tile[r0, c0].astype(np.float64)
+        z01 = tile[r0, c0 + 1].astype(np.float64)
+        z10 = tile[r0 + 1, c0].astype(np.float64)
+        z11 = tile[r0 + 1, c0 + 1].astype(np.float64)
+
+        values = (
+            z00 * (1 - fr) * (1 - fc)
+            + z01 * (1 - fr) * fc
+            + z10 * fr * (1 - fc)
+            + z11 * fr * fc
+        )
+
+        void = (z00 == SRTM_VOID) | (z01 == SRTM_VOID) | (z10 == SRTM_VOID) | (z11 == SRTM_VOID)
+        values[void] = np.nan
+        return values
+
+
+_provider = DemProvider(DEM_TILES_DIR) if DEM_TILES_DIR else None
+
+
+def get_dem_provider():
+    """
+    Proveedor DEM del proceso, o None si DEM_TILES_DIR no está configurado.
+    """
+    return _provider
@@ -0,0 +1,45 @@
+from backend.services import http_client
+from backend.services.resilience import guarded
+from backend.config import GOOGLE_MAPS_API_KEY
+
+DIRECTIONS_URL = "https://maps.googleapis.com/maps/api/directions/json"
+
+
+def format_location(location):
+    """
+    Acepta "lat,lng" / dirección (str) o { lat, lng }.
+    """
+    if isinstance(location, str):
+        return location
+    return f"{location['lat']},{location['lng']}"
+
+
+def directions_request_params(origin, destination):
+    return {
+        "origin": format_location(origin),
+        "destination": format_location(destination),
+        "key": GOOGLE_MAPS_API_KEY,
+    }
+
+
+def parse_directions_response(data):
+    if data["status"] != "OK":
+        raise Exception("Error en Google Directions API")
+
+    return data["routes"][0]
+
+
+@guarded(
+    "google_directions",
+    key=lambda origin, destination: (format_location(origin), format_location(destination)),
+)
+def get_directions_route(origin, destination):
+    """
+    Primera ruta sugerida por Google Directions (dict crudo de la API).
+    """
+
+    response = http_client.get(
+        DIRECTIONS_URL,
+        params=directions_request_params(origin, destination),
+    )
+    return parse_directions_response(response.json())
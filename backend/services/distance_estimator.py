@@ -0,0 +1,105 @@
+import threading
+import numpy as np
+from backend.config import CIRCUITY_DEFAULT, CIRCUITY_REGION_PRECISION
+from backend.utils.geo import geohash_encode, haversine_km
+
+# Peso de cada ruta nueva en el promedio móvil del factor
+CIRCUITY_SMOOTHING = 0.1
+
+# Rutas muy cortas o factores absurdos no calibran
+MIN_CALIBRATION_KM = 1.0
+MIN_CIRCUITY = 1.0
+MAX_CIRCUITY = 3.0
+
+
+class CircuityModel:
+    """
+    Factor ruta real / línea recta por región (prefijo geohash del origen).
+
+    Se calibra con cada distancia real obtenida de Google
+    (promedio móvil exponencial); las regiones sin datos usan
+    el promedio global.
+    """
+
+    def __init__(self, default: float, precision: int):
+        self.default = default
+        self.precision = precision
+        self._global = None
+        self._regions = {}  # geohash → (factor, muestras)
+        self._lock = threading.Lock()
+
+    def region_of(self, point) -> str:
+        return geohash_encode(float(point["lat"]), float(point["lng"]), self.precision)
+
+    def record(self, origin, destination, real_km: float):
+        straight_km = float(haversine_km(
+            float(origin["lat"]), float(origin["lng"]),
+            float(destination["lat"]), float(destination["lng"]),
+        ))
+
+        if straight_km < MIN_CALIBRATION_KM or not real_km:
+            return
+
+        ratio = real_km / straight_km
+        if not MIN_CIRCUITY <= ratio <= MAX_CIRCUITY:
+            return
+
+        region = self.region_of(origin)
+
+        with self._lock:
+            factor, samples = self._regions.get(region, (ratio, 0))
+            self._regions[region] = (
+                factor + CIRCUITY_SMOOTHING * (ratio - factor),
+                samples + 1,
+            )
+
+            if self._global is None:
+                self._global = ratio
+            else:
+                self._global += CIRCUITY_SMOOTHING * (ratio - self._global)
+
+    def factor(self, region: str) -> float:
+        entry = self._regions.get(region)
+        if entry is not None:
+            return entry[0]
+        return self._global if self._global is not None else self.default
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "default": self.default,
+                "global": self._global,
+                "regions": {
+                    region: {"factor": round(factor, 4), "samples": samples}
+                    for region, (factor, samples) in self._regions.items()
+                },
+            }
+
+
+_model = CircuityModel(CIRCUITY_DEFAULT, CIRCUITY_REGION_PRECISION)
+
+
+def record_real_distance(origin, destination, real_km):
+    _model.record(origin, destination, real_km)
+
+
+def get_circuity_stats():
+    return _model.stats()
+
+
+def estimate_distance_matrix_km(origins, destinations) -> np.ndarray:
+    """
+    Distancia estimada (km) de cada origen a cada destino, sin red.
+    """
+    o_lat = np.array([float(p["lat"]) for p in origins])[:, None]
+    o_lng = np.array([float(p["lng"]) for p in origins])[:, None]
+    d_lat = np.array([float(p["lat"]) for p in destinations])[None, :]
+    d_lng = np.array([float(p["lng"]) for p in destinations])[None, :]
+
+    factors = np.array([_model.factor(_model.region_of(p)) for p in origins])[:, None]
+
+    return haversine_km(o_lat, o_lng, d_lat, d_lng) * factors
+
+
+def estimate_distance_km(origin, destination) -> float:
+    return float(estimate_distance_matrix_km([origin], [destination])[0, 0])
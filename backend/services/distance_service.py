@@ -1,27 +1,300 @@
-import requests
-from backend.config import GOOGLE_MAPS_API_KEY
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from backend.services import http_client
+from backend.services.distance_estimator import record_real_distance, estimate_distance_matrix_km
+from backend.services.directions_service import format_location
+from backend.services.resilience import guarded, UPSTREAM_UNAVAILABLE
+from backend.config import (
+    GOOGLE_MAPS_API_KEY,
+    DISTANCE_CACHE_PRECISION,
+    DISTANCE_CACHE_TTL,
+    DISTANCE_CACHE_MAXSIZE,
+    DISTANCE_MATRIX_WORKERS,
+)
+from backend.utils.geo import geohash_encode
+from backend.utils.ttl_cache import TTLCache
 
+DISTANCE_MATRIX_URL = "https://maps.googleapis.com/maps/api/distancematrix/json"
 
-def get_distance_km(origin, destination):
+# Límites de Google Distance Matrix por request
+MAX_MATRIX_ORIGINS = 25
+MAX_MATRIX_DESTINATIONS = 25
+MAX_MATRIX_ELEMENTS = 100
+
+# (geohash origen, geohash destino) → km
+_distance_cache = TTLCache(
+    maxsize=DISTANCE_CACHE_MAXSIZE,
+    ttl=DISTANCE_CACHE_TTL,
+    name="distance",
+)
+
+_matrix_executor = ThreadPoolExecutor(
+    max_workers=DISTANCE_MATRIX_WORKERS,
+    thread_name_prefix="distance-matrix",
+)
+
+
+def route_cache_key(origin, destination):
     """
-    origin / destination:
-    { lat: float, lng: float }
+    Clave de caché: origen y destino ajustados a la grilla geohash.
     """
+    return (
+        geohash_encode(float(origin["lat"]), float(origin["lng"]), DISTANCE_CACHE_PRECISION),
+        geohash_encode(float(destination["lat"]), float(destination["lng"]), DISTANCE_CACHE_PRECISION),
+    )
+
+
+def get_distance_cache_stats():
+    return _distance_cache.stats()
+
+
+def _format_points(points):
+    return "|".join(format_location(p) for p in points)
 
-    url = "https://maps.googleapis.com/maps/api/distancematrix/json"
 
-    params = {
-        "origins": f"{origin['lat']},{origin['lng']}",
-        "destinations": f"{destination['lat']},{destination['lng']}",
+def matrix_request_params(origins, destinations):
+    return {
+        "origins": _format_points(origins),
+        "destinations": _format_points(destinations),
         "units": "metric",
         "key": GOOGLE_MAPS_API_KEY,
     }
 
-    response = requests.get(url, params=params)
-    data = response.json()
 
+def parse_matrix_response(data):
+    """
+    Retorna matriz len(origins) × len(destinations) en km (None si Google
+    no encontró ruta para ese par).
+    """
     if data["status"] != "OK":
         raise Exception("Error al calcular distancia")
 
-    meters = data["rows"][0]["elements"][0]["distance"]["value"]
-    return meters / 1000
+    return [
+        [
+            element["distance"]["value"] / 1000 if element["status"] == "OK" else None
+            for element in row["elements"]
+        ]
+        for row in data["rows"]
+    ]
+
+
+def get_cached_distance_km(origin, destination):
+    return _distance_cache.get(route_cache_key(origin, destination))
+
+
+def store_distance_km(origin, destination, distance_km):
+    """
+    Guarda una distancia real en caché y calibra el estimador local.
+    """
+    _distance_cache.set(route_cache_key(origin, destination), distance_km)
+    record_real_distance(origin, destination, distance_km)
+
+
+def single_distance(block):
+    distance_km = block[0][0]
+    if distance_km is None:
+        raise Exception("Error al calcular distancia")
+    return distance_km
+
+
+@guarded(
+    "google_distance_matrix",
+    key=lambda origins, destinations: (_format_points(origins), _format_points(destinations)),
+    cost=lambda origins, destinations: len(origins) * len(destinations),
+)
+def _fetch_matrix_block(origins, destinations):
+    """
+    Una llamada a Distance Matrix.
+    """
+    response = http_client.get(
+        DISTANCE_MATRIX_URL,
+        params=matrix_request_params(origins, destinations),
+    )
+    return parse_matrix_response(response.json())
+
+
+def get_distance_km(origin, destination):
+    """
+    origin / destination:
+    { lat: float, lng: float }  (o dirección en texto, sin caché)
+
+    Rutas repetidas se sirven desde caché (LRU + TTL).
+    """
+
+    if isinstance(origin, str) or isinstance(destination, str):
+        return single_distance(_fetch_matrix_block([origin], [destination]))
+
+    cached = get_cached_distance_km(origin, destination)
+    if cached is not None:
+        return cached
+
+    distance_km = single_distance(_fetch_matrix_block([origin], [destination]))
+    store_distance_km(origin, destination, distance_km)
+
+    return distance_km
+
+
+def _matrix_blocks(n_origins, n_destinations):
+    """
+    Divide la grilla en bloques que respetan los límites de Google.
+    """
+    dest_step = min(MAX_MATRIX_DESTINATIONS, n_destinations)
+    origin_step = max(1, min(MAX_MATRIX_ORIGINS, MAX_MATRIX_ELEMENTS // dest_step))
+
+    for i in range(0, n_origins, origin_step):
+        for j in range(0, n_destinations, dest_step):
+            yield (
+                np.arange(i, min(i + origin_step, n_origins)),
+                np.arange(j, min(j + dest_step, n_destinations)),
+            )
+
+
+def _off_diagonal_rectangles(lo, hi):
+    """
+    Cubre los pares i ≠ j de [lo, hi) con rectángulos filas × columnas
+    disjuntas (bisección): Google cobra cada elemento pedido y un
+    bloque con el mismo punto como origen y destino incluiría i → i.
+    Son exactamente n·(n-1) elementos en 2·(n-1) rectángulos.
+    """
+    if hi - lo < 2:
+        return
+
+    mid = (lo + hi) // 2
+    left, right = np.arange(lo, mid), np.arange(mid, hi)
+    yield left, right
+    yield right, left
+    yield from _off_diagonal_rectangles(lo, mid)
+    yield from _off_diagonal_rectangles(mid, hi)
+
+
+def plan_distance_matrix(origins, destinations, skip_diagonal=False):
+    """
+    Llena la matriz desde caché y agrupa las celdas pendientes en
+    bloques que respetan los límites de Google.
+
+    skip_diagonal (origins == destinations): la diagonal vale 0 y
+    ningún bloque la pide.
+
+    Retorna (matrix, missing, blocks, cache_hits); cada bloque es
+    (filas, columnas) con al menos una celda pendiente.
+    """
+    n, m = len(origins), len(destinations)
+    matrix = np.full((n, m), np.nan)
+    missing = np.zeros((n, m), dtype=bool)
+    cache_hits = 0
+
+    for i, origin in enumerate(origins):
+        for j, destination in enumerate(destinations):
+            if skip_diagonal and i == j:
+                matrix[i, j] = 0.0
+                continue
+
+            cached = get_cached_distance_km(origin, destination)
+
+            if cached is None:
+                missing[i, j] = True
+            else:
+                matrix[i, j] = cached
+                cache_hits += 1
+
+    if skip_diagonal:
+        rectangles = _off_diagonal_rectangles(0, n)
+    else:
+        rectangles = [(np.arange(n), np.arange(m))] if n and m else []
+
+    blocks = []
+    for rect_rows, rect_cols in rectangles:
+        # Solo filas/columnas del bloque con celdas pendientes
+        for r, c in _matrix_blocks(len(rect_rows), len(rect_cols)):
+            rows, cols = rect_rows[r], rect_cols[c]
+            block_missing = missing[np.ix_(rows, cols)]
+            if not block_missing.any():
+                continue
+
+            blocks.append((
+                rows[block_missing.any(axis=1)],
+                cols[block_missing.any(axis=0)],
+            ))
+
+    return matrix, missing, blocks, cache_hits
+
+
+def apply_matrix_block(matrix, missing, rows, cols, block, origins, destinations):
+    for bi, i in enumerate(rows):
+        for bj, j in enumerate(cols):
+            km = block[bi][bj]
+            if km is None:
+                continue
+
+            matrix[i, j] = km
+            if missing[i, j]:
+                store_distance_km(origins[i], destinations[j], km)
+
+
+def estimate_matrix_block(matrix, missing, rows, cols, origins, destinations):
+    """
+    Bloque rechazado (circuito abierto o sin cuota): las celdas
+    pendientes se llenan con la estimación local, sin cachearlas.
+    """
+    block_missing = missing[np.ix_(rows, cols)]
+    estimated = estimate_distance_matrix_km(
+        [origins[i] for i in rows],
+        [destinations[j] for j in cols],
+    )
+    matrix[np.ix_(rows, cols)] = np.where(block_missing, estimated, matrix[np.ix_(rows, cols)])
+
+    return int(block_missing.sum())
+
+
+def get_distance_matrix_km(origins, destinations, skip_diagonal=False):
+    """
+    Distancias (km) de cada origen a cada destino.
+
+    - Celdas en caché no se consultan
+    - skip_diagonal (mismas paradas como origen y destino): la
+      diagonal es 0 y no se pide a Google
+    - El resto se divide en bloques de ≤25×25 y ≤100 elementos
+    - Los bloques se consultan en paralelo
+    - Bloques rechazados por el circuit breaker o el límite de cuota
+      se estiman localmente (haversine × circuity)
+
+    Retorna:
+    {
+        distances_km: np.ndarray (NaN si no hay ruta),
+        cache_hits,
+        api_calls,
+        estimated_cells
+    }
+    """
+
+    matrix, missing, blocks, cache_hits = plan_distance_matrix(origins, destinations, skip_diagonal)
+
+    futures = [
+        (
+            rows,
+            cols,
+            _matrix_executor.submit(
+                _fetch_matrix_block,
+                [origins[i] for i in rows],
+                [destinations[j] for j in cols],
+            ),
+        )
+        for rows, cols in blocks
+    ]
+
+    estimated_cells = 0
+    for rows, cols, future in futures:
+        try:
+            block = future.result()
+        except UPSTREAM_UNAVAILABLE:
+            estimated_cells += estimate_matrix_block(matrix, missing, rows, cols, origins, destinations)
+            continue
+
+        apply_matrix_block(matrix, missing, rows, cols, block, origins, destinations)
+
+    return {
+        "distances_km": matrix,
+        "cache_hits": cache_hits,
+        "api_calls": len(futures),
+        "estimated_cells": estimated_cells,
+    }
@@ -1,31 +1,100 @@
-import requests
+import numpy as np
+from backend.services import http_client
+from backend.services.dem_service import get_dem_provider
+from backend.services.resilience import guarded
 from backend.config import GOOGLE_MAPS_API_KEY
 
+ELEVATION_URL = "https://maps.googleapis.com/maps/api/elevation/json"
 
-def get_elevation_difference(origin, destination):
+# Google acepta hasta 512 puntos; se limita por largo de URL
+GOOGLE_ELEVATION_BATCH = 256
+
+
+def google_location_batches(points):
     """
-    Retorna diferencia de elevación en metros (destino - origen)
+    Divide los puntos en strings "lat,lng|lat,lng|..." por request.
     """
+    if not GOOGLE_MAPS_API_KEY:
+        raise Exception("API Key de Google no configurada")
 
-    url = "https://maps.googleapis.com/maps/api/elevation/json"
+    return [
+        "|".join(f"{p['lat']},{p['lng']}" for p in points[start:start + GOOGLE_ELEVATION_BATCH])
+        for start in range(0, len(points), GOOGLE_ELEVATION_BATCH)
+    ]
 
-    locations = (
-        f"{origin['lat']},{origin['lng']}|"
-        f"{destination['lat']},{destination['lng']}"
-    )
 
-    params = {
+def elevation_request_params(locations):
+    return {
         "locations": locations,
         "key": GOOGLE_MAPS_API_KEY,
     }
 
-    response = requests.get(url, params=params)
-    data = response.json()
 
+def parse_elevation_response(data):
     if data["status"] != "OK":
         raise Exception("Error al obtener elevación")
 
-    elev_origin = data["results"][0]["elevation"]
-    elev_dest = data["results"][1]["elevation"]
+    return [r["elevation"] for r in data["results"]]
+
+
+@guarded("google_elevation", key=lambda locations: locations)
+def _fetch_google_batch(locations):
+    response = http_client.get(ELEVATION_URL, params=elevation_request_params(locations))
+    return parse_elevation_response(response.json())
+
+
+def dem_elevations(points) -> np.ndarray:
+    """
+    Elevaciones desde el DEM local; NaN donde no hay cobertura.
+    """
+    if not points:
+        return np.empty(0)
+
+    dem = get_dem_provider()
+    if dem is None:
+        return np.full(len(points), np.nan)
+
+    return dem.elevations(
+        [float(p["lat"]) for p in points],
+        [float(p["lng"]) for p in points],
+    )
+
+
+def merge_elevations(elevations, missing, google_elevations, total):
+    elevations[missing] = google_elevations
+    source = "google" if len(missing) == total else "dem+google"
+    return elevations.tolist(), source
+
+
+def get_elevations(points):
+    """
+    Elevación (m) para una lista de puntos { lat, lng }.
+
+    Prioridad:
+    1. DEM local (sin red)
+    2. Google Elevation solo para puntos fuera de las tiles cubiertas
+
+    Retorna (elevations: list[float], source: "dem" | "google" | "dem+google")
+    """
+
+    elevations = dem_elevations(points)
+    missing = np.flatnonzero(np.isnan(elevations))
+
+    if len(missing) == 0:
+        return elevations.tolist(), "dem"
+
+    google_elevations = []
+    for locations in google_location_batches([points[i] for i in missing]):
+        google_elevations.extend(_fetch_google_batch(locations))
+
+    return merge_elevations(elevations, missing, google_elevations, len(points))
+
+
+def get_elevation_difference(origin, destination):
+    """
+    Retorna diferencia de elevación en metros (destino - origen)
+    """
+
+    (elev_origin, elev_dest), _ = get_elevations([origin, destination])
 
     return elev_dest - elev_origin
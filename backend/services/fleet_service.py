@@ -0,0 +1,152 @@
+import numpy as np
+from backend.config import FLEET_COMPARE_CHUNK_CELLS
+from backend.services.segment_service import classify_segments, segment_climbs
+from backend.utils.text_utils import normalize
+from backend.utils.trip_calculation import round_like_python
+
+
+class FleetFilterError(Exception):
+    """Filtro inválido (→ 400)"""
+    pass
+
+
+def _as_list(value):
+    return value if isinstance(value, list) else [value]
+
+
+def fleet_mask(table, filters=None):
+    """
+    Filas simulables del catálogo que cumplen los filtros:
+    { make: str | [str], fuel_type: str | [str],
+      year: int | [int] | { min, max } }
+    """
+    mask = table.simulable()
+    filters = filters or {}
+
+    try:
+        if filters.get("make") is not None:
+            makes = [normalize(m) for m in _as_list(filters["make"])]
+            mask &= np.isin(table.make_key, makes)
+
+        if filters.get("fuel_type") is not None:
+            fuel_types = [f.strip().lower() for f in _as_list(filters["fuel_type"])]
+            mask &= np.isin(table.fuel_type_key, fuel_types)
+
+        year = filters.get("year")
+        if isinstance(year, dict):
+            if year.get("min") is not None:
+                mask &= table.year >= int(year["min"])
+            if year.get("max") is not None:
+                mask &= table.year <= int(year["max"])
+        elif year is not None:
+            mask &= np.isin(table.year, [int(y) for y in _as_list(year)])
+    except (AttributeError, TypeError, ValueError):
+        raise FleetFilterError("Filtros inválidos")
+
+    return mask
+
+
+def _fleet_fc_by_segments(table, rows, route_context, extra_weight, climate):
+    """
+    Igual que la simulación por tramos de calculate-and-save, para
+    todas las filas a la vez (vehículos × tramos, por bloques).
+    """
+    steps = route_context["steps"]
+    distance_km = steps["distance_km"]
+    n_steps = len(distance_km)
+    total_km = distance_km.sum()
+
+    _, is_highway = classify_segments(distance_km, steps["duration_s"])
+    climb_m, descent_m = segment_climbs(route_context["track"], distance_km)
+
+    chunk = max(1, FLEET_COMPARE_CHUNK_CELLS // max(1, n_steps))
+    adjusted = np.empty(len(rows))
+    base = np.empty(len(rows))
+
+    for start in range(0, len(rows), chunk):
+        block = rows[start:start + chunk]
+        base_fc = np.where(is_highway[None, :], table.highway_fc[block][:, None], table.mixed_fc[block][:, None])
+
+        segment_fc = table.adjusted_fc(
+            np.repeat(block, n_steps),
+            base_fc=base_fc.ravel(),
+            extra_weight=extra_weight,
+            road_grade=0.0,
+            climate=climate,
+            distance_km=np.tile(distance_km, len(block)),
+            climb_m=np.tile(climb_m, len(block)),
+            descent_m=np.tile(descent_m, len(block)),
+            trip_distance_km=route_context["distance_km"],
+            ndigits=None,
+        ).reshape(len(block), n_steps)
+
+        if total_km > 0:
+            adjusted[start:start + len(block)] = (segment_fc * distance_km).sum(axis=1) / total_km
+            base[start:start + len(block)] = (base_fc * distance_km).sum(axis=1) / total_km
+        else:
+            adjusted[start:start + len(block)] = segment_fc.mean(axis=1)
+            base[start:start + len(block)] = table.mixed_fc[block]
+
+    return adjusted, base
+
+
+def compare_fleet(table, mask, route_context, *, extra_weight, fuel_price, top_k):
+    """
+    Consumo y costo de cada vehículo de la máscara para una misma ruta,
+    en una pasada vectorizada (mismo cálculo que calculate-and-save).
+
+    Retorna (vehículos evaluados, top_k resultados de menor consumo).
+    """
+    rows = np.flatnonzero(mask)
+    distance_km = route_context["distance_km"]
+    climate = route_context["weather"]["climate"]
+
+    if len(rows) == 0:
+        return 0, []
+
+    if route_context.get("steps") is not None and route_context.get("track") is not None:
+        adjusted_fc, base_fc = _fleet_fc_by_segments(table, rows, route_context, extra_weight, climate)
+    else:
+        base_fc = table.mixed_fc[rows]
+        road_grade = (
+            round((route_context["elevation_diff"] / (distance_km * 1000)) * 100, 2)
+            if distance_km
+            else 0
+        )
+        adjusted_fc = table.adjusted_fc(
+            rows,
+            base_fc=base_fc,
+            extra_weight=extra_weight,
+            road_grade=road_grade,
+            climate=climate,
+            distance_km=distance_km,
+            climb_m=route_context["climb_m"],
+            descent_m=route_context["descent_m"],
+            ndigits=None,
+        )
+
+    adjusted_fc = round_like_python(adjusted_fc, 3)
+    fuel_used = distance_km * adjusted_fc / 100
+
+    # Top-k sin ordenar toda la flota
+    k = min(top_k, len(rows))
+    best = np.argpartition(fuel_used, k - 1)[:k]
+    best = best[np.argsort(fuel_used[best], kind="stable")]
+
+    results = [
+        {
+            "rank": rank + 1,
+            "vehicleId": int(table.ids[rows[i]]),
+            "make": table.make[rows[i]],
+            "model": table.model[rows[i]],
+            "year": int(table.year[rows[i]]),
+            "fuel_type": table.fuel_type[rows[i]],
+            "baseFC": round(float(base_fc[i]), 3),
+            "adjustedFC": round(float(adjusted_fc[i]), 3),
+            "fuelUsed": round(float(fuel_used[i]), 2),
+            "totalCost": round(float(fuel_used[i]) * fuel_price, 2),
+        }
+        for rank, i in enumerate(best.tolist())
+    ]
+
+    return len(rows), results
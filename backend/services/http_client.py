@@ -0,0 +1,95 @@
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from backend.config import (
+    HTTP_CONNECT_TIMEOUT,
+    HTTP_READ_TIMEOUT,
+    HTTP_MAX_RETRIES,
+    HTTP_BACKOFF_FACTOR,
+    HTTP_POOL_MAXSIZE,
+)
+
+# Conexiones keep-alive máximas por host.
+# Google concentra distancia, direcciones y elevación → pool más grande.
+HOST_POOL_SIZES = {
+    "maps.googleapis.com": HTTP_POOL_MAXSIZE * 2,
+    "api.openweathermap.org": HTTP_POOL_MAXSIZE,
+    "vpic.nhtsa.dot.gov": HTTP_POOL_MAXSIZE,
+}
+
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def _build_retry() -> Retry:
+    """
+    Reintentos acotados con backoff exponencial.
+    Solo GET (idempotente); el último intento devuelve la respuesta tal cual.
+    """
+    return Retry(
+        total=HTTP_MAX_RETRIES,
+        connect=HTTP_MAX_RETRIES,
+        read=HTTP_MAX_RETRIES,
+        status=HTTP_MAX_RETRIES,
+        backoff_factor=HTTP_BACKOFF_FACTOR,
+        status_forcelist=RETRY_STATUS_CODES,
+        allowed_methods=frozenset({"GET"}),
+        raise_on_status=False,
+    )
+
+
+def _build_adapter(pool_maxsize: int) -> HTTPAdapter:
+    return HTTPAdapter(
+        pool_connections=1,
+        pool_maxsize=pool_maxsize,
+        max_retries=_build_retry(),
+    )
+
+
+def _build_session() -> requests.Session:
+    session = requests.Session()
+
+    # Adaptador por defecto para cualquier otro host
+    default_adapter = HTTPAdapter(
+        pool_connections=len(HOST_POOL_SIZES) + 4,
+        pool_maxsize=HTTP_POOL_MAXSIZE,
+        max_retries=_build_retry(),
+    )
+    session.mount("https://", default_adapter)
+    session.mount("http://", default_adapter)
+
+    # Un pool dedicado por host conocido (requests elige el prefijo más largo)
+    for host, pool_maxsize in HOST_POOL_SIZES.items():
+        session.mount(f"https://{host}/", _build_adapter(pool_maxsize))
+
+    return session
+
+
+def get_session() -> requests.Session:
+    """
+    Sesión HTTP compartida por todo el proceso (lazy, thread-safe).
+    """
+    global _session
+
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = _build_session()
+
+    return _session
+
+
+def get(url, params=None, timeout=None, **kwargs) -> requests.Response:
+    """
+    GET usando la sesión compartida.
+
+    timeout: segundos o tupla (connect, read).
+    Por defecto usa HTTP_CONNECT_TIMEOUT / HTTP_READ_TIMEOUT.
+    """
+    if timeout is None:
+        timeout = (HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT)
+
+    return get_session().get(url, params=params, timeout=timeout, **kwargs)
@@ -0,0 +1,136 @@
+import numpy as np
+from backend.config import ITINERARY_TIME_BUDGET
+from backend.services.distance_estimator import estimate_distance_matrix_km
+from backend.services.distance_service import get_distance_matrix_km
+from backend.services.elevation_service import get_elevations
+from backend.utils.tour_optimizer import optimize_route, route_cost
+
+
+def build_leg_matrices(stops):
+    """
+    Distancia (km) y desnivel (m, destino - origen) entre cada par
+    de paradas.
+
+    La distancia sale de Distance Matrix (bloques en paralelo, con
+    caché de rutas, sin pedir la diagonal i → i); pares sin ruta o
+    sin API usan la estimación local.
+    La elevación es una sola consulta por parada (DEM primero).
+    """
+    try:
+        matrix = get_distance_matrix_km(stops, stops, skip_diagonal=True)
+        distances = matrix["distances_km"]
+        meta = {
+            "cache_hits": matrix["cache_hits"],
+            "api_calls": matrix["api_calls"],
+            "estimated_cells": matrix["estimated_cells"],
+        }
+    except Exception as e:
+        print(f"⚠️ Matriz de distancias no disponible, usando estimación local: {e!r}")
+        distances = np.full((len(stops), len(stops)), np.nan)
+        meta = {"cache_hits": 0, "api_calls": 0, "estimated_cells": 0}
+
+    no_route = np.isnan(distances)
+    np.fill_diagonal(no_route, False)
+    if no_route.any():
+        distances[no_route] = estimate_distance_matrix_km(stops, stops)[no_route]
+        meta["estimated_cells"] += int(no_route.sum())  # más los bloques ya estimados
+    np.fill_diagonal(distances, 0.0)
+
+    try:
+        elevations, meta["elevation_source"] = get_elevations(stops)
+        elevations = np.asarray(elevations, dtype=np.float64)
+    except Exception as e:
+        print(f"⚠️ Elevación no disponible, usando 0 m: {e!r}")
+        elevations = np.zeros(len(stops))
+        meta["elevation_source"] = "fallback_lookup_failed"
+
+    delta_m = elevations[None, :] - elevations[:, None]
+
+    return distances, delta_m, meta
+
+
+def leg_fuel_matrix(table, row, distances, delta_m, extra_weight, climate):
+    """
+    Litros por tramo i → j (mismo cálculo que calculate_fuel_consumption,
+    con la subida / bajada del tramo), en una pasada vectorizada.
+    """
+    n = len(distances)
+    d = distances.ravel()
+    delta = delta_m.ravel()
+
+    fc = table.adjusted_fc(
+        np.full(n * n, row),
+        base_fc=table.base_fc([row], "mixed"),
+        extra_weight=extra_weight,
+        road_grade=0.0,
+        climate=climate,
+        distance_km=d,
+        climb_m=np.maximum(delta, 0.0),
+        descent_m=np.maximum(-delta, 0.0),
+    )
+
+    return (d * fc / 100).reshape(n, n), fc.reshape(n, n)
+
+
+def _legs(order, distances, litres, fc, fuel_price, closed):
+    pairs = list(zip(order[:-1], order[1:]))
+    if closed:
+        pairs.append((order[-1], order[0]))
+
+    return [
+        {
+            "from": int(i),
+            "to": int(j),
+            "distance_km": round(float(distances[i, j]), 3),
+            "fuel_l_per_100km": float(fc[i, j]),
+            "fuel_l": round(float(litres[i, j]), 3),
+            "cost": round(float(litres[i, j]) * fuel_price, 2),
+        }
+        for i, j in pairs
+    ]
+
+
+def plan_itinerary(stops, table, row, *, extra_weight, climate, fuel_price,
+                   return_to_start=False, time_budget=ITINERARY_TIME_BUDGET):
+    """
+    Orden de visita que minimiza el combustible (y por lo tanto el
+    costo) partiendo de la primera parada.
+
+    Retorna:
+    {
+        order,           # índices de `stops` en orden de visita
+        legs,
+        total_distance_km, total_fuel_l, total_cost,
+        baseline,        # mismo cálculo con el orden recibido
+        matrix,          # cache_hits / api_calls / estimated_cells / elevation_source
+        solver           # costo inicial / final, movimientos, tiempo
+    }
+    """
+    distances, delta_m, meta = build_leg_matrices(stops)
+    litres, fc = leg_fuel_matrix(table, row, distances, delta_m, extra_weight, climate)
+
+    order, solver = optimize_route(litres, start=0, closed=return_to_start, time_budget=time_budget)
+    given = list(range(len(stops)))
+
+    total_fuel = route_cost(litres, order, return_to_start)
+    baseline_fuel = route_cost(litres, given, return_to_start)
+
+    return {
+        "order": [int(i) for i in order],
+        "legs": _legs(order, distances, litres, fc, fuel_price, return_to_start),
+        "total_distance_km": round(route_cost(distances, order, return_to_start), 3),
+        "total_fuel_l": round(total_fuel, 3),
+        "total_cost": round(total_fuel * fuel_price, 2),
+        "baseline": {
+            "total_distance_km": round(route_cost(distances, given, return_to_start), 3),
+            "total_fuel_l": round(baseline_fuel, 3),
+            "total_cost": round(baseline_fuel * fuel_price, 2),
+        },
+        "matrix": meta,
+        "solver": {
+            "moves": solver["moves"],
+            "elapsed_ms": solver["elapsed_ms"],
+            "timed_out": solver["timed_out"],
+            "initial_fuel_l": round(solver["initial_cost"], 3),
+        },
+    }
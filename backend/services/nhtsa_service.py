@@ -0,0 +1,39 @@
+from backend.services import http_client
+from backend.services.resilience import guarded
+
+NHTSA_BASE_URL = "https://vpic.nhtsa.dot.gov/api/vehicles"
+
+
+class NhtsaError(Exception):
+    """Respuesta no exitosa de la API de NHTSA"""
+    pass
+
+
+NHTSA_PARAMS = {"format": "json"}
+
+
+def nhtsa_url(path):
+    return f"{NHTSA_BASE_URL}/{path}"
+
+
+def parse_nhtsa_response(status_code, data):
+    if status_code != 200:
+        raise NhtsaError(f"NHTSA respondió {status_code}")
+
+    return data.get("Results", [])
+
+
+def _get_results(path):
+    response = http_client.get(nhtsa_url(path), params=NHTSA_PARAMS)
+    data = response.json() if response.status_code == 200 else None
+    return parse_nhtsa_response(response.status_code, data)
+
+
+@guarded("nhtsa", key=lambda: "getallmakes")
+def get_all_makes():
+    return _get_results("getallmakes")
+
+
+@guarded("nhtsa", key=lambda make: make)
+def get_models_for_make(make):
+    return _get_results(f"getmodelsformake/{make}")
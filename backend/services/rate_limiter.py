@@ -0,0 +1,181 @@
+import asyncio
+import threading
+import time
+from datetime import datetime, timezone
+from backend.config import RATE_LIMITS, RATE_LIMIT_MAX_WAIT, RATE_LIMIT_MAX_QUEUE
+
+
+class QuotaExceededError(Exception):
+    """Sin tokens (cola llena / espera excesiva) o presupuesto diario agotado."""
+    pass
+
+
+class TokenBucket:
+    """
+    Token bucket para llamadas salientes a una API.
+
+    - rate: tokens repuestos por segundo
+    - capacity: ráfaga máxima
+    - daily_budget: tokens por día UTC (0 = sin límite)
+    - max_wait / max_queue: cuánto y cuántos pueden esperar tokens;
+      pasado eso se descarta la llamada (QuotaExceededError)
+    """
+
+    def __init__(self, name, rate, capacity, daily_budget=0,
+                 max_wait=RATE_LIMIT_MAX_WAIT, max_queue=RATE_LIMIT_MAX_QUEUE):
+        self.name = name
+        self.rate = rate
+        self.capacity = capacity
+        self.daily_budget = daily_budget
+        self.max_wait = max_wait
+        self.max_queue = max_queue
+
+        self.tokens = capacity
+        self.updated_at = time.monotonic()
+        self.waiting = 0
+
+        self.day = self._today()
+        self.used_today = 0
+        self.total_shed = 0
+        self.total_waited = 0
+
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _today():
+        return datetime.now(timezone.utc).date()
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+        today = self._today()
+        if today != self.day:
+            self.day = today
+            self.used_today = 0
+
+    def _shed(self, reason):
+        self.total_shed += 1
+        raise QuotaExceededError(f"Límite de '{self.name}': {reason}")
+
+    def _take_or_wait(self, cost, deadline, is_retry):
+        """
+        Toma `cost` tokens si hay. Si no, retorna los segundos a esperar
+        (o descarta si la espera no cabe en el deadline / la cola está llena).
+
+        Una llamada más cara que la ráfaga espera solo hasta tener el
+        bucket lleno, pero al presupuesto diario se le cobra completa.
+        """
+        tokens = min(cost, self.capacity)
+
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+
+            if self.daily_budget and self.used_today + cost > self.daily_budget:
+                self._shed("presupuesto diario agotado")
+
+            if self.tokens >= tokens:
+                self.tokens -= tokens
+                self.used_today += cost
+                return 0.0
+
+            wait = (tokens - self.tokens) / self.rate
+            if now + wait > deadline:
+                self._shed("espera excesiva")
+
+            if not is_retry:
+                if self.waiting >= self.max_queue:
+                    self._shed("cola llena")
+                self.waiting += 1
+                self.total_waited += 1
+
+            return wait
+
+    def _leave_queue(self):
+        with self._lock:
+            self.waiting -= 1
+
+    def acquire(self, cost=1):
+        deadline = time.monotonic() + self.max_wait
+        queued = False
+
+        try:
+            while True:
+                wait = self._take_or_wait(cost, deadline, queued)
+                if wait == 0.0:
+                    return
+                queued = True
+                time.sleep(wait)
+        finally:
+            if queued:
+                self._leave_queue()
+
+    async def acquire_async(self, cost=1):
+        deadline = time.monotonic() + self.max_wait
+        queued = False
+
+        try:
+            while True:
+                wait = self._take_or_wait(cost, deadline, queued)
+                if wait == 0.0:
+                    return
+                queued = True
+                await asyncio.sleep(wait)
+        finally:
+            if queued:
+                self._leave_queue()
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            self._refill(time.monotonic())
+            return {
+                "name": self.name,
+                "rate_per_second": self.rate,
+                "burst": self.capacity,
+                "tokens": round(self.tokens, 2),
+                "waiting": self.waiting,
+                "daily_budget": self.daily_budget or None,
+                "used_today": self.used_today,
+                "total_waited": self.total_waited,
+                "total_shed": self.total_shed,
+            }
+
+
+def _parse_limit(spec, upstream=None):
+    """
+    "tokens_por_segundo,ráfaga,presupuesto_diario" → (rate, burst, daily).
+    rate y ráfaga deben ser > 0 (un bucket sin reposición nunca
+    entregaría tokens); para cortar una API usar el presupuesto diario.
+    """
+    rate, burst, daily = (float(part) for part in spec.split(","))
+    if rate <= 0 or burst <= 0:
+        raise ValueError(f"RATE_LIMIT de '{upstream}' inválido ({spec!r}): tasa y ráfaga deben ser > 0")
+    if daily < 0:
+        raise ValueError(f"RATE_LIMIT de '{upstream}' inválido ({spec!r}): presupuesto diario negativo")
+    return rate, burst, int(daily)
+
+
+_buckets = {}
+_buckets_lock = threading.Lock()
+
+
+def get_bucket(upstream: str) -> TokenBucket | None:
+    """
+    Bucket de la API, o None si no tiene límite configurado.
+    """
+    with _buckets_lock:
+        if upstream not in _buckets:
+            spec = RATE_LIMITS.get(upstream)
+            if spec is None:
+                _buckets[upstream] = None
+            else:
+                rate, burst, daily = _parse_limit(spec, upstream)
+                _buckets[upstream] = TokenBucket(upstream, rate, burst, daily)
+        return _buckets[upstream]
+
+
+def get_rate_limits_snapshot():
+    with _buckets_lock:
+        buckets = [b for b in _buckets.values() if b is not None]
+    return [bucket.snapshot() for bucket in buckets]
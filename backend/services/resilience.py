@@ -0,0 +1,225 @@
+import threading
+import time
+from functools import wraps
+from backend.config import BREAKER_FAILURE_THRESHOLD, BREAKER_RECOVERY_TIMEOUT
+from backend.services.rate_limiter import get_bucket, QuotaExceededError
+from backend.utils.single_flight import SingleFlight, AsyncSingleFlight
+
+
+class CircuitOpenError(Exception):
+    """La API externa está marcada como caída; se falla rápido."""
+    pass
+
+
+# API no disponible localmente: circuito abierto o sin cuota.
+# Los llamadores usan su fallback (caché, estimación, "mild", ...).
+UPSTREAM_UNAVAILABLE = (CircuitOpenError, QuotaExceededError)
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker clásico por API externa.
+
+    - closed: llamadas normales; N fallos seguidos → open
+    - open: falla rápido (CircuitOpenError) durante recovery_timeout
+    - half_open: deja pasar una llamada de prueba;
+      éxito → closed, fallo → open otra vez
+    """
+
+    def __init__(self, name: str, failure_threshold: int, recovery_timeout: float):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+
+        self.state = "closed"
+        self.consecutive_failures = 0
+        self.opened_at = None
+        self._probe_in_flight = False
+
+        self.total_calls = 0
+        self.total_failures = 0
+        self.total_rejected = 0
+        self.last_error = None
+
+        self._lock = threading.Lock()
+
+    def before_call(self):
+        with self._lock:
+            if self.state == "open":
+                if time.monotonic() - self.opened_at < self.recovery_timeout:
+                    self.total_rejected += 1
+                    raise CircuitOpenError(f"Servicio '{self.name}' no disponible (circuito abierto)")
+                self.state = "half_open"
+
+            if self.state == "half_open":
+                if self._probe_in_flight:
+                    self.total_rejected += 1
+                    raise CircuitOpenError(f"Servicio '{self.name}' no disponible (probando recuperación)")
+                self._probe_in_flight = True
+
+            self.total_calls += 1
+
+    def release_probe(self):
+        """
+        La llamada no llegó a la API o se canceló antes de terminar:
+        no cuenta como fallo, pero deja pasar la siguiente prueba.
+        """
+        with self._lock:
+            self._probe_in_flight = False
+
+    def record_success(self):
+        with self._lock:
+            self.state = "closed"
+            self.consecutive_failures = 0
+            self.opened_at = None
+            self._probe_in_flight = False
+
+    def record_failure(self, error):
+        with self._lock:
+            self.total_failures += 1
+            self.consecutive_failures += 1
+            self.last_error = repr(error)
+            self._probe_in_flight = False
+
+            if self.state == "half_open" or self.consecutive_failures >= self.failure_threshold:
+                self.state = "open"
+                self.opened_at = time.monotonic()
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            retry_in = None
+            if self.state == "open":
+                retry_in = max(0.0, self.recovery_timeout - (time.monotonic() - self.opened_at))
+
+            return {
+                "name": self.name,
+                "state": self.state,
+                "consecutive_failures": self.consecutive_failures,
+                "failure_threshold": self.failure_threshold,
+                "retry_in_seconds": round(retry_in, 2) if retry_in is not None else None,
+                "total_calls": self.total_calls,
+                "total_failures": self.total_failures,
+                "total_rejected": self.total_rejected,
+                "last_error": self.last_error,
+            }
+
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+_flights = SingleFlight()
+_async_flights = AsyncSingleFlight()
+
+
+def get_breaker(upstream: str) -> CircuitBreaker:
+    with _breakers_lock:
+        breaker = _breakers.get(upstream)
+        if breaker is None:
+            breaker = CircuitBreaker(upstream, BREAKER_FAILURE_THRESHOLD, BREAKER_RECOVERY_TIMEOUT)
+            _breakers[upstream] = breaker
+        return breaker
+
+
+def get_breakers_snapshot():
+    with _breakers_lock:
+        breakers = list(_breakers.values())
+    return [breaker.snapshot() for breaker in breakers]
+
+
+def get_single_flight_stats():
+    return {
+        "shared_calls": _flights.shared + _async_flights.shared,
+        "in_flight": _flights.in_flight() + _async_flights.in_flight(),
+    }
+
+
+def guarded(upstream: str, key=None, cost=None):
+    """
+    Decorador para funciones que llaman a una API externa.
+
+    - upstream: nombre del circuit breaker y del token bucket (uno por API)
+    - key(*args, **kwargs): clave de llamadas idénticas; si se entrega,
+      llamadas concurrentes con la misma clave comparten un solo request
+    - cost(*args, **kwargs): tokens que consume la llamada (default 1)
+
+    Con el circuito abierto lanza CircuitOpenError, y sin cuota
+    QuotaExceededError, sin llamar a la API, para que el llamador use
+    su fallback (ver UPSTREAM_UNAVAILABLE).
+    """
+    breaker = get_breaker(upstream)
+    bucket = get_bucket(upstream)
+
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            def call():
+                breaker.before_call()
+                if bucket is not None:
+                    try:
+                        bucket.acquire(cost(*args, **kwargs) if cost else 1)
+                    except BaseException:
+                        # Sin cuota, error en cost() o cancelación: no llegó a la API
+                        breaker.release_probe()
+                        raise
+                try:
+                    result = func(*args, **kwargs)
+                except Exception as e:
+                    breaker.record_failure(e)
+                    raise
+                except BaseException:
+                    # Cancelada (p. ej. wait_for con timeout): se libera la prueba
+                    breaker.release_probe()
+                    raise
+                breaker.record_success()
+                return result
+
+            if key is None:
+                return call()
+
+            return _flights.do((upstream, func.__qualname__, key(*args, **kwargs)), call)
+
+        return wrapper
+
+    return decorator
+
+
+def guarded_async(upstream: str, key=None, cost=None):
+    """
+    Igual que `guarded`, para corrutinas (comparte el circuit breaker
+    y el token bucket de la API con la versión síncrona).
+    """
+    breaker = get_breaker(upstream)
+    bucket = get_bucket(upstream)
+
+    def decorator(func):
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            async def call():
+                breaker.before_call()
+                if bucket is not None:
+                    try:
+                        await bucket.acquire_async(cost(*args, **kwargs) if cost else 1)
+                    except BaseException:
+                        # Sin cuota, error en cost() o cancelación: no llegó a la API
+                        breaker.release_probe()
+                        raise
+                try:
+                    result = await func(*args, **kwargs)
+                except Exception as e:
+                    breaker.record_failure(e)
+                    raise
+                except BaseException:
+                    # Cancelada (p. ej. wait_for con timeout): se libera la prueba
+                    breaker.release_probe()
+                    raise
+                breaker.record_success()
+                return result
+
+            if key is None:
+                return await call()
+
+            return await _async_flights.do((upstream, func.__qualname__, key(*args, **kwargs)), call)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,151 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from backend.config import (
+    LOOKUP_MAX_WORKERS,
+    DISTANCE_LOOKUP_TIMEOUT,
+    ELEVATION_LOOKUP_TIMEOUT,
+    WEATHER_LOOKUP_TIMEOUT,
+)
+from backend.services.distance_service import get_distance_km
+from backend.services.distance_estimator import estimate_distance_km
+from backend.services.elevation_service import get_elevations
+from backend.services.route_profile_service import get_route_profile
+from backend.services.weather_service import get_weather_from_coords, weather_fallback
+
+# Pool acotado compartido por todas las peticiones del proceso
+_executor = ThreadPoolExecutor(
+    max_workers=LOOKUP_MAX_WORKERS,
+    thread_name_prefix="route-lookup",
+)
+
+
+def _wait(future, deadline):
+    """
+    Espera el resultado hasta el deadline absoluto de esa consulta.
+    """
+    return future.result(timeout=max(0.0, deadline - time.monotonic()))
+
+
+def _endpoint_profile(origin, destination):
+    """
+    Elevación solo entre origen y destino (sin perfil de ruta).
+    """
+    try:
+        (elev_origin, elev_dest), source = get_elevations([origin, destination])
+        return {"elevation_diff": elev_dest - elev_origin, "source": source}
+    except Exception as e:
+        print(f"⚠️ Elevación no disponible, usando 0 m: {e!r}")
+        return {"elevation_diff": 0, "source": "fallback_lookup_failed"}
+
+
+def _endpoint_profile_until(origin, destination, deadline):
+    """
+    _endpoint_profile dentro del tiempo que le queda a la elevación;
+    si no alcanza, {} (diferencia 0 m).
+    """
+    if deadline <= time.monotonic():
+        return {}
+
+    future = _executor.submit(_endpoint_profile, origin, destination)
+    try:
+        return _wait(future, deadline)
+    except Exception as e:
+        future.cancel()
+        print(f"⚠️ Elevación origen/destino fuera de plazo, usando 0 m: {e!r}")
+        return {}
+
+
+def fetch_route_context(origin, destination, estimate_only=False):
+    """
+    Lanza distancia, elevación y clima en paralelo.
+
+    Cada consulta tiene su propio timeout (medido desde el envío)
+    y su propio fallback:
+    - distancia → estimador local (haversine × circuidad)
+    - elevación → perfil a lo largo de la ruta; si falla, solo
+      origen/destino (dentro del mismo plazo); si tampoco, 0 m
+    - clima → "mild"
+
+    estimate_only=True no consulta Distance Matrix ni Directions:
+    distancia estimada y elevación solo de origen/destino.
+
+    Retorna:
+    {
+        distance_km,
+        distance_source,   # "google" | "estimate"
+        elevation_diff,
+        elevation_source,
+        climb_m,       # None si no hay perfil de ruta
+        descent_m,
+        steps,         # tramos de Directions (None sin perfil)
+        track,         # muestras del perfil (None sin perfil)
+        weather
+    }
+    """
+
+    started = time.monotonic()
+
+    if estimate_only:
+        distance_future = None
+        profile_future = _executor.submit(_endpoint_profile, origin, destination)
+    else:
+        distance_future = _executor.submit(get_distance_km, origin, destination)
+        profile_future = _executor.submit(get_route_profile, origin, destination)
+    weather_future = _executor.submit(get_weather_from_coords, origin)
+
+    # 🌦️ Clima
+    try:
+        weather = _wait(weather_future, started + WEATHER_LOOKUP_TIMEOUT)
+    except Exception as e:
+        weather_future.cancel()
+        print(f"⚠️ Clima no disponible, usando fallback: {e!r}")
+        weather = weather_fallback("fallback_lookup_failed")
+
+    # ⛰️ Elevación a lo largo de la ruta
+    climb_m = None
+    descent_m = None
+    steps = None
+    track = None
+    try:
+        profile = _wait(profile_future, started + ELEVATION_LOOKUP_TIMEOUT)
+        elevation_diff = profile["elevation_diff"]
+        elevation_source = profile["source"]
+        climb_m = profile.get("climb_m")
+        descent_m = profile.get("descent_m")
+        steps = profile.get("steps")
+        track = profile.get("track")
+    except Exception as e:
+        profile_future.cancel()
+        print(f"⚠️ Perfil de ruta no disponible: {e!r}")
+        profile = (
+            {} if estimate_only
+            else _endpoint_profile_until(origin, destination, started + ELEVATION_LOOKUP_TIMEOUT)
+        )
+        elevation_diff = profile.get("elevation_diff", 0)
+        elevation_source = profile.get("source", "fallback_lookup_failed")
+
+    # 📏 Distancia
+    if distance_future is None:
+        distance_km = estimate_distance_km(origin, destination)
+        distance_source = "estimate"
+    else:
+        try:
+            distance_km = _wait(distance_future, started + DISTANCE_LOOKUP_TIMEOUT)
+            distance_source = "google"
+        except Exception as e:
+            distance_future.cancel()
+            print(f"⚠️ Distancia no disponible, usando estimación local: {e!r}")
+            distance_km = estimate_distance_km(origin, destination)
+            distance_source = "estimate"
+
+    return {
+        "distance_km": distance_km,
+        "distance_source": distance_source,
+        "elevation_diff": elevation_diff,
+        "elevation_source": elevation_source,
+        "climb_m": climb_m,
+        "descent_m": descent_m,
+        "steps": steps,
+        "track": track,
+        "weather": weather,
+    }
@@ -0,0 +1,156 @@
+import numpy as np
+from backend.config import (
+    ROUTE_PROFILE_SAMPLES,
+    ROUTE_PROFILE_CACHE_TTL,
+    ROUTE_PROFILE_CACHE_MAXSIZE,
+)
+from backend.services.directions_service import get_directions_route
+from backend.services.distance_service import route_cache_key
+from backend.services.elevation_service import get_elevations
+from backend.utils.geo import haversine_km
+from backend.utils.polyline import decode_polyline
+from backend.utils.ttl_cache import TTLCache
+
+_profile_cache = TTLCache(
+    maxsize=ROUTE_PROFILE_CACHE_MAXSIZE,
+    ttl=ROUTE_PROFILE_CACHE_TTL,
+    name="route_profile",
+)
+
+
+def get_route_profile_cache_stats():
+    return _profile_cache.stats()
+
+
+def resample_path(coords, samples):
+    """
+    Reparte `samples` puntos equidistantes a lo largo de la polilínea.
+
+    Retorna (lats, lngs, distancia acumulada km de cada muestra).
+    """
+    coords = np.asarray(coords, dtype=np.float64)
+    lats, lngs = coords[:, 0], coords[:, 1]
+
+    seg_km = haversine_km(lats[:-1], lngs[:-1], lats[1:], lngs[1:])
+    cumulative = np.concatenate(([0.0], np.cumsum(seg_km)))
+
+    if cumulative[-1] == 0:
+        return lats, lngs, cumulative
+
+    targets = np.linspace(0.0, cumulative[-1], samples)
+    return (
+        np.interp(targets, cumulative, lats),
+        np.interp(targets, cumulative, lngs),
+        targets,
+    )
+
+
+def build_profile(elevations, cumulative_km):
+    """
+    Pendientes por segmento y totales de subida / bajada.
+    """
+    elevations = np.asarray(elevations, dtype=np.float64)
+    seg_m = np.diff(cumulative_km) * 1000
+    delta_m = np.diff(elevations)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        grades = np.where(seg_m > 0, delta_m / seg_m * 100, 0.0)
+
+    return {
+        "climb_m": float(delta_m[delta_m > 0].sum()),
+        "descent_m": float(np.abs(delta_m[delta_m < 0]).sum()),
+        "elevation_diff": float(elevations[-1] - elevations[0]) if len(elevations) else 0.0,
+        "max_grade": float(grades.max()) if len(grades) else 0.0,
+        "min_grade": float(grades.min()) if len(grades) else 0.0,
+    }
+
+
+def route_sample_points(route, origin, destination):
+    """
+    Puntos equidistantes sobre la polilínea de la ruta.
+
+    Muestreo fijo → 1 llamada de elevación sin importar el largo de la ruta.
+    Retorna (points, cumulative_km).
+    """
+    coords = decode_polyline(route["overview_polyline"]["points"])
+
+    if len(coords) < 2:
+        coords = [
+            (float(origin["lat"]), float(origin["lng"])),
+            (float(destination["lat"]), float(destination["lng"])),
+        ]
+
+    lats, lngs, cumulative_km = resample_path(coords, ROUTE_PROFILE_SAMPLES)
+    points = [{"lat": lat, "lng": lng} for lat, lng in zip(lats.tolist(), lngs.tolist())]
+
+    return points, cumulative_km
+
+
+def route_steps(route):
+    """
+    Tramos (steps) de Google Directions como columnas:
+    distance_km y duration_s. None si la ruta no trae steps.
+    """
+    steps = [step for leg in route.get("legs", []) for step in leg.get("steps", [])]
+    if not steps:
+        return None
+
+    return {
+        "distance_km": np.array([s["distance"]["value"] for s in steps], dtype=np.float64) / 1000,
+        "duration_s": np.array([s["duration"]["value"] for s in steps], dtype=np.float64),
+    }
+
+
+def finish_profile(elevations, source, cumulative_km, steps=None):
+    """
+    Resumen del perfil + muestras (track) y tramos (steps) para
+    la simulación por segmentos.
+    """
+    profile = build_profile(elevations, cumulative_km)
+    profile["samples"] = len(elevations)
+    profile["source"] = source
+    profile["track"] = {
+        "cumulative_km": np.asarray(cumulative_km, dtype=np.float64),
+        "elevations": np.asarray(elevations, dtype=np.float64),
+    }
+    profile["steps"] = steps
+    return profile
+
+
+def get_cached_route_profile(origin, destination):
+    return _profile_cache.get(route_cache_key(origin, destination))
+
+
+def store_route_profile(origin, destination, profile):
+    _profile_cache.set(route_cache_key(origin, destination), profile)
+
+
+def _load_route_profile(origin, destination):
+    route = get_directions_route(origin, destination)
+    points, cumulative_km = route_sample_points(route, origin, destination)
+    elevations, source = get_elevations(points)
+
+    return finish_profile(elevations, source, cumulative_km, route_steps(route))
+
+
+def get_route_profile(origin, destination):
+    """
+    Perfil de elevación a lo largo de la ruta de Google Directions.
+
+    Retorna:
+    {
+        climb_m,
+        descent_m,
+        elevation_diff,
+        max_grade,
+        min_grade,
+        samples,
+        source,
+        track,   # { cumulative_km, elevations } (np.ndarray)
+        steps    # { distance_km, duration_s } o None
+    }
+    """
+    return _profile_cache.get_or_load(
+        route_cache_key(origin, destination),
+        lambda: _load_route_profile(origin, destination),
+    )
@@ -0,0 +1,139 @@
+import numpy as np
+from backend.config import HIGHWAY_SPEED_KMH
+from backend.services.consumption_service import resolve_consumption_type
+
+
+def classify_segments(distance_km, duration_s):
+    """
+    Velocidad media implícita (km/h) y tipo de cada tramo.
+    Tramos sin duración se consideran "mixed".
+    """
+    distance_km = np.asarray(distance_km, dtype=np.float64)
+    duration_s = np.asarray(duration_s, dtype=np.float64)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        speed_kmh = np.where(duration_s > 0, distance_km / (duration_s / 3600), 0.0)
+
+    return speed_kmh, speed_kmh >= HIGHWAY_SPEED_KMH
+
+
+def segment_climbs(track, distance_km):
+    """
+    Subida y bajada acumuladas (m) dentro de cada tramo.
+
+    Los límites de los tramos se proyectan sobre el track muestreado
+    (proporcional a la distancia) y se interpolan las curvas de
+    subida / bajada acumuladas, sin recorrer tramo por tramo.
+    """
+    cumulative_km = track["cumulative_km"]
+    delta_m = np.diff(track["elevations"])
+
+    climb_curve = np.concatenate(([0.0], np.cumsum(np.where(delta_m > 0, delta_m, 0.0))))
+    descent_curve = np.concatenate(([0.0], np.cumsum(np.where(delta_m < 0, -delta_m, 0.0))))
+
+    boundaries = np.concatenate(([0.0], np.cumsum(distance_km)))
+    if boundaries[-1] > 0:
+        boundaries = boundaries / boundaries[-1] * cumulative_km[-1]
+
+    climb_m = np.diff(np.interp(boundaries, cumulative_km, climb_curve))
+    descent_m = np.diff(np.interp(boundaries, cumulative_km, descent_curve))
+
+    return climb_m, descent_m
+
+
+def simulate_segments(
+    *,
+    table,
+    row: int,
+    steps,
+    track,
+    extra_weight: float,
+    climate: str,
+    trip_distance_km: float,
+    breakdown: bool = False,
+):
+    """
+    Consumo integrado tramo a tramo a lo largo de la ruta.
+
+    Cada tramo usa el consumo base de su tipo (highway / mixed según
+    velocidad) y su propia subida / bajada; el resto de los ajustes
+    (peso, clima, motor, trayecto corto) son los del viaje completo.
+    Los coeficientes del vehículo salen de la tabla precalculada
+    (ver vehicle_coefficients).
+
+    Retorna:
+    {
+        adjusted_fc,        # L/100km efectivo del viaje
+        base_consumption,   # L/100km base ponderado por distancia
+        consumption_type,   # tipo dominante (regla del 70%)
+        highway_km,
+        segments            # solo con breakdown=True
+    }
+    """
+    distance_km = steps["distance_km"]
+    duration_s = steps["duration_s"]
+    n = len(distance_km)
+    total_km = float(distance_km.sum())
+
+    speed_kmh, is_highway = classify_segments(distance_km, duration_s)
+    climb_m, descent_m = segment_climbs(track, distance_km)
+
+    mixed_fc = float(table.base_fc([row], "mixed")[0])
+    highway_fc = float(table.base_fc([row], "highway")[0])
+    base_fc = np.where(is_highway, highway_fc, mixed_fc)
+
+    segment_fc = table.adjusted_fc(
+        np.full(n, row),
+        base_fc=base_fc,
+        extra_weight=extra_weight,
+        road_grade=0.0,
+        climate=climate,
+        distance_km=distance_km,
+        climb_m=climb_m,
+        descent_m=descent_m,
+        trip_distance_km=trip_distance_km,
+        ndigits=None,
+    )
+
+    if total_km > 0:
+        adjusted_fc = float((segment_fc * distance_km).sum() / total_km)
+        base_consumption = float((base_fc * distance_km).sum() / total_km)
+    else:
+        adjusted_fc = float(segment_fc.mean()) if n else 0.0
+        base_consumption = mixed_fc
+
+    highway_km = float(distance_km[is_highway].sum())
+
+    result = {
+        "adjusted_fc": round(adjusted_fc, 3),
+        "base_consumption": round(base_consumption, 3),
+        "consumption_type": resolve_consumption_type(total_km, highway_km),
+        "highway_km": highway_km,
+    }
+
+    if breakdown:
+        fuel_l = segment_fc * distance_km / 100
+        result["segments"] = [
+            {
+                "distance_km": round(d, 3),
+                "duration_s": int(t),
+                "speed_kmh": round(v, 1),
+                "type": "highway" if h else "mixed",
+                "climb_m": round(c, 1),
+                "descent_m": round(dm, 1),
+                "fuel_l_per_100km": round(fc, 3),
+                "fuel_l": round(f, 4),
+            }
+            for d, t, v, h, c, dm, fc, f in zip(
+                distance_km.tolist(),
+                duration_s.tolist(),
+                speed_kmh.tolist(),
+                is_highway.tolist(),
+                climb_m.tolist(),
+                descent_m.tolist(),
+                segment_fc.tolist(),
+                fuel_l.tolist(),
+            )
+        ]
+
+    return result
@@ -0,0 +1,228 @@
+import csv
+import io
+from datetime import datetime, timedelta
+from sqlalchemy import func, select
+from backend.config import TRIP_EXPORT_BATCH_ROWS
+from backend.models import db, Trip
+
+try:  # opcional: solo para parquet / arrow
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+EXPORT_FORMATS = {
+    "csv": ("text/csv", "csv"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+    "arrow": ("application/vnd.apache.arrow.stream", "arrows"),
+}
+
+EXPORT_COLUMNS = [
+    "id", "user_id", "vehicle_id",
+    "brand", "model", "year", "fuel_type", "fuel_price",
+    "total_weight", "passengers", "location", "distance",
+    "consumption_type", "base_consumption",
+    "fuel_consumed", "total_cost", "road_grade", "weather",
+    "created_at",
+]
+
+
+class TripExportError(Exception):
+    """Parámetros de exportación inválidos (→ 400)"""
+    pass
+
+
+class ExportUnavailableError(Exception):
+    """Formato que requiere una dependencia no instalada (→ 501)"""
+    pass
+
+
+def _parse_date(value, name):
+    try:
+        return datetime.strptime(value, "%Y-%m-%d")
+    except ValueError:
+        raise TripExportError(f"'{name}' debe tener formato YYYY-MM-DD")
+
+
+def parse_export_args(args):
+    """
+    Valida los query params de GET /trips/export.
+
+    - format: csv (default), parquet o arrow (IPC stream)
+    - user_id: otro usuario (solo admin) o "all" para todos
+    - from / to: fechas YYYY-MM-DD (ambas inclusive)
+    - vehicle_id, brand, model, year: filtros de vehículo
+    """
+    fmt = (args.get("format") or "csv").lower()
+    if fmt not in EXPORT_FORMATS:
+        raise TripExportError("format debe ser 'csv', 'parquet' o 'arrow'")
+    if fmt != "csv" and pa is None:
+        raise ExportUnavailableError(f"Exportar en {fmt} requiere pyarrow instalado")
+
+    user_id = args.get("user_id")
+    filters = {"user_id": None, "all_users": user_id == "all"}
+
+    try:
+        if user_id and user_id != "all":
+            filters["user_id"] = int(user_id)
+        filters["vehicle_id"] = int(args["vehicle_id"]) if args.get("vehicle_id") else None
+        filters["year"] = int(args["year"]) if args.get("year") else None
+    except ValueError:
+        raise TripExportError("user_id, vehicle_id y year deben ser enteros")
+
+    filters["brand"] = args.get("brand") or None
+    filters["model"] = args.get("model") or None
+    filters["from"] = _parse_date(args["from"], "from") if args.get("from") else None
+    filters["to"] = _parse_date(args["to"], "to") if args.get("to") else None
+
+    if filters["from"] and filters["to"] and filters["from"] > filters["to"]:
+        raise TripExportError("'from' no puede ser posterior a 'to'")
+
+    return fmt, filters
+
+
+def export_statement(filters):
+    """
+    SELECT de solo columnas (sin objetos ORM) ordenado por id. Sin
+    user_id ni all_users no se llama: la ruta completa el usuario.
+    """
+    stmt = select(*[getattr(Trip, name) for name in EXPORT_COLUMNS])
+
+    if not filters["all_users"]:
+        stmt = stmt.where(Trip.user_id == filters["user_id"])
+    if filters["vehicle_id"] is not None:
+        stmt = stmt.where(Trip.vehicle_id == filters["vehicle_id"])
+    if filters["brand"]:
+        stmt = stmt.where(func.lower(Trip.brand) == filters["brand"].strip().lower())
+    if filters["model"]:
+        stmt = stmt.where(func.lower(Trip.model) == filters["model"].strip().lower())
+    if filters["year"] is not None:
+        stmt = stmt.where(Trip.year == filters["year"])
+    if filters["from"]:
+        stmt = stmt.where(Trip.created_at >= filters["from"])
+    if filters["to"]:
+        stmt = stmt.where(Trip.created_at < filters["to"] + timedelta(days=1))
+
+    return stmt.order_by(Trip.id)
+
+
+def _row_batches(stmt, batch_rows):
+    """
+    Filas en bloques de `batch_rows` desde un cursor del lado del
+    servidor (stream_results): la memoria no depende del total.
+    """
+    result = db.session.execute(
+        stmt.execution_options(stream_results=True, yield_per=batch_rows)
+    )
+    try:
+        for rows in result.partitions(batch_rows):
+            yield rows
+    finally:
+        result.close()
+
+
+# ===============================
+# CSV
+# ===============================
+def _csv_chunks(stmt, batch_rows):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    writer.writerow(EXPORT_COLUMNS)
+    for rows in _row_batches(stmt, batch_rows):
+        writer.writerows(rows)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+# ===============================
+# PARQUET / ARROW (pyarrow)
+# ===============================
+class _ChunkSink(io.RawIOBase):
+    """Destino de escritura que acumula bytes hasta que se vacía."""
+
+    def __init__(self):
+        self._chunks = []
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _arrow_schema():
+    return pa.schema([
+        ("id", pa.int64()),
+        ("user_id", pa.int64()),
+        ("vehicle_id", pa.int64()),
+        ("brand", pa.string()),
+        ("model", pa.string()),
+        ("year", pa.int32()),
+        ("fuel_type", pa.string()),
+        ("fuel_price", pa.float64()),
+        ("total_weight", pa.float64()),
+        ("passengers", pa.int32()),
+        ("location", pa.string()),
+        ("distance", pa.float64()),
+        ("consumption_type", pa.string()),
+        ("base_consumption", pa.float64()),
+        ("fuel_consumed", pa.float64()),
+        ("total_cost", pa.float64()),
+        ("road_grade", pa.float64()),
+        ("weather", pa.string()),
+        ("created_at", pa.timestamp("us")),
+    ])
+
+
+def _columnar_chunks(stmt, batch_rows, fmt):
+    """
+    Un row group (parquet) o record batch (arrow) por bloque de filas;
+    cada uno se envía apenas se escribe.
+    """
+    schema = _arrow_schema()
+    sink = _ChunkSink()
+
+    if fmt == "parquet":
+        writer = pq.ParquetWriter(sink, schema)
+        write = writer.write_table
+        to_block = pa.Table.from_arrays
+    else:
+        writer = pa.ipc.new_stream(sink, schema)
+        write = writer.write_batch
+        to_block = pa.RecordBatch.from_arrays
+
+    try:
+        for rows in _row_batches(stmt, batch_rows):
+            columns = list(zip(*rows))
+            arrays = [pa.array(values, type=field.type) for values, field in zip(columns, schema)]
+            write(to_block(arrays, schema=schema))
+            yield sink.drain()
+    finally:
+        writer.close()
+
+    yield sink.drain()  # footer (parquet) / fin de stream (arrow)
+
+
+def export_trips(fmt, filters, batch_rows=TRIP_EXPORT_BATCH_ROWS):
+    """
+    (generador de bytes/str, mimetype, extensión) de la exportación.
+    """
+    stmt = export_statement(filters)
+    mimetype, extension = EXPORT_FORMATS[fmt]
+
+    if fmt == "csv":
+        return _csv_chunks(stmt, batch_rows), mimetype, extension
+
+    return _columnar_chunks(stmt, batch_rows, fmt), mimetype, extension
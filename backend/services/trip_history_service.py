@@ -0,0 +1,65 @@
+from backend.config import TRIPS_PAGE_SIZE, TRIPS_PAGE_MAX, TRIPS_STREAM_YIELD_PER
+from backend.models import Trip
+from backend.services.trip_service import TripInputError
+
+
+def parse_history_args(args):
+    """
+    Valida los query params de GET /trips.
+
+    - cursor: id del último viaje recibido (se sigue con ids menores)
+    - limit: viajes por página (máx. TRIPS_PAGE_MAX)
+    - format: "json" (página) o "ndjson" (streaming)
+    """
+    try:
+        cursor = int(args["cursor"]) if args.get("cursor") else None
+        limit = int(args["limit"]) if args.get("limit") else None
+    except ValueError:
+        raise TripInputError("cursor y limit deben ser enteros")
+
+    if cursor is not None and cursor <= 0:
+        raise TripInputError("cursor inválido")
+    if limit is not None and not 1 <= limit <= TRIPS_PAGE_MAX:
+        raise TripInputError(f"limit debe estar entre 1 y {TRIPS_PAGE_MAX}")
+
+    fmt = (args.get("format") or "json").lower()
+    if fmt not in ("json", "ndjson"):
+        raise TripInputError("format debe ser 'json' o 'ndjson'")
+
+    return {"cursor": cursor, "limit": limit, "format": fmt}
+
+
+def _history_query(user_id, cursor):
+    """
+    Viajes del usuario del más nuevo al más antiguo; con cursor, solo
+    los anteriores a él (keyset sobre ix_trip_user_id_id, sin OFFSET).
+    """
+    query = Trip.query.filter(Trip.user_id == user_id)
+    if cursor is not None:
+        query = query.filter(Trip.id < cursor)
+    return query.order_by(Trip.id.desc())
+
+
+def trip_page(user_id, cursor=None, limit=None):
+    """
+    Una página del historial. Retorna (viajes como dict, next_cursor);
+    next_cursor es None en la última página.
+    """
+    limit = limit or TRIPS_PAGE_SIZE
+    trips = _history_query(user_id, cursor).limit(limit + 1).all()
+
+    next_cursor = trips[limit - 1].id if len(trips) > limit else None
+    return [trip.to_dict() for trip in trips[:limit]], next_cursor
+
+
+def iter_trips(user_id, cursor=None, limit=None):
+    """
+    Historial completo (o hasta `limit` viajes) como dicts, leyendo de a
+    TRIPS_STREAM_YIELD_PER filas: la memoria no crece con el historial.
+    """
+    query = _history_query(user_id, cursor)
+    if limit is not None:
+        query = query.limit(limit)
+
+    for trip in query.yield_per(TRIPS_STREAM_YIELD_PER):
+        yield trip.to_dict()
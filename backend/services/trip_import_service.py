@@ -0,0 +1,175 @@
+import csv
+import io
+import json
+from datetime import datetime, timezone
+from sqlalchemy.exc import SQLAlchemyError
+from backend.config import TRIP_IMPORT_CHUNK_SIZE, TRIP_IMPORT_MAX_ERRORS
+from backend.models import db, Trip
+from backend.services.trip_service import TripInputError, parse_trip_record
+from backend.services.trip_summary_service import record_trip_rows
+
+IMPORT_FORMATS = {
+    ".csv": "csv",
+    ".ndjson": "ndjson",
+    ".jsonl": "ndjson",
+    "text/csv": "csv",
+    "application/x-ndjson": "ndjson",
+    "application/jsonl": "ndjson",
+}
+
+
+class TripImportError(Exception):
+    """Archivo o formato de importación inválido (→ 400)"""
+    pass
+
+
+def detect_format(explicit=None, filename=None, content_type=None):
+    """
+    "csv" o "ndjson": ?format=, si no la extensión del archivo y si no
+    el Content-Type.
+    """
+    if explicit:
+        fmt = explicit.lower()
+        if fmt not in ("csv", "ndjson"):
+            raise TripImportError("format debe ser 'csv' o 'ndjson'")
+        return fmt
+
+    if filename and "." in filename:
+        fmt = IMPORT_FORMATS.get(filename[filename.rfind("."):].lower())
+        if fmt:
+            return fmt
+
+    if content_type:
+        fmt = IMPORT_FORMATS.get(content_type.split(";")[0].strip().lower())
+        if fmt:
+            return fmt
+
+    raise TripImportError("No se pudo determinar el formato (usar ?format=csv|ndjson)")
+
+
+def _text_stream(stream):
+    """Texto UTF-8 (con o sin BOM) leído en streaming desde un stream binario."""
+    if not hasattr(stream, "read1"):
+        stream = io.BufferedReader(stream)
+    return io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+
+
+def iter_records(stream, fmt):
+    """
+    Recorre el archivo sin cargarlo entero. Produce (línea, datos, error):
+    datos es un dict, o error un mensaje si la línea no se pudo leer.
+    """
+    text = _text_stream(stream)
+
+    if fmt == "csv":
+        reader = csv.DictReader(text)
+        try:
+            for row in reader:
+                # Celdas vacías = campo ausente (igual que en JSON)
+                yield reader.line_num, {k: v for k, v in row.items() if k is not None and v not in ("", None)}, None
+        except (csv.Error, UnicodeDecodeError) as e:
+            yield reader.line_num, None, f"CSV ilegible, se detuvo la lectura: {e}"
+        return
+
+    line_no = 0
+    try:
+        for line_no, line in enumerate(text, 1):
+            if not line.strip():
+                continue
+            try:
+                data = json.loads(line)
+            except json.JSONDecodeError:
+                yield line_no, None, "JSON inválido"
+                continue
+            if not isinstance(data, dict):
+                yield line_no, None, "Se esperaba un objeto JSON por línea"
+                continue
+            yield line_no, data, None
+    except UnicodeDecodeError as e:
+        yield line_no + 1, None, f"Archivo no es UTF-8, se detuvo la lectura: {e}"
+
+
+def _import_row(user_id, data):
+    """
+    Columnas de Trip para una fila: mismas reglas que POST /trips, más
+    created_at opcional (ISO 8601) para viajes históricos. Con zona
+    horaria se pasa a UTC; sin ella se asume UTC (como utcnow()).
+    """
+    row = parse_trip_record(data)
+    row["user_id"] = int(user_id)
+
+    created_at = data.get("created_at")
+    if created_at:
+        try:
+            moment = datetime.fromisoformat(str(created_at))
+        except ValueError:
+            raise TripInputError("created_at debe ser una fecha ISO 8601")
+
+        if moment.tzinfo is not None:
+            moment = moment.astimezone(timezone.utc).replace(tzinfo=None)
+        row["created_at"] = moment
+    else:
+        row["created_at"] = datetime.utcnow()
+
+    return row
+
+
+def import_trips(user_id, records, chunk_size=TRIP_IMPORT_CHUNK_SIZE):
+    """
+    Valida e inserta viajes por bloques de `chunk_size` (bulk insert +
+    resumen en una transacción por bloque). Una fila inválida no
+    detiene la importación: queda en el reporte con su línea. Si un
+    bloque falla en la base de datos, se reintenta fila por fila.
+    """
+    report = {"imported": 0, "failed": 0, "errors": [], "errors_truncated": False}
+
+    def fail(line, message):
+        report["failed"] += 1
+        if len(report["errors"]) < TRIP_IMPORT_MAX_ERRORS:
+            report["errors"].append({"line": line, "error": message})
+        else:
+            report["errors_truncated"] = True
+
+    chunk, chunk_lines = [], []
+
+    def write(rows):
+        db.session.bulk_insert_mappings(Trip, rows)
+        record_trip_rows(rows)
+        db.session.commit()
+
+    def flush():
+        if not chunk:
+            return
+        try:
+            write(chunk)
+            report["imported"] += len(chunk)
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            print(f"❌ Error de base de datos importando viajes, se reintenta fila por fila: {e}")
+
+            # Aislar la(s) fila(s) que rompen el bloque
+            for line, row in zip(chunk_lines, chunk):
+                try:
+                    write([row])
+                    report["imported"] += 1
+                except SQLAlchemyError:
+                    db.session.rollback()
+                    fail(line, "Error de base de datos al guardar la fila")
+        chunk.clear()
+        chunk_lines.clear()
+
+    for line, data, error in records:
+        if error is None:
+            try:
+                chunk.append(_import_row(user_id, data))
+                chunk_lines.append(line)
+            except TripInputError as e:
+                error = str(e)
+
+        if error is not None:
+            fail(line, error)
+        elif len(chunk) >= chunk_size:
+            flush()
+
+    flush()
+    return report
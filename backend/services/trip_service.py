@@ -0,0 +1,309 @@
+import math
+from backend.models import db, Trip, UserVehicle
+from backend.services.consumption_service import resolve_consumption_type
+from backend.services.segment_service import simulate_segments
+from backend.services.trip_summary_service import record_trip
+from backend.services.vehicle_catalog import find_vehicle_record
+from backend.services.vehicle_coefficients import coefficients_for_vehicle
+from backend.services.uncertainty_service import (
+    UncertaintyInputError,
+    parse_uncertainty,
+    simulate_trip_uncertainty,
+    vehicle_fc_model,
+)
+from backend.utils.text_utils import parse_bool
+
+PASSENGER_WEIGHT = 75  # kg promedio por pasajero
+
+CALCULATE_AND_SAVE_REQUIRED_FIELDS = [
+    "brand",
+    "model",
+    "year",
+    "origin",
+    "destination",
+    "passengers",
+]
+
+
+SAVE_TRIP_REQUIRED_FIELDS = [
+    "brand", "model", "year", "fuel_type",
+    "total_weight", "passengers", "location",
+    "distance", "fuel_consumed", "total_cost",
+    "road_grade", "climate"
+]
+
+VALID_CLIMATES = ["cold", "hot", "windy", "snowy", "mild"]
+
+TRIP_TEXT_FIELDS = ["brand", "model", "fuel_type", "location"]
+
+
+class TripInputError(Exception):
+    """Datos de entrada inválidos (→ 400)"""
+    pass
+
+
+def parse_trip_record(data):
+    """
+    Valida un viaje ya calculado (POST /trips, importación masiva) y
+    retorna las columnas de Trip, sin user_id.
+    """
+    if not isinstance(data, dict):
+        raise TripInputError("Body JSON requerido")
+
+    for field in SAVE_TRIP_REQUIRED_FIELDS:
+        if field not in data:
+            raise TripInputError(f"Falta el campo obligatorio '{field}'")
+
+    for field in TRIP_TEXT_FIELDS:
+        value = data[field]
+        # Números se aceptan como texto (modelo "208"); objetos / listas no
+        if isinstance(value, bool) or not isinstance(value, (str, int, float)):
+            raise TripInputError(f"'{field}' debe ser texto")
+
+        max_length = Trip.__table__.c[field].type.length
+        if not str(value).strip() or len(str(value).strip()) > max_length:
+            raise TripInputError(f"'{field}' debe tener entre 1 y {max_length} caracteres")
+
+    climate = str(data["climate"]).lower()
+    if climate not in VALID_CLIMATES:
+        raise TripInputError("Condición climática inválida")
+
+    is_electric = "electric" in str(data["fuel_type"]).lower()
+    if not is_electric and "fuel_price" not in data:
+        raise TripInputError("Falta el campo 'fuel_price' para vehículos no eléctricos")
+
+    try:
+        record = {
+            "brand": str(data["brand"]).strip().capitalize(),
+            "model": str(data["model"]).strip().capitalize(),
+            "year": int(data["year"]),
+            "fuel_type": str(data["fuel_type"]).strip(),
+            "fuel_price": float(data.get("fuel_price") or 0),
+            "total_weight": float(data["total_weight"]),
+            "passengers": int(data["passengers"]),
+            "location": str(data["location"]).strip(),
+            "distance": float(data["distance"]),
+            "fuel_consumed": float(data["fuel_consumed"]),
+            "total_cost": float(data["total_cost"]),
+            "road_grade": float(data["road_grade"]),
+            "weather": climate,
+        }
+    except (TypeError, ValueError, OverflowError):
+        raise TripInputError("Valores numéricos inválidos")
+
+    # float() acepta "nan" / "inf": no sirven como dato y romperían los totales
+    for field, value in record.items():
+        if isinstance(value, float) and not math.isfinite(value):
+            raise TripInputError(f"'{field}' debe ser un número finito")
+
+    return record
+
+
+def parse_calculate_and_save_input(data):
+    """
+    Valida y normaliza el body de /trips/calculate-and-save.
+    """
+    if not data:
+        raise TripInputError("Body JSON requerido")
+
+    for field in CALCULATE_AND_SAVE_REQUIRED_FIELDS:
+        if field not in data:
+            raise TripInputError(f"Falta el campo '{field}'")
+
+    try:
+        uncertainty = parse_uncertainty(data.get("uncertainty"))
+    except UncertaintyInputError as e:
+        raise TripInputError(str(e))
+
+    flags = {}
+    for field in ("estimate_only", "breakdown"):
+        try:
+            flags[field] = parse_bool(data.get(field, False))
+        except ValueError:
+            raise TripInputError(f"'{field}' debe ser booleano")
+
+    return {
+        "brand": data["brand"].strip().lower(),
+        "model": data["model"].strip().lower(),
+        "year": int(data["year"]),
+        "origin": data["origin"],
+        "destination": data["destination"],
+        "passengers": int(data["passengers"]),
+        "extra_weight": float(data.get("extra_weight", 0)),
+        "fuel_price": float(data.get("fuel_price", 0)),
+        "highway_km": data.get("highway_km"),  # opcional
+        "estimate_only": flags["estimate_only"],
+        "breakdown": flags["breakdown"],  # detalle por tramo
+        "uncertainty": uncertainty,  # None o opciones de Monte Carlo
+    }
+
+
+def find_vehicle(brand, model, year):
+    """
+    Vehículo por marca / modelo / año, sin importar mayúsculas ni
+    tildes. Se busca en el snapshot en memoria del catálogo
+    (VehicleRecord, sin consulta a la base de datos).
+    """
+    return find_vehicle_record(brand, model, year)
+
+
+def save_calculated_trip(user_id, trip_input, vehicle, route_context):
+    """
+    Calcula consumo y costo con el contexto de ruta ya resuelto,
+    guarda el viaje y retorna el payload de respuesta.
+    """
+    origin = trip_input["origin"]
+    passengers = trip_input["passengers"]
+    extra_weight = trip_input["extra_weight"]
+    fuel_price = trip_input["fuel_price"]
+
+    fuel_type = vehicle.fuel_type or "gasoline"
+    is_electric = "electric" in fuel_type.lower()
+
+    base_weight = vehicle.weight_kg or 1500
+    total_weight = base_weight + extra_weight + (passengers * PASSENGER_WEIGHT)
+
+    distance_km = route_context["distance_km"]
+    elevation_diff = route_context["elevation_diff"]
+    road_grade = (
+        round((elevation_diff / (distance_km * 1000)) * 100, 2)
+        if distance_km
+        else 0
+    )
+
+    weather_data = route_context["weather"]
+    climate_label = weather_data["climate"]
+    weather_raw = weather_data["raw"]
+
+    consumption_type = "mixed"
+    base_consumption = None
+    segments = None
+    uncertainty = None
+
+    if is_electric:
+        adjusted_fc = 0
+        fuel_used = 0
+        total_cost = 0
+    else:
+        table, row = coefficients_for_vehicle(vehicle.id)
+
+        if route_context.get("steps") is not None and route_context.get("track") is not None:
+            # 🚦 Simulación por tramos: highway / mixed según velocidad de cada tramo
+            simulation = simulate_segments(
+                table=table,
+                row=row,
+                steps=route_context["steps"],
+                track=route_context["track"],
+                extra_weight=total_weight - base_weight,
+                climate=climate_label,
+                trip_distance_km=distance_km,
+                breakdown=trip_input["breakdown"],
+            )
+
+            consumption_type = simulation["consumption_type"]
+            base_consumption = simulation["base_consumption"]
+            adjusted_fc = simulation["adjusted_fc"]
+            segments = simulation.get("segments")
+        else:
+            # 🚦 Sin tramos (estimación / fallback): regla del 70% sobre highway_km
+            consumption_type = resolve_consumption_type(distance_km, trip_input["highway_km"])
+            base_consumption = float(table.base_fc([row], consumption_type)[0])
+
+            adjusted_fc = float(table.adjusted_fc(
+                [row],
+                base_fc=base_consumption,
+                extra_weight=total_weight - base_weight,
+                road_grade=road_grade,
+                climate=climate_label,
+                distance_km=distance_km,
+                climb_m=route_context["climb_m"],
+                descent_m=route_context["descent_m"],
+            )[0])
+
+        fuel_used = (distance_km * adjusted_fc) / 100
+        total_cost = fuel_used * fuel_price
+
+        # 🎲 Modo incertidumbre: viaje completo con el consumo base efectivo
+        if trip_input["uncertainty"]:
+            uncertainty = simulate_trip_uncertainty(
+                trip_input["uncertainty"],
+                vehicle_fc_model(table, row, base_consumption, distance_km),
+                distance_km=distance_km,
+                climate=climate_label,
+                fuel_price=fuel_price,
+                extra_weight=total_weight - base_weight,
+                road_grade=road_grade,
+                climb_m=route_context["climb_m"],
+                descent_m=route_context["descent_m"],
+            )
+
+    trip = Trip(
+        user_id=user_id,
+        vehicle_id=vehicle.id,
+        brand=vehicle.make,
+        model=vehicle.model,
+        year=vehicle.year,
+        fuel_type=fuel_type,
+        fuel_price=fuel_price,
+        total_weight=total_weight,
+        passengers=passengers,
+        location=f"{origin['lat']},{origin['lng']}",
+        distance=distance_km,
+
+        consumption_type=consumption_type,
+        base_consumption=base_consumption,
+
+        fuel_consumed=fuel_used,
+        total_cost=total_cost,
+        road_grade=road_grade,
+        weather=climate_label,
+    )
+
+    db.session.add(trip)
+    record_trip(trip)
+
+    if not UserVehicle.query.filter_by(
+        user_id=user_id, vehicle_id=vehicle.id
+    ).first():
+        db.session.add(UserVehicle(user_id=user_id, vehicle_id=vehicle.id))
+
+    db.session.commit()
+
+    response = {
+        "distance": round(distance_km, 2),
+        "distanceSource": route_context["distance_source"],
+        "fuelUsed": round(fuel_used, 2),
+        "totalCost": round(total_cost, 2),
+        "consumptionType": consumption_type,
+        "baseFC": base_consumption,
+        "adjustedFC": round(adjusted_fc, 3),
+        "roadGrade": f"{road_grade}%",
+        "climbM": route_context["climb_m"],
+        "descentM": route_context["descent_m"],
+        "elevationSource": route_context["elevation_source"],
+        "weather": climate_label,
+        "pricePerLitre": fuel_price,
+        "weatherRaw": weather_raw,
+        "vehicle": {
+            "make": vehicle.make,
+            "model": vehicle.model,
+            "year": vehicle.year,
+            "fuel_type": vehicle.fuel_type,
+            "engine_cc": vehicle.engine_cc,
+            "cylinders": vehicle.engine_cylinders,
+            "weight_kg": vehicle.weight_kg,
+            "lkm_mixed": vehicle.lkm_mixed,
+            "lkm_highway": vehicle.lkm_highway,
+        },
+        "consumption": {
+            "type": consumption_type,
+            "base_l_per_100km": base_consumption
+        },
+    }
+
+    if segments is not None:
+        response["segments"] = segments
+    if uncertainty is not None:
+        response["uncertainty"] = uncertainty
+
+    return response
@@ -0,0 +1,195 @@
+from datetime import date, datetime
+from sqlalchemy import func, update
+from sqlalchemy.dialects import postgresql, sqlite
+from backend.models import db, TripSummary
+from backend.utils.text_utils import normalize
+
+_TOTALS = ("trips", "distance_km", "fuel_litres", "total_cost")
+
+# Viajes antiguos sin created_at: se agrupan en este mes (igual que el
+# backfill de la migración), sin reescribir la fecha del viaje
+UNDATED_MONTH = date(1970, 1, 1)
+
+_UPSERT_DIALECTS = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
+
+
+class SummaryInputError(Exception):
+    """Rango de meses inválido (→ 400)"""
+    pass
+
+
+def month_of(moment) -> date:
+    """Primer día del mes de una fecha."""
+    return date(moment.year, moment.month, 1)
+
+
+def _summary_key(user_id, created_at, brand, model, year):
+    """
+    Clave de trip_summary. Marca y modelo van normalizados: los viajes
+    guardan "Kia" / "KIA" / "kia" según de dónde vengan (cálculo,
+    POST /trips, importación) y deben caer en el mismo grupo.
+    """
+    return {
+        "user_id": int(user_id),
+        "month": month_of(created_at),
+        "brand": normalize(brand),
+        "model": normalize(model),
+        "year": year,
+    }
+
+
+def _trip_key(trip):
+    created_at = trip.created_at or UNDATED_MONTH
+    return _summary_key(trip.user_id, created_at, trip.brand, trip.model, trip.year)
+
+
+def _trip_deltas(trip, sign):
+    return {
+        "trips": sign,
+        "distance_km": sign * (trip.distance or 0),
+        "fuel_litres": sign * (trip.fuel_consumed or 0),
+        "total_cost": sign * (trip.total_cost or 0),
+    }
+
+
+def _apply(key, deltas):
+    """
+    Suma `deltas` (negativos al borrar) a la fila de resumen de `key`,
+    en la sesión actual: queda en la misma transacción que los viajes.
+    Los incrementos se hacen en la base de datos (trips = trips + 1),
+    así dos requests concurrentes no se pisan.
+    """
+    adding = deltas["trips"] > 0
+    insert = _UPSERT_DIALECTS.get(db.session.get_bind().dialect.name)
+
+    if insert is not None and adding:
+        stmt = insert(TripSummary).values(**key, **deltas)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=list(key),
+            set_={name: getattr(TripSummary, name) + stmt.excluded[name] for name in _TOTALS},
+        )
+        db.session.execute(stmt)
+        return
+
+    matches = [getattr(TripSummary, name) == value for name, value in key.items()]
+    updated = db.session.execute(
+        update(TripSummary)
+        .where(*matches)
+        .values({name: getattr(TripSummary, name) + delta for name, delta in deltas.items()})
+        .execution_options(synchronize_session=False)
+    )
+
+    if updated.rowcount == 0 and adding:
+        db.session.add(TripSummary(**key, **deltas))
+
+    if not adding:
+        # El último viaje del grupo se llevó la fila
+        TripSummary.query.filter(*matches, TripSummary.trips <= 0).delete(synchronize_session=False)
+
+
+def record_trip(trip):
+    """Suma un viaje nuevo al resumen (llamar antes del commit)."""
+    if trip.created_at is None:
+        trip.created_at = datetime.utcnow()  # mismo mes en viaje y resumen
+    _apply(_trip_key(trip), _trip_deltas(trip, 1))
+
+
+def forget_trip(trip):
+    """Resta un viaje borrado del resumen (llamar antes del commit)."""
+    _apply(_trip_key(trip), _trip_deltas(trip, -1))
+
+
+def record_trip_rows(rows):
+    """
+    Suma al resumen viajes insertados como mappings (bulk insert), con
+    una sola actualización por grupo. Cada row necesita created_at.
+    """
+    groups = {}
+    for row in rows:
+        key = _summary_key(row["user_id"], row["created_at"], row["brand"], row["model"], row["year"])
+        totals = groups.setdefault(tuple(key.values()), (key, dict.fromkeys(_TOTALS, 0)))[1]
+        totals["trips"] += 1
+        totals["distance_km"] += row["distance"] or 0
+        totals["fuel_litres"] += row["fuel_consumed"] or 0
+        totals["total_cost"] += row["total_cost"] or 0
+
+    for key, deltas in groups.values():
+        _apply(key, deltas)
+
+
+def parse_summary_args(args):
+    """
+    Rango opcional de GET /trips/summary: ?from=YYYY-MM&to=YYYY-MM.
+    """
+    months = {}
+    for name in ("from", "to"):
+        value = args.get(name)
+        if not value:
+            months[name] = None
+            continue
+        try:
+            months[name] = month_of(datetime.strptime(value, "%Y-%m"))
+        except ValueError:
+            raise SummaryInputError(f"'{name}' debe tener formato YYYY-MM")
+
+    if months["from"] and months["to"] and months["from"] > months["to"]:
+        raise SummaryInputError("'from' no puede ser posterior a 'to'")
+
+    return months
+
+
+def _totals(row):
+    return {
+        "trips": int(row.trips or 0),
+        "distance_km": round(row.distance_km or 0, 2),
+        "fuel_litres": round(row.fuel_litres or 0, 2),
+        "total_cost": round(row.total_cost or 0, 2),
+    }
+
+
+def _month_label(month):
+    return None if month == UNDATED_MONTH else month.strftime("%Y-%m")
+
+
+def get_trip_summary(user_id, from_month=None, to_month=None):
+    """
+    Totales del usuario por mes y por vehículo, leídos solo desde
+    trip_summary: el costo depende de meses × vehículos, no del
+    largo del historial.
+    """
+    query = TripSummary.query.filter(TripSummary.user_id == user_id)
+    if from_month:
+        query = query.filter(TripSummary.month >= from_month)
+    if to_month:
+        query = query.filter(TripSummary.month <= to_month)
+
+    sums = [func.sum(getattr(TripSummary, name)).label(name) for name in _TOTALS]
+
+    monthly = (
+        query.with_entities(TripSummary.month, *sums)
+        .group_by(TripSummary.month)
+        .order_by(TripSummary.month)
+        .all()
+    )
+    vehicles = (
+        query.with_entities(TripSummary.brand, TripSummary.model, TripSummary.year, *sums)
+        .group_by(TripSummary.brand, TripSummary.model, TripSummary.year)
+        .order_by(func.sum(TripSummary.trips).desc())
+        .all()
+    )
+    totals = query.with_entities(*sums).one()
+
+    return {
+        "totals": _totals(totals),
+        "monthly": [
+            {"month": _month_label(row.month), **_totals(row)}
+            for row in monthly
+        ],
+        "vehicles": [
+            {"brand": row.brand, "model": row.model, "year": row.year, **_totals(row)}
+            for row in vehicles
+        ],
+    }
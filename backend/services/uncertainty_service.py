@@ -0,0 +1,282 @@
+import time
+import numpy as np
+from backend.config import (
+    UNCERTAINTY_SAMPLES,
+    UNCERTAINTY_MAX_SAMPLES,
+    UNCERTAINTY_TIME_BUDGET,
+    UNCERTAINTY_CHUNK_COST,
+    UNCERTAINTY_FUEL_PRICE_SD,
+    UNCERTAINTY_PAYLOAD_SD,
+    UNCERTAINTY_GRADE_SD,
+    UNCERTAINTY_CLIMATE_KEEP,
+)
+from backend.utils.text_utils import parse_bool
+from backend.utils.trip_calculation import CLIMATE_MODIFIERS
+
+CHUNK_SAMPLES = 8192
+PERCENTILES = (10, 50, 90)
+DISTRIBUTIONS = ("normal", "uniform", "triangular", "fixed")
+
+
+class UncertaintyInputError(Exception):
+    """Configuración de incertidumbre inválida (→ 400)"""
+    pass
+
+
+def _numeric_spec(spec, default_sd):
+    """
+    { dist: "normal", sd } | { dist: "uniform", low, high } |
+    { dist: "triangular", low, mode, high } | { dist: "fixed" }
+    Sin spec: normal centrada en el valor con la desviación default
+    (sd None = relativa al valor, ver _draw).
+    """
+    if spec is None:
+        return {"dist": "normal", "sd": default_sd}
+
+    if not isinstance(spec, dict) or spec.get("dist", "normal") not in DISTRIBUTIONS:
+        raise UncertaintyInputError(f"Distribución inválida; opciones: {', '.join(DISTRIBUTIONS)}")
+
+    try:
+        dist = spec.get("dist", "normal")
+        if dist == "normal":
+            sd = spec.get("sd", default_sd)
+            parsed = {"dist": dist, "sd": None if sd is None else float(sd)}
+            valid = parsed["sd"] is None or parsed["sd"] >= 0
+        elif dist == "uniform":
+            parsed = {"dist": dist, "low": float(spec["low"]), "high": float(spec["high"])}
+            valid = parsed["low"] <= parsed["high"]
+        elif dist == "triangular":
+            parsed = {
+                "dist": dist,
+                "low": float(spec["low"]),
+                "mode": float(spec["mode"]),
+                "high": float(spec["high"]),
+            }
+            valid = parsed["low"] <= parsed["mode"] <= parsed["high"] and parsed["low"] < parsed["high"]
+        else:
+            parsed = {"dist": dist}
+            valid = True
+    except (KeyError, TypeError, ValueError, OverflowError):
+        raise UncertaintyInputError(f"Parámetros inválidos para la distribución '{spec.get('dist')}'")
+
+    # float() acepta "nan" / "inf" y pasan las comparaciones de arriba
+    numbers = [v for k, v in parsed.items() if k != "dist" and v is not None]
+    if not valid or not np.isfinite(numbers).all():
+        raise UncertaintyInputError(f"Parámetros inválidos para la distribución '{dist}'")
+
+    return parsed
+
+
+def _default_climate_p(climate):
+    """
+    Se mantiene la etiqueta observada con UNCERTAINTY_CLIMATE_KEEP
+    y el resto se reparte entre las demás.
+    """
+    labels = list(CLIMATE_MODIFIERS)
+
+    if climate not in CLIMATE_MODIFIERS:
+        return [climate], np.array([1.0])
+
+    others = (1 - UNCERTAINTY_CLIMATE_KEEP) / (len(labels) - 1)
+    return labels, np.array([UNCERTAINTY_CLIMATE_KEEP if l == climate else others for l in labels])
+
+
+def _climate_spec(spec):
+    """
+    Probabilidad por etiqueta de clima; None = alrededor del clima
+    observado (se resuelve al simular).
+    """
+    if spec is None:
+        return None, None
+
+    try:
+        labels = [str(l).lower() for l in spec]
+        weights = np.array([float(spec[l]) for l in spec])
+    except (TypeError, ValueError, OverflowError):
+        raise UncertaintyInputError("'climate' debe ser { etiqueta: probabilidad }")
+
+    with np.errstate(over="ignore"):
+        total = weights.sum()  # pesos enormes suman inf
+
+    if not labels or not np.isfinite(weights).all() or (weights < 0).any() or not 0 < total < np.inf:
+        raise UncertaintyInputError("'climate' debe ser { etiqueta: probabilidad }")
+
+    return labels, weights / total
+
+
+def parse_uncertainty(value):
+    """
+    Valida el parámetro "uncertainty" de los cálculos de viaje.
+    true → valores por defecto; dict → samples, seed y distribuciones
+    de fuel_price, extra_weight, road_grade y climate. None/false → None.
+    Otros valores se leen con parse_bool ("false" / "0" → None).
+    """
+    if value is None:
+        return None
+
+    if isinstance(value, dict):
+        options = value
+    else:
+        try:
+            enabled = parse_bool(value)
+        except ValueError:
+            raise UncertaintyInputError("'uncertainty' debe ser booleano u objeto")
+        if not enabled:
+            return None
+        options = {}
+
+    try:
+        samples = int(options.get("samples", UNCERTAINTY_SAMPLES))
+        seed = int(options.get("seed", 0))
+    except (TypeError, ValueError, OverflowError):
+        raise UncertaintyInputError("'samples' y 'seed' deben ser enteros")
+
+    if not 1 <= samples <= UNCERTAINTY_MAX_SAMPLES:
+        raise UncertaintyInputError(f"'samples' debe estar entre 1 y {UNCERTAINTY_MAX_SAMPLES}")
+
+    climate_labels, climate_p = _climate_spec(options.get("climate"))
+
+    return {
+        "samples": samples,
+        "seed": seed,
+        "fuel_price": _numeric_spec(options.get("fuel_price"), None),
+        "extra_weight": _numeric_spec(options.get("extra_weight"), None),
+        "road_grade": _numeric_spec(options.get("road_grade"), UNCERTAINTY_GRADE_SD),
+        "climate_labels": climate_labels,
+        "climate_p": climate_p,
+    }
+
+
+def _draw(rng, spec, center, size, default_sd=0.0):
+    dist = spec["dist"]
+
+    if dist == "fixed":
+        return np.full(size, float(center))
+    if dist == "uniform":
+        return rng.uniform(spec["low"], spec["high"], size)
+    if dist == "triangular":
+        return rng.triangular(spec["low"], spec["mode"], spec["high"], size)
+
+    sd = spec["sd"] if spec["sd"] is not None else default_sd
+    return rng.normal(center, sd, size)
+
+
+def _summary(values):
+    p10, p50, p90 = np.percentile(values, PERCENTILES)
+    return {
+        "p10": round(float(p10), 3),
+        "p50": round(float(p50), 3),
+        "p90": round(float(p90), 3),
+        "mean": round(float(values.mean()), 3),
+    }
+
+
+def simulate_trip_uncertainty(
+    options,
+    price_fc,
+    *,
+    distance_km,
+    climate,
+    fuel_price,
+    extra_weight,
+    road_grade,
+    climb_m=None,
+    descent_m=None,
+    time_budget=UNCERTAINTY_TIME_BUDGET,
+    chunk_cost=UNCERTAINTY_CHUNK_COST,
+):
+    """
+    Monte Carlo del costo del viaje.
+
+    price_fc(extra_weight, road_grade, climate, climb_m, descent_m)
+    calcula L/100km para columnas de muestras (vectorizado, p. ej.
+    CoefficientTable.adjusted_fc de la fila del vehículo).
+
+    Las muestras se generan por bloques con un RNG sembrado. El tope
+    por time_budget se fija antes de empezar, con chunk_cost (segundos
+    estimados por bloque) y no con el reloj: el mismo seed da el mismo
+    resultado aunque el servidor esté cargado. Si el tope recorta
+    `samples`, truncated=True.
+
+    La incertidumbre de pendiente es un desvío de la pendiente neta
+    (puntos porcentuales); con perfil de ruta se suma como subida o
+    bajada adicional.
+    """
+    climate_labels, climate_p = options["climate_labels"], options["climate_p"]
+    if climate_labels is None:
+        climate_labels, climate_p = _default_climate_p(climate)
+    climate_labels = np.array(climate_labels)
+
+    target = options["samples"]
+    if chunk_cost > 0:
+        target = min(target, max(1, int(time_budget / chunk_cost)) * CHUNK_SAMPLES)
+
+    rng = np.random.default_rng(options["seed"])
+    started = time.monotonic()
+
+    fc_chunks, price_chunks = [], []
+    done = 0
+
+    while done < target:
+        size = min(CHUNK_SAMPLES, target - done)
+
+        price = np.maximum(0.0, _draw(
+            rng, options["fuel_price"], fuel_price, size, UNCERTAINTY_FUEL_PRICE_SD * fuel_price
+        ))
+        weight = np.maximum(0.0, _draw(
+            rng, options["extra_weight"], extra_weight, size, UNCERTAINTY_PAYLOAD_SD * extra_weight
+        ))
+        grade_noise = _draw(rng, options["road_grade"], 0.0, size)
+        climates = climate_labels[rng.choice(len(climate_labels), size=size, p=climate_p)]
+
+        if climb_m is not None and descent_m is not None:
+            extra_m = grade_noise / 100 * distance_km * 1000
+            fc = price_fc(
+                weight,
+                road_grade,
+                climates,
+                climb_m + np.maximum(extra_m, 0.0),
+                descent_m + np.maximum(-extra_m, 0.0),
+            )
+        else:
+            fc = price_fc(weight, road_grade + grade_noise, climates, None, None)
+
+        fc_chunks.append(fc)
+        price_chunks.append(price)
+        done += size
+
+    fc = np.concatenate(fc_chunks)
+    fuel_used = distance_km * fc / 100
+    total_cost = fuel_used * np.concatenate(price_chunks)
+
+    return {
+        "samples": int(done),
+        "seed": options["seed"],
+        "truncated": done < options["samples"],
+        "elapsed_ms": round((time.monotonic() - started) * 1000, 1),
+        "adjustedFC": _summary(fc),
+        "fuelUsed": _summary(fuel_used),
+        "totalCost": _summary(total_cost),
+    }
+
+
+def vehicle_fc_model(table, row, base_fc, distance_km):
+    """
+    price_fc para simulate_trip_uncertainty: la fila del vehículo en la
+    tabla de coeficientes con base_fc y distancia fijas.
+    """
+    def price_fc(extra_weight, road_grade, climate, climb_m, descent_m):
+        n = len(extra_weight)
+        return table.adjusted_fc(
+            np.full(n, row),
+            base_fc=base_fc,
+            extra_weight=extra_weight,
+            road_grade=road_grade,
+            climate=climate,
+            distance_km=np.full(n, distance_km),
+            climb_m=climb_m,
+            descent_m=descent_m,
+            ndigits=None,
+        )
+
+    return price_fc
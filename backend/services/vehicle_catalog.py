@@ -0,0 +1,213 @@
+import threading
+import time
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
+from backend.config import VEHICLE_CATALOG_TTL
+from backend.models import Vehicle
+from backend.utils.text_utils import normalize
+
+
+class VehicleRecord:
+    """
+    Copia inmutable y compacta de una fila de Vehicle (sin sesión ni
+    estado del ORM). Mismos atributos que Vehicle para el cálculo.
+    """
+
+    __slots__ = (
+        "id",
+        "make",
+        "model",
+        "year",
+        "make_normalized",
+        "model_normalized",
+        "fuel_type",
+        "engine_cc",
+        "engine_cylinders",
+        "weight_kg",
+        "lkm_mixed",
+        "lkm_highway",
+        "mpg_mixed",
+        "drive_type",
+        "transmission",
+        "data_source",
+    )
+
+    def __init__(self, **values):
+        for name in self.__slots__:
+            object.__setattr__(self, name, values.get(name))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("VehicleRecord es de solo lectura")
+
+    @classmethod
+    def from_row(cls, row):
+        return cls(**row._asdict())
+
+    @property
+    def key(self):
+        return (self.make_normalized, self.model_normalized, self.year)
+
+    def to_dict(self):
+        """Mismo formato que Vehicle.to_dict()."""
+        return {
+            "id": self.id,
+            "make": self.make,
+            "model": self.model,
+            "year": self.year,
+            "fuel_type": self.fuel_type,
+            "engine_cc": self.engine_cc,
+            "engine_cylinders": self.engine_cylinders,
+            "weight_kg": self.weight_kg,
+            "lkm_mixed": self.lkm_mixed,
+            "mpg_mixed": self.mpg_mixed,
+            "drive_type": self.drive_type,
+            "transmission": self.transmission,
+            "data_source": self.data_source,
+        }
+
+    def __repr__(self):
+        return f"<VehicleRecord {self.make} {self.model} {self.year}>"
+
+
+class CatalogSnapshot:
+    """
+    Catálogo completo en memoria, ordenado por id.
+
+    - by_key: (make normalizado, model normalizado, año) → registro
+    - by_id: id → registro
+    - coefficients: CoefficientTable derivada (la arma
+      vehicle_coefficients la primera vez que se pide)
+
+    Nunca se modifica: ante cambios se arma uno nuevo y se reemplaza
+    la referencia global.
+    """
+
+    __slots__ = ("records", "by_key", "by_id", "loaded_at", "coefficients")
+
+    def __init__(self, records):
+        self.records = tuple(records)
+        self.by_key = {r.key: r for r in self.records}
+        self.by_id = {r.id: r for r in self.records}
+        self.loaded_at = time.monotonic()
+        self.coefficients = None
+
+    def __len__(self):
+        return len(self.records)
+
+    def find(self, brand, model, year):
+        return self.by_key.get((normalize(brand), normalize(model), year))
+
+    def expired(self) -> bool:
+        return time.monotonic() - self.loaded_at > VEHICLE_CATALOG_TTL
+
+
+def load_catalog_snapshot() -> CatalogSnapshot:
+    """
+    Lee el catálogo en una sola consulta (solo columnas, sin objetos ORM).
+    """
+    columns = [getattr(Vehicle, name) for name in VehicleRecord.__slots__]
+    rows = Vehicle.query.with_entities(*columns).order_by(Vehicle.id).all()
+    return CatalogSnapshot(VehicleRecord.from_row(row) for row in rows)
+
+
+_snapshot = None
+_snapshot_lock = threading.Lock()  # una sola carga a la vez
+
+# Cada invalidación incrementa la generación; una carga solo se publica
+# si nadie invalidó mientras leía (si no, podría ser anterior al commit)
+_generation = 0
+_generation_lock = threading.Lock()
+
+_MAX_LOAD_ATTEMPTS = 3
+
+
+def get_vehicle_catalog() -> CatalogSnapshot:
+    """
+    Snapshot vigente. Se carga la primera vez (y tras invalidar o
+    vencer el TTL); el resto de las lecturas no toca la base de datos.
+    Requiere contexto de aplicación solo cuando hay que cargar.
+    """
+    global _snapshot
+
+    snapshot = _snapshot
+    if snapshot is not None and not snapshot.expired():
+        return snapshot
+
+    with _snapshot_lock:
+        for _ in range(_MAX_LOAD_ATTEMPTS):
+            current = _snapshot
+            if current is not None and not current.expired():
+                return current
+
+            generation = _generation
+            snapshot = load_catalog_snapshot()
+
+            with _generation_lock:
+                if generation == _generation:
+                    _snapshot = snapshot  # reemplazo atómico de la referencia
+                    return snapshot
+
+        # Invalidado en cada intento: se usa la última carga sin publicarla
+        return snapshot
+
+
+def invalidate_vehicle_catalog():
+    """
+    Descarta el snapshot; la próxima lectura lo recarga. Llamar tras
+    cargas que no pasan por la sesión del ORM (seeds, scripts).
+    """
+    global _snapshot, _generation
+
+    with _generation_lock:
+        _generation += 1
+        _snapshot = None
+
+
+def find_vehicle_record(brand, model, year):
+    """
+    Vehículo por marca / modelo / año (sin importar mayúsculas ni
+    tildes) desde el snapshot, o None.
+    """
+    return get_vehicle_catalog().find(brand, model, year)
+
+
+# ===============================
+# INVALIDACIÓN
+# ===============================
+# Cambios de Vehicle (ORM o update/delete masivo) marcan la sesión;
+# el snapshot se invalida recién al commit, para no recargarlo con
+# datos que aún pueden revertirse.
+_CATALOG_CHANGED = "vehicle_catalog_changed"
+
+
+def _mark_session(session):
+    if session is not None:
+        session.info[_CATALOG_CHANGED] = True
+
+
+@event.listens_for(Vehicle, "after_insert")
+@event.listens_for(Vehicle, "after_update")
+@event.listens_for(Vehicle, "after_delete")
+def _on_vehicle_change(mapper, connection, target):
+    _mark_session(object_session(target))
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _on_bulk_statement(orm_execute_state):
+    if not (orm_execute_state.is_update or orm_execute_state.is_delete or orm_execute_state.is_insert):
+        return
+
+    mapper = orm_execute_state.bind_mapper
+    if mapper is not None and mapper.class_ is Vehicle:
+        _mark_session(orm_execute_state.session)
+
+
+@event.listens_for(Session, "after_commit")
+def _on_commit(session):
+    if session.info.pop(_CATALOG_CHANGED, False):
+        invalidate_vehicle_catalog()
+
+
+@event.listens_for(Session, "after_rollback")
+def _on_rollback(session):
+    session.info.pop(_CATALOG_CHANGED, None)
@@ -0,0 +1,186 @@
+import threading
+import numpy as np
+from backend.utils.text_utils import normalize
+from backend.services.vehicle_catalog import get_vehicle_catalog, invalidate_vehicle_catalog
+from backend.services.consumption_service import (
+    ConsumptionError,
+    ConsumptionType,
+    resolve_base_consumption,
+)
+from backend.utils.trip_calculation import (
+    calculate_fuel_consumption_batch,
+    engine_modifier,
+)
+
+DEFAULT_VEHICLE_WEIGHT = 1500  # kg si el vehículo no tiene peso
+
+
+class CoefficientTable:
+    """
+    Coeficientes de consumo precalculados, una fila por vehículo.
+
+    Columnas (np.ndarray):
+    - mixed_fc / highway_fc: consumo base ya resuelto con sus
+      fallbacks (NaN si no hay dato)
+    - weight_kg: peso del vehículo (default 1500)
+    - engine_factor: modificador de motor según fuel_type
+    - electric: sin simulación de combustible
+    - make / model / year / fuel_type: para mostrar y filtrar
+      (make normalizado y fuel_type en minúsculas para filtrar)
+
+    El cálculo de un viaje queda en indexar la fila y unas pocas
+    multiplicaciones (calculate_fuel_consumption_batch).
+    """
+
+    def __init__(self, vehicles):
+        n = len(vehicles)
+
+        self.ids = np.empty(n, dtype=np.int64)
+        self.mixed_fc = np.full(n, np.nan)
+        self.highway_fc = np.full(n, np.nan)
+        self.weight_kg = np.empty(n)
+        self.engine_factor = np.empty(n)
+        self.electric = np.zeros(n, dtype=bool)
+
+        self.make = np.array([v.make for v in vehicles], dtype=object)
+        self.model = np.array([v.model for v in vehicles], dtype=object)
+        self.year = np.array([v.year for v in vehicles], dtype=np.int64)
+        self.fuel_type = np.array([v.fuel_type for v in vehicles], dtype=object)
+        self.make_key = np.array([v.make_normalized for v in vehicles], dtype=object)
+        self.fuel_type_key = np.array([(v.fuel_type or "").strip().lower() for v in vehicles], dtype=object)
+
+        self._row_by_id = {}
+        self._row_by_key = {}
+
+        for row, v in enumerate(vehicles):
+            self.ids[row] = v.id
+            self.weight_kg[row] = v.weight_kg or DEFAULT_VEHICLE_WEIGHT
+            self.engine_factor[row] = engine_modifier(v.fuel_type)
+            self.electric[row] = bool(v.fuel_type and "electric" in v.fuel_type.lower())
+
+            for consumption_type, column in (("mixed", self.mixed_fc), ("highway", self.highway_fc)):
+                try:
+                    column[row] = resolve_base_consumption(v, consumption_type)
+                except ConsumptionError:
+                    pass
+
+            self._row_by_id[v.id] = row
+            self._row_by_key[(v.make_normalized, v.model_normalized, v.year)] = row
+
+    def __len__(self):
+        return len(self.ids)
+
+    def row_of(self, vehicle_id):
+        return self._row_by_id.get(vehicle_id)
+
+    def find(self, brand, model, year):
+        """
+        Fila por marca / modelo / año (mismas reglas que find_vehicle), o None.
+        """
+        return self._row_by_key.get((normalize(brand), normalize(model), year))
+
+    def vehicle_error(self, row):
+        """
+        Mensaje si la fila no admite simulación de combustible, o None.
+        """
+        if row is None:
+            return "No se encontraron detalles del vehículo"
+        if self.electric[row]:
+            return "Este es un vehículo eléctrico. No aplica simulación de combustible."
+        if np.isnan(self.mixed_fc[row]):
+            return "No hay datos suficientes de consumo para este vehículo."
+        return None
+
+    def simulable(self) -> np.ndarray:
+        """
+        Máscara de filas con simulación de combustible (ver vehicle_error).
+        """
+        return ~self.electric & ~np.isnan(self.mixed_fc)
+
+    def base_fc(self, rows, consumption_type: ConsumptionType):
+        """
+        Consumo base de las filas para el tipo de viaje.
+        """
+        column = self.highway_fc if consumption_type == "highway" else self.mixed_fc
+        values = column[rows]
+
+        if np.isnan(values).any():
+            raise ConsumptionError(f"Vehículo sin consumo {consumption_type}")
+
+        return values
+
+    def adjusted_fc(
+        self,
+        rows,
+        *,
+        base_fc,
+        extra_weight,
+        road_grade,
+        climate,
+        distance_km=None,
+        climb_m=None,
+        descent_m=None,
+        trip_distance_km=None,
+        ndigits: int | None = 3,
+    ) -> np.ndarray:
+        """
+        Consumo ajustado (L/100km) para las filas dadas; base_fc por
+        fila (ver base_fc) y el resto igual que en
+        calculate_fuel_consumption_batch.
+        """
+        rows = np.asarray(rows, dtype=np.int64)
+        n = len(rows)
+
+        return calculate_fuel_consumption_batch(
+            base_fc=np.broadcast_to(np.asarray(base_fc, dtype=float), n),
+            vehicle_weight=self.weight_kg[rows],
+            extra_weight=np.broadcast_to(np.asarray(extra_weight, dtype=float), n),
+            road_grade=np.broadcast_to(np.asarray(road_grade, dtype=float), n),
+            climate=climate,
+            distance_km=distance_km,
+            climb_m=climb_m,
+            descent_m=descent_m,
+            trip_distance_km=trip_distance_km,
+            engine_factor=self.engine_factor[rows],
+            ndigits=ndigits,
+        )
+
+
+_table_lock = threading.Lock()
+
+
+def get_coefficient_table() -> CoefficientTable:
+    """
+    Tabla del snapshot vigente del catálogo; se arma una vez por
+    snapshot, así queda invalidada junto con él.
+    """
+    snapshot = get_vehicle_catalog()
+
+    table = snapshot.coefficients
+    if table is not None:
+        return table
+
+    with _table_lock:
+        if snapshot.coefficients is None:
+            snapshot.coefficients = CoefficientTable(snapshot.records)
+        return snapshot.coefficients
+
+
+def invalidate_coefficient_table():
+    invalidate_vehicle_catalog()
+
+
+def coefficients_for_vehicle(vehicle_id):
+    """
+    (tabla, fila) del vehículo. Si la fila no existe aún (vehículo
+    recién creado por otro proceso) se recarga el catálogo una vez.
+    """
+    table = get_coefficient_table()
+    row = table.row_of(vehicle_id)
+
+    if row is None:
+        invalidate_coefficient_table()
+        table = get_coefficient_table()
+        row = table.row_of(vehicle_id)
+
+    return table, row
@@ -1,53 +1,65 @@
-import requests
-from backend.config import OPENWEATHER_API_KEY
+from backend.services import http_client
+from backend.services.resilience import guarded, CircuitOpenError, UPSTREAM_UNAVAILABLE
+from backend.config import (
+    OPENWEATHER_API_KEY,
+    WEATHER_CACHE_PRECISION,
+    WEATHER_CACHE_TTL,
+    WEATHER_CACHE_MAXSIZE,
+)
+from backend.utils.geo import geohash_encode
+from backend.utils.ttl_cache import TTLCache
 
+OPENWEATHER_URL = "https://api.openweathermap.org/data/2.5/weather"
 
-def get_weather_from_coords(coords):
-    lat = coords["lat"]
-    lng = coords["lng"]
+# geohash de la celda → resultado de clima
+_weather_cache = TTLCache(
+    maxsize=WEATHER_CACHE_MAXSIZE,
+    ttl=WEATHER_CACHE_TTL,
+    name="weather",
+)
 
-    if not OPENWEATHER_API_KEY:
-        return {
-            "climate": "mild",
-            "raw": None,
-            "source": "fallback_no_api_key",
-        }
-
-    url = "https://api.openweathermap.org/data/2.5/weather"
-    params = {
+
+def get_weather_cache_stats():
+    return _weather_cache.stats()
+
+
+def classify_climate(temp, wind, condition):
+    if "snow" in condition.lower():
+        return "snowy"
+    if temp <= 5:
+        return "cold"
+    if temp >= 30:
+        return "hot"
+    if wind >= 8:
+        return "windy"
+    return "mild"
+
+
+class WeatherStatusError(Exception):
+    def __init__(self, status_code):
+        super().__init__(f"OpenWeatherMap respondió {status_code}")
+        self.status_code = status_code
+
+
+def weather_request_params(lat, lng):
+    return {
         "lat": lat,
         "lon": lng,
         "appid": OPENWEATHER_API_KEY,
         "units": "metric",
     }
 
-    response = requests.get(url, params=params)
-    if response.status_code != 200:
-        return {
-            "climate": "mild",
-            "raw": None,
-            "source": f"fallback_status_{response.status_code}",
-        }
 
-    data = response.json()
+def parse_weather_response(status_code, data):
+    if status_code != 200:
+        raise WeatherStatusError(status_code)
 
     temp = data["main"]["temp"]
     wind = data["wind"]["speed"]
     condition = data["weather"][0]["main"]
 
-    if "snow" in condition.lower():
-        label = "snowy"
-    elif temp <= 5:
-        label = "cold"
-    elif temp >= 30:
-        label = "hot"
-    elif wind >= 8:
-        label = "windy"
-    else:
-        label = "mild"
-
     return {
-        "climate": label,
+        "climate": classify_climate(temp, wind, condition),
         "raw": {
             "temp_celsius": temp,
             "wind_speed_mps": wind,
@@ -55,3 +67,52 @@ def get_weather_from_coords(coords):
         },
         "source": "openweathermap",
     }
+
+
+def weather_tile(lat, lng):
+    return geohash_encode(float(lat), float(lng), WEATHER_CACHE_PRECISION)
+
+
+def get_cached_weather(tile):
+    return _weather_cache.get(tile)
+
+
+def store_weather(tile, result):
+    _weather_cache.set(tile, result)
+
+
+def weather_fallback(source):
+    return {
+        "climate": "mild",
+        "raw": None,
+        "source": source,
+    }
+
+
+@guarded("openweathermap")
+def _fetch_weather(lat, lng):
+    response = http_client.get(OPENWEATHER_URL, params=weather_request_params(lat, lng))
+    data = response.json() if response.status_code == 200 else None
+    return parse_weather_response(response.status_code, data)
+
+
+def get_weather_from_coords(coords):
+    lat = coords["lat"]
+    lng = coords["lng"]
+
+    if not OPENWEATHER_API_KEY:
+        return weather_fallback("fallback_no_api_key")
+
+    # Una consulta por celda y TTL; los fallbacks no se cachean
+    tile = weather_tile(lat, lng)
+
+    try:
+        return _weather_cache.get_or_load(tile, lambda: _fetch_weather(lat, lng))
+
+    except WeatherStatusError as e:
+        return weather_fallback(f"fallback_status_{e.status_code}")
+
+    except UPSTREAM_UNAVAILABLE as e:
+        if isinstance(e, CircuitOpenError):
+            return weather_fallback("fallback_circuit_open")
+        return weather_fallback("fallback_rate_limited")
@@ -0,0 +1,35 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from backend.services.dem_service import DemProvider, srtm_tile_name
+
+
+class TileValidationTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.dem = DemProvider(self.tmp.name)
+
+    def _write_tile(self, key, data):
+        with open(os.path.join(self.tmp.name, srtm_tile_name(*key)), "wb") as f:
+            f.write(data)
+
+    def test_srtm3_tile_is_read(self):
+        self._write_tile((-34, -71), np.full((1201, 1201), 500, dtype=">i2").tobytes())
+
+        elevations = self.dem.elevations([-33.5], [-70.5])
+
+        self.assertEqual(elevations.tolist(), [500.0])
+
+    def test_truncated_tile_is_treated_as_missing(self):
+        self._write_tile((-34, -71), np.full((1201, 1200), 500, dtype=">i2").tobytes())
+
+        self.assertFalse(self.dem.covers(-33.5, -70.5))
+        self.assertTrue(np.isnan(self.dem.elevations([-33.5], [-70.5])).all())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from backend.services import distance_service
+from backend.services.distance_service import (
+    MAX_MATRIX_DESTINATIONS,
+    MAX_MATRIX_ELEMENTS,
+    MAX_MATRIX_ORIGINS,
+    get_distance_matrix_km,
+)
+
+
+def _stops(n):
+    return [{"lat": -33.0 - i * 0.01, "lng": -70.0 - i * 0.01} for i in range(n)]
+
+
+class SkipDiagonalTest(unittest.TestCase):
+    def setUp(self):
+        distance_service._distance_cache.clear()
+        self.requests = []
+
+        def fetch(origins, destinations):
+            self.requests.append((origins, destinations))
+            return [[1.0 for _ in destinations] for _ in origins]
+
+        patcher = mock.patch.object(distance_service, "_fetch_matrix_block", side_effect=fetch)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(distance_service._distance_cache.clear)
+
+    def test_self_pairs_are_never_requested(self):
+        for n in (2, 3, 10, 37):
+            distance_service._distance_cache.clear()
+            self.requests.clear()
+            stops = _stops(n)
+
+            result = get_distance_matrix_km(stops, stops, skip_diagonal=True)
+
+            elements = sum(len(o) * len(d) for o, d in self.requests)
+            self.assertEqual(elements, n * (n - 1), n)
+            for origins, destinations in self.requests:
+                self.assertFalse(any(p in destinations for p in origins))
+                self.assertLessEqual(len(origins), MAX_MATRIX_ORIGINS)
+                self.assertLessEqual(len(destinations), MAX_MATRIX_DESTINATIONS)
+                self.assertLessEqual(len(origins) * len(destinations), MAX_MATRIX_ELEMENTS)
+
+            matrix = result["distances_km"]
+            np.testing.assert_array_equal(np.diag(matrix), np.zeros(n))
+            self.assertFalse(np.isnan(matrix).any())
+
+    def test_cached_pairs_are_not_requested_again(self):
+        stops = _stops(5)
+        get_distance_matrix_km(stops, stops, skip_diagonal=True)
+        self.requests.clear()
+
+        result = get_distance_matrix_km(stops, stops, skip_diagonal=True)
+
+        self.assertEqual(self.requests, [])
+        self.assertEqual(result["cache_hits"], 20)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,37 @@
+import asyncio
+import unittest
+
+from backend.services.rate_limiter import QuotaExceededError, TokenBucket
+
+
+class DailyBudgetTest(unittest.TestCase):
+    def test_cost_above_burst_is_charged_in_full(self):
+        bucket = TokenBucket("test_daily", rate=1000, capacity=10, daily_budget=100)
+
+        bucket.acquire(60)
+        self.assertEqual(bucket.used_today, 60)
+
+        with self.assertRaises(QuotaExceededError):
+            bucket.acquire(60)
+        self.assertEqual(bucket.used_today, 60)
+
+    def test_async_cost_above_burst_is_charged_in_full(self):
+        bucket = TokenBucket("test_daily_async", rate=1000, capacity=10, daily_budget=100)
+
+        asyncio.run(bucket.acquire_async(60))
+        self.assertEqual(bucket.used_today, 60)
+
+        with self.assertRaises(QuotaExceededError):
+            asyncio.run(bucket.acquire_async(41))
+
+    def test_cost_above_burst_only_waits_for_a_full_bucket(self):
+        bucket = TokenBucket("test_burst", rate=1000, capacity=10)
+
+        bucket.acquire(60)
+
+        self.assertEqual(bucket.used_today, 60)
+        self.assertLess(bucket.tokens, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+import asyncio
+import unittest
+
+from backend.services.resilience import CircuitBreaker, CircuitOpenError, guarded, guarded_async, get_breaker
+
+
+def _half_open(breaker):
+    """Fuerza el estado half_open (recovery_timeout ya vencido)."""
+    breaker.state = "open"
+    breaker.opened_at = -breaker.recovery_timeout - 1
+    breaker._probe_in_flight = False
+
+
+class CancelledProbeTest(unittest.TestCase):
+    def test_cancelled_async_probe_is_released(self):
+        breaker = get_breaker("test_cancelled_probe")
+
+        @guarded_async("test_cancelled_probe")
+        async def slow_call():
+            await asyncio.sleep(10)
+
+        @guarded_async("test_cancelled_probe")
+        async def fast_call():
+            return "ok"
+
+        async def scenario():
+            _half_open(breaker)
+            with self.assertRaises(asyncio.TimeoutError):
+                await asyncio.wait_for(slow_call(), timeout=0.01)
+
+            self.assertFalse(breaker._probe_in_flight)
+            return await fast_call()
+
+        self.assertEqual(asyncio.run(scenario()), "ok")
+        self.assertEqual(breaker.state, "closed")
+
+    def test_probe_released_when_cost_raises(self):
+        # nhtsa tiene token bucket configurado: cost() se evalúa
+        breaker = get_breaker("nhtsa")
+
+        @guarded("nhtsa", cost=lambda: 1 / 0)
+        def call():
+            return "ok"
+
+        _half_open(breaker)
+        try:
+            with self.assertRaises(ZeroDivisionError):
+                call()
+            self.assertFalse(breaker._probe_in_flight)
+        finally:
+            breaker.record_success()
+
+    def test_second_probe_rejected_while_in_flight(self):
+        breaker = CircuitBreaker("test_in_flight", failure_threshold=1, recovery_timeout=30)
+        _half_open(breaker)
+
+        breaker.before_call()
+        with self.assertRaises(CircuitOpenError):
+            breaker.before_call()
+
+
+if __name__ == "__main__":
+    unittest.main()
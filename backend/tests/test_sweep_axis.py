@@ -0,0 +1,27 @@
+import unittest
+
+from backend.routes.trip_routes import SweepInputError, _sweep_axis
+
+
+class SweepRangeTest(unittest.TestCase):
+    def test_float_steps_keep_the_input_precision(self):
+        axis = _sweep_axis({"fuelPrice": {"start": 0.1, "stop": 0.5, "step": 0.1}}, "fuelPrice", 0)
+
+        self.assertEqual(axis, [0.1, 0.2, 0.3, 0.4, 0.5])
+
+    def test_integer_axis_rejects_fractional_steps(self):
+        with self.assertRaises(SweepInputError):
+            _sweep_axis({"passengers": {"start": 0, "stop": 2, "step": 0.5}}, "passengers", 0, int)
+
+    def test_integer_axis_range(self):
+        axis = _sweep_axis({"passengers": {"start": 1, "stop": 5, "step": 2}}, "passengers", 0, int)
+
+        self.assertEqual(axis, [1, 3, 5])
+
+    def test_non_finite_bounds_are_rejected(self):
+        with self.assertRaises(SweepInputError):
+            _sweep_axis({"extraWeight": {"start": 0, "stop": "inf"}}, "extraWeight", 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,112 @@
+import os
+import unittest
+from datetime import datetime
+from unittest import mock
+
+from flask_jwt_extended import create_access_token
+
+from app import create_app
+from backend.models import db, Trip, TripSummary, User
+from backend.services.trip_summary_service import (
+    UNDATED_MONTH,
+    forget_trip,
+    get_trip_summary,
+    record_trip,
+    record_trip_rows,
+)
+
+
+def _trip(user_id, brand, model, **values):
+    return Trip(
+        user_id=user_id, brand=brand, model=model, year=2020,
+        fuel_type="gasoline", fuel_price=1.0, total_weight=1000, passengers=1,
+        location="-33.4,-70.6", distance=100.0, fuel_consumed=6.0, total_cost=6.0,
+        road_grade=0.0, weather="mild", created_at=datetime(2026, 5, 3), **values,
+    )
+
+
+class TripSummaryTestCase(unittest.TestCase):
+    def setUp(self):
+        with mock.patch.dict(os.environ, {"SQLALCHEMY_DATABASE_URI": "sqlite://", "JWT_SECRET_KEY": "x" * 40}):
+            self.app = create_app()
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        db.create_all()
+
+        self.owner = User("owner", "owner@example.com", "pw")
+        self.other = User("other", "other@example.com", "pw")
+        db.session.add_all([self.owner, self.other])
+        db.session.commit()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+
+    def _save(self, trip):
+        db.session.add(trip)
+        record_trip(trip)
+        db.session.commit()
+        return trip
+
+
+class SummaryKeyTest(TripSummaryTestCase):
+    def test_casings_from_every_writer_share_one_group(self):
+        self._save(_trip(self.owner.id, "Citroën", "C3"))   # cálculo (vehicle.make)
+        self._save(_trip(self.owner.id, "Citroën", "c3"))   # POST /trips (.capitalize())
+        record_trip_rows([{                                  # importación
+            "user_id": self.owner.id, "brand": "CITROEN", "model": "C3", "year": 2020,
+            "created_at": datetime(2026, 5, 20), "distance": 50.0, "fuel_consumed": 3.0, "total_cost": 3.0,
+        }])
+        db.session.commit()
+
+        rows = TripSummary.query.all()
+        self.assertEqual(len(rows), 1)
+        self.assertEqual((rows[0].brand, rows[0].model, rows[0].trips), ("citroen", "c3", 3))
+
+
+class UndatedTripTest(TripSummaryTestCase):
+    def test_legacy_trip_without_created_at_keeps_its_null_date(self):
+        trip = self._save(_trip(self.owner.id, "Kia", "Rio"))
+        db.session.execute(db.update(Trip).where(Trip.id == trip.id).values(created_at=None))
+        db.session.execute(db.update(TripSummary).values(month=UNDATED_MONTH))  # como el backfill
+        db.session.commit()
+        db.session.expire_all()
+
+        self.assertIsNone(get_trip_summary(self.owner.id)["monthly"][0]["month"])
+
+        forget_trip(trip)
+        db.session.commit()
+
+        self.assertIsNone(trip.created_at)
+        self.assertEqual(TripSummary.query.count(), 0)
+
+
+class DeleteTripTest(TripSummaryTestCase):
+    def _delete(self, trip_id, user):
+        token = create_access_token(identity=str(user.id))
+        return self.app.test_client().delete(
+            f"/api/trips/{trip_id}", headers={"Authorization": f"Bearer {token}"}
+        )
+
+    def test_other_users_trip_is_not_found(self):
+        trip_id = self._save(_trip(self.owner.id, "Kia", "Rio")).id
+
+        response = self._delete(trip_id, self.other)
+
+        self.assertEqual(response.status_code, 404)
+        self.assertIsNotNone(db.session.get(Trip, trip_id))
+        self.assertEqual(TripSummary.query.one().trips, 1)
+
+    def test_owner_deletes_trip_and_summary_row(self):
+        trip_id = self._save(_trip(self.owner.id, "Kia", "Rio")).id
+
+        response = self._delete(trip_id, self.owner)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIsNone(db.session.get(Trip, trip_id))
+        self.assertEqual(TripSummary.query.count(), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
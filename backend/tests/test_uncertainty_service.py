@@ -0,0 +1,88 @@
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from backend.services import uncertainty_service
+from backend.services.uncertainty_service import (
+    CHUNK_SAMPLES,
+    UncertaintyInputError,
+    parse_uncertainty,
+    simulate_trip_uncertainty,
+)
+
+
+def _price_fc(extra_weight, road_grade, climate, climb_m, descent_m):
+    return 6.0 + extra_weight / 1000 + np.asarray(road_grade) * 0.1
+
+
+def _simulate(options, **kwargs):
+    return simulate_trip_uncertainty(
+        options, _price_fc, distance_km=100, climate="mild",
+        fuel_price=1.2, extra_weight=100, road_grade=0.0, **kwargs,
+    )
+
+
+class ParseUncertaintyFlagTest(unittest.TestCase):
+    def test_false_strings_disable_the_simulation(self):
+        for value in (None, False, 0, "false", "0", "no"):
+            self.assertIsNone(parse_uncertainty(value), value)
+
+    def test_true_strings_use_the_defaults(self):
+        for value in (True, 1, "true", "1"):
+            self.assertIsNotNone(parse_uncertainty(value), value)
+
+    def test_garbage_is_rejected(self):
+        for value in ("maybe", 2, [True]):
+            with self.assertRaises(UncertaintyInputError):
+                parse_uncertainty(value)
+
+
+class NonFiniteParametersTest(unittest.TestCase):
+    def test_non_finite_climate_weights_are_rejected(self):
+        for weights in ({"cold": "nan"}, {"cold": "inf", "mild": 1}, {"cold": 1e308, "mild": 1e308}):
+            with self.assertRaises(UncertaintyInputError):
+                parse_uncertainty({"climate": weights})
+
+    def test_non_finite_distribution_parameters_are_rejected(self):
+        specs = (
+            {"dist": "normal", "sd": "nan"},
+            {"dist": "normal", "sd": "inf"},
+            {"dist": "uniform", "low": "-inf", "high": 1},
+            {"dist": "triangular", "low": 0, "mode": 1, "high": "inf"},
+        )
+        for spec in specs:
+            with self.assertRaises(UncertaintyInputError):
+                parse_uncertainty({"fuel_price": spec})
+
+    def test_infinite_samples_is_rejected(self):
+        with self.assertRaises(UncertaintyInputError):
+            parse_uncertainty({"samples": float("inf")})
+
+
+class ReproducibleSimulationTest(unittest.TestCase):
+    def test_same_seed_gives_same_result_under_load(self):
+        options = parse_uncertainty({"samples": 3 * CHUNK_SAMPLES, "seed": 7})
+        fast = _simulate(options)
+
+        # Reloj que avanza una hora por lectura: el recorte no depende del tiempo real
+        clock = iter(range(0, 10 ** 6, 3600))
+        with mock.patch.object(uncertainty_service.time, "monotonic", side_effect=lambda: next(clock)):
+            slow = _simulate(options)
+
+        for result in (fast, slow):
+            result.pop("elapsed_ms")
+        self.assertEqual(fast, slow)
+        self.assertEqual(fast["samples"], 3 * CHUNK_SAMPLES)
+
+    def test_samples_are_capped_from_the_chunk_cost_estimate(self):
+        options = parse_uncertainty({"samples": 5 * CHUNK_SAMPLES})
+
+        result = _simulate(options, time_budget=0.02, chunk_cost=0.01)
+
+        self.assertEqual(result["samples"], 2 * CHUNK_SAMPLES)
+        self.assertTrue(result["truncated"])
+
+
+if __name__ == "__main__":
+    unittest.main()
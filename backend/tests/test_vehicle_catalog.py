@@ -0,0 +1,38 @@
+import unittest
+from unittest import mock
+
+from backend.services import vehicle_catalog
+from backend.services.vehicle_catalog import CatalogSnapshot, VehicleRecord
+
+
+def _snapshot(lkm_mixed):
+    return CatalogSnapshot([
+        VehicleRecord(id=1, make="Kia", model="Rio", year=2020,
+                      make_normalized="kia", model_normalized="rio", lkm_mixed=lkm_mixed),
+    ])
+
+
+class InvalidateDuringLoadTest(unittest.TestCase):
+    def tearDown(self):
+        vehicle_catalog.invalidate_vehicle_catalog()
+
+    def test_load_overlapping_invalidation_is_not_published(self):
+        loads = [_snapshot(6.0), _snapshot(5.0)]
+
+        def load():
+            snapshot = loads.pop(0)
+            if loads:
+                # commit de otro hilo mientras se leía el catálogo
+                vehicle_catalog.invalidate_vehicle_catalog()
+            return snapshot
+
+        vehicle_catalog.invalidate_vehicle_catalog()
+        with mock.patch.object(vehicle_catalog, "load_catalog_snapshot", side_effect=load):
+            catalog = vehicle_catalog.get_vehicle_catalog()
+
+        self.assertEqual(catalog.find("KIA", "rio", 2020).lkm_mixed, 5.0)
+        self.assertIs(vehicle_catalog._snapshot, catalog)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,106 @@
+import numpy as np
+
+# Metros por grado (aprox. equirectangular, suficiente para simplificar)
+_METERS_PER_DEG_LAT = 110_540.0
+_METERS_PER_DEG_LNG = 111_320.0
+
+
+def decode_polyline(encoded: str, precision: int = 5) -> np.ndarray:
+    """
+    Decodifica un Encoded Polyline de Google.
+    Retorna array (N, 2) de [lat, lng].
+    """
+
+    if not encoded:
+        return np.empty((0, 2))
+
+    chunks = np.frombuffer(encoded.encode("ascii"), dtype=np.uint8).astype(np.int64) - 63
+
+    # Cada valor termina en el primer chunk sin bit de continuación (0x20)
+    is_last = chunks < 0x20
+    value_index = np.concatenate(([0], np.cumsum(is_last)[:-1]))
+    value_starts = np.flatnonzero(np.concatenate(([True], is_last[:-1])))
+    position = np.arange(len(chunks)) - value_starts[value_index]
+
+    parts = (chunks & 0x1F) << (5 * position)
+    values = np.zeros(int(is_last.sum()), dtype=np.int64)
+    np.add.at(values, value_index, parts)
+
+    # Zigzag → entero con signo
+    deltas = np.where(values & 1, ~(values >> 1), values >> 1)
+
+    return np.cumsum(deltas.reshape(-1, 2), axis=0) / 10 ** precision
+
+
+def encode_polyline(coords, precision: int = 5) -> str:
+    """
+    Codifica un array (N, 2) de [lat, lng] como Encoded Polyline.
+    """
+
+    coords = np.asarray(coords, dtype=np.float64).reshape(-1, 2)
+    if len(coords) == 0:
+        return ""
+
+    ints = np.round(coords * 10 ** precision).astype(np.int64)
+    deltas = np.diff(ints, axis=0, prepend=0).ravel()
+
+    values = np.where(deltas < 0, ~(deltas << 1), deltas << 1)
+
+    # Hasta 7 chunks de 5 bits por valor
+    shifts = 5 * np.arange(7)
+    parts = (values[:, None] >> shifts) & 0x1F
+    n_chunks = np.maximum(1, (np.floor(np.log2(np.maximum(values, 1))).astype(np.int64) // 5) + 1)
+    n_chunks[values == 0] = 1
+
+    used = np.arange(7)[None, :] < n_chunks[:, None]
+    more = np.arange(7)[None, :] < (n_chunks[:, None] - 1)
+    encoded = (parts | np.where(more, 0x20, 0)) + 63
+
+    return encoded[used].astype(np.uint8).tobytes().decode("ascii")
+
+
+def simplify_polyline(coords, tolerance_m: float) -> np.ndarray:
+    """
+    Douglas–Peucker con tolerancia en metros.
+    Conserva siempre el primer y último punto.
+    """
+
+    coords = np.asarray(coords, dtype=np.float64).reshape(-1, 2)
+    if len(coords) < 3 or tolerance_m <= 0:
+        return coords
+
+    # Proyección local a metros
+    lat0 = np.radians(coords[:, 0].mean())
+    xy = np.column_stack((
+        coords[:, 1] * _METERS_PER_DEG_LNG * np.cos(lat0),
+        coords[:, 0] * _METERS_PER_DEG_LAT,
+    ))
+
+    keep = np.zeros(len(coords), dtype=bool)
+    keep[0] = keep[-1] = True
+    stack = [(0, len(coords) - 1)]
+
+    while stack:
+        start, end = stack.pop()
+        if end - start < 2:
+            continue
+
+        a = xy[start]
+        b = xy[end]
+        points = xy[start + 1:end]
+        ab = b - a
+        length = np.hypot(*ab)
+
+        if length == 0:
+            distances = np.hypot(*(points - a).T)
+        else:
+            distances = np.abs(ab[0] * (points[:, 1] - a[1]) - ab[1] * (points[:, 0] - a[0])) / length
+
+        farthest = int(np.argmax(distances))
+        if distances[farthest] > tolerance_m:
+            split = start + 1 + farthest
+            keep[split] = True
+            stack.append((start, split))
+            stack.append((split, end))
+
+    return coords[keep]
@@ -0,0 +1,104 @@
+import asyncio
+import threading
+
+
+class _InFlight:
+    """Llamada en curso compartida entre hilos que piden la misma clave."""
+
+    __slots__ = ("event", "value", "error", "waiters")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.value = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Colapsa llamadas concurrentes idénticas.
+
+    Mientras `fn` está en curso para una clave, otros hilos que pidan
+    la misma clave esperan y reciben el mismo resultado (o excepción)
+    en vez de repetir la llamada.
+    """
+
+    def __init__(self):
+        self._calls = {}  # key → _InFlight
+        self._lock = threading.Lock()
+        self.shared = 0  # llamadas ahorradas
+
+    def do(self, key, fn, on_success=None):
+        """
+        Ejecuta fn() una sola vez por clave concurrente.
+
+        on_success(value) corre en el hilo líder antes de liberar a los
+        que esperan (útil para guardar en caché sin ventana de carrera).
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            is_leader = call is None
+            if is_leader:
+                call = _InFlight()
+                self._calls[key] = call
+            else:
+                call.waiters += 1
+                self.shared += 1
+
+        if not is_leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.value
+
+        try:
+            value = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        else:
+            call.value = value
+            if on_success is not None:
+                on_success(value)
+            return value
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.event.set()
+
+    def in_flight(self) -> int:
+        return len(self._calls)
+
+
+class AsyncSingleFlight:
+    """
+    Variante asyncio de SingleFlight (un event loop por proceso).
+
+    La primera corrutina para una clave se lanza como task; las llamadas
+    concurrentes con la misma clave esperan esa misma task. Cancelar a
+    un llamador no cancela la task compartida.
+    """
+
+    def __init__(self):
+        self._tasks = {}  # key → asyncio.Task
+        self.shared = 0
+
+    async def do(self, key, coro_fn):
+        task = self._tasks.get(key)
+
+        if task is None:
+            task = asyncio.ensure_future(coro_fn())
+            self._tasks[key] = task
+
+            def _release(done, key=key):
+                if self._tasks.get(key) is done:
+                    del self._tasks[key]
+
+            task.add_done_callback(_release)
+        else:
+            self.shared += 1
+
+        return await asyncio.shield(task)
+
+    def in_flight(self) -> int:
+        return len(self._tasks)
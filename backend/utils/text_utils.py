@@ -0,0 +1,37 @@
+import unicodedata
+
+
+def normalize(text):
+    """
+    Minúsculas, sin tildes ni espacios extremos ("Citroën " → "citroen").
+    """
+    return (
+        unicodedata.normalize("NFKD", text)
+        .encode("ascii", "ignore")
+        .decode("utf-8")
+        .strip()
+        .lower()
+    )
+
+
+_TRUE = {"true", "1", "yes", "si", "sí"}
+_FALSE = {"false", "0", "no"}
+
+
+def parse_bool(value):
+    """
+    Booleano estricto de un body JSON: True/False, 1/0 o sus formas
+    de texto ("true", "false", "yes", "no"...). Cualquier otra cosa
+    → ValueError (bool("false") sería True).
+    """
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, int) and value in (0, 1):
+        return bool(value)
+    if isinstance(value, str):
+        text = value.strip().lower()
+        if text in _TRUE:
+            return True
+        if text in _FALSE:
+            return False
+    raise ValueError(f"Valor booleano inválido: {value!r}")
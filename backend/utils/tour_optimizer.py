@@ -0,0 +1,139 @@
+import time
+import numpy as np
+
+
+def route_cost(cost, order, closed=False) -> float:
+    """
+    Costo de recorrer `order`; closed=True vuelve al primer punto.
+    """
+    order = np.asarray(order)
+    total = float(cost[order[:-1], order[1:]].sum())
+    if closed and len(order) > 1:
+        total += float(cost[order[-1], order[0]])
+    return total
+
+
+def nearest_neighbour(cost, start=0):
+    """
+    Orden inicial: siempre al punto pendiente más barato.
+    """
+    n = len(cost)
+    visited = np.zeros(n, dtype=bool)
+    visited[start] = True
+    order = [start]
+
+    for _ in range(n - 1):
+        candidates = np.where(visited, np.inf, cost[order[-1]])
+        nxt = int(np.argmin(candidates))
+        visited[nxt] = True
+        order.append(nxt)
+
+    return order
+
+
+def _edge(cost, a, b):
+    """Costo a → b; None (fin de un recorrido abierto) cuesta 0."""
+    if a is None or b is None:
+        return 0.0
+    return cost[a, b]
+
+
+def _two_opt_pass(cost, order, closed, deadline):
+    """
+    Mejor-primera mejora 2-opt. La matriz puede ser asimétrica: al
+    invertir un tramo se usan las sumas acumuladas de sus aristas
+    en ambos sentidos, así cada movimiento se evalúa en O(1).
+    """
+    n = len(order)
+    path = np.asarray(order)
+    forward = np.concatenate(([0.0], np.cumsum(cost[path[:-1], path[1:]])))
+    backward = np.concatenate(([0.0], np.cumsum(cost[path[1:], path[:-1]])))
+
+    for i in range(1, n - 1):
+        if time.monotonic() > deadline:
+            return order, False
+
+        a = order[i - 1]
+        for j in range(i + 1, n):
+            b = order[j + 1] if j + 1 < n else (order[0] if closed else None)
+
+            delta = (
+                cost[a, order[j]] + _edge(cost, order[i], b) + (backward[j] - backward[i])
+                - cost[a, order[i]] - _edge(cost, order[j], b) - (forward[j] - forward[i])
+            )
+
+            if delta < -1e-9:
+                return order[:i] + order[i:j + 1][::-1] + order[j + 1:], True
+
+    return order, False
+
+
+def _or_opt_pass(cost, order, closed, deadline, max_segment=3):
+    """
+    Mueve tramos de 1 a max_segment puntos (sin invertirlos) a otra
+    posición del recorrido.
+    """
+    n = len(order)
+
+    for length in range(1, max_segment + 1):
+        for i in range(1, n - length + 1):
+            if time.monotonic() > deadline:
+                return order, False
+
+            first, last = order[i], order[i + length - 1]
+            prev = order[i - 1]
+            nxt = order[i + length] if i + length < n else (order[0] if closed else None)
+
+            removed_gain = (
+                cost[prev, first] + _edge(cost, last, nxt) - _edge(cost, prev, nxt)
+            )
+
+            rest = order[:i] + order[i + length:]
+            for p in range(len(rest)):
+                x = rest[p]
+                y = rest[p + 1] if p + 1 < len(rest) else (rest[0] if closed else None)
+                if p + 1 == i:
+                    continue  # misma posición
+
+                insert_cost = cost[x, first] + _edge(cost, last, y) - _edge(cost, x, y)
+
+                if insert_cost - removed_gain < -1e-9:
+                    segment = order[i:i + length]
+                    return rest[:p + 1] + segment + rest[p + 1:], True
+
+    return order, False
+
+
+def optimize_route(cost, start=0, closed=False, time_budget=1.0):
+    """
+    Orden de visita de bajo costo para una matriz de costos (N×N).
+
+    - Parte en `start`; closed=True vuelve a él al final
+    - Vecino más cercano + mejoras 2-opt y Or-opt hasta que no haya
+      mejora o se acabe time_budget (segundos)
+
+    Retorna (orden, stats).
+    """
+    cost = np.asarray(cost, dtype=np.float64)
+    started = time.monotonic()
+    deadline = started + time_budget
+
+    order = nearest_neighbour(cost, start)
+    initial = route_cost(cost, order, closed)
+    moves = 0
+
+    while time.monotonic() < deadline:
+        order, improved = _two_opt_pass(cost, order, closed, deadline)
+        if not improved:
+            order, improved = _or_opt_pass(cost, order, closed, deadline)
+        if not improved:
+            break
+        moves += 1
+
+    return order, {
+        "initial_cost": initial,
+        "final_cost": route_cost(cost, order, closed),
+        "moves": moves,
+        "elapsed_ms": round((time.monotonic() - started) * 1000, 1),
+        "timed_out": time.monotonic() >= deadline,
+    }
@@ -1,3 +1,23 @@
+import numpy as np
+
+CLIMATE_MODIFIERS = {
+    "cold": 1.10,
+    "hot": 1.05,
+    "windy": 1.08,
+    "snowy": 1.12,
+    "mild": 1.00,
+}
+
+ENGINE_MODIFIERS = {
+    "diesel": 0.95,
+    "turbo": 1.05,
+    "hybrid": 0.85,
+}
+
+SHORT_TRIP_KM = 5
+SHORT_TRIP_FACTOR = 1.15
+
+
 def calculate_fuel_consumption(
     base_fc: float,
     vehicle_weight: float,
@@ -6,9 +26,15 @@ def calculate_fuel_consumption(
     climate: str,
     distance_km: float | None = None,
     engine_type: str | None = None,
+    climb_m: float | None = None,
+    descent_m: float | None = None,
 ):
     """
     Retorna consumo ajustado en L/100km
+
+    Si se entregan climb_m / descent_m (perfil de la ruta) y distance_km,
+    la pendiente se calcula con la subida y bajada acumuladas en vez de
+    road_grade (diferencia neta origen → destino).
     """
 
     # =========================
@@ -21,7 +47,11 @@ def calculate_fuel_consumption(
     # =========================
     # 2️⃣ Ajuste por pendiente
     # =========================
-    if road_grade > 0:
+    if climb_m is not None and descent_m is not None and distance_km:
+        climb_grade = climb_m / (distance_km * 1000) * 100
+        descent_grade = descent_m / (distance_km * 1000) * 100
+        adjusted_fc *= 1 + (climb_grade / 100) - (descent_grade / 200)
+    elif road_grade > 0:
         adjusted_fc *= 1 + (road_grade / 100)
     elif road_grade < 0:
         adjusted_fc *= 1 + (road_grade / 200)
@@ -29,30 +59,151 @@ def calculate_fuel_consumption(
     # =========================
     # 3️⃣ Ajuste por clima
     # =========================
-    climate_modifiers = {
-        "cold": 1.10,
-        "hot": 1.05,
-        "windy": 1.08,
-        "snowy": 1.12,
-        "mild": 1.00,
-    }
-    adjusted_fc *= climate_modifiers.get(climate, 1.0)
+    adjusted_fc *= CLIMATE_MODIFIERS.get(climate, 1.0)
 
     # =========================
     # 4️⃣ Arranque en frío / trayectos cortos
     # =========================
-    if distance_km is not None and distance_km < 5:
-        adjusted_fc *= 1.15
+    if distance_km is not None and distance_km < SHORT_TRIP_KM:
+        adjusted_fc *= SHORT_TRIP_FACTOR
 
     # =========================
     # 5️⃣ Tipo de motor (fase futura)
     # =========================
-    if engine_type:
-        engine_modifiers = {
-            "diesel": 0.95,
-            "turbo": 1.05,
-            "hybrid": 0.85,
-        }
-        adjusted_fc *= engine_modifiers.get(engine_type.lower(), 1.0)
+    adjusted_fc *= engine_modifier(engine_type)
 
     return round(adjusted_fc, 3)
+
+
+def _column(values, n):
+    """
+    Columna float de largo n; None (o columna ausente) → NaN.
+    """
+    if values is None:
+        return np.full(n, np.nan)
+    if np.isscalar(values):
+        return np.full(n, float(values))
+    if isinstance(values, np.ndarray) and values.dtype.kind in "fiu":
+        return values.astype(float, copy=False)
+    return np.array([np.nan if v is None else v for v in values], dtype=float)
+
+
+def engine_modifier(engine_type: str | None) -> float:
+    return ENGINE_MODIFIERS.get(engine_type.lower(), 1.0) if engine_type else 1.0
+
+
+def _category_factors(values, modifiers, n, lower=False):
+    """
+    Factor por fila según un diccionario de modificadores.
+    Se busca una vez por categoría distinta, no por fila.
+    """
+    if values is None:
+        return np.ones(n)
+    if isinstance(values, str):
+        key = values.lower() if lower else values
+        return np.full(n, modifiers.get(key, 1.0) if values else 1.0)
+
+    labels = np.array(["" if v is None else str(v) for v in values])
+    keys, inverse = np.unique(labels, return_inverse=True)
+    table = np.array([
+        modifiers.get(k.lower() if lower else k, 1.0) if k else 1.0
+        for k in keys
+    ])
+    return table[inverse]
+
+
+def round_like_python(values, ndigits: int) -> np.ndarray:
+    """
+    Igual que round(x, ndigits) elemento a elemento.
+
+    np.round escala por 10**ndigits y puede elegir el otro vecino en
+    empates (x.xxx5); esos pocos casos se recalculan con round().
+    """
+    values = np.asarray(values, dtype=float)
+    rounded = np.round(values, ndigits)
+
+    scaled = values * 10.0 ** ndigits
+    near_tie = np.abs(scaled - np.floor(scaled) - 0.5) <= 1e-9 * np.maximum(1.0, np.abs(scaled))
+    near_tie &= np.isfinite(values)
+
+    for i in np.flatnonzero(near_tie):
+        rounded.flat[i] = round(float(values.flat[i]), ndigits)
+
+    return rounded
+
+
+def calculate_fuel_consumption_batch(
+    base_fc,
+    vehicle_weight,
+    extra_weight,
+    road_grade,
+    climate,
+    distance_km=None,
+    engine_type=None,
+    climb_m=None,
+    descent_m=None,
+    trip_distance_km=None,
+    engine_factor=None,
+    ndigits: int | None = 3,
+) -> np.ndarray:
+    """
+    Versión vectorizada de calculate_fuel_consumption.
+
+    Cada argumento es una columna (una fila por viaje); None en
+    distance_km / engine_type / climb_m / descent_m equivale a no
+    entregarlo en la versión escalar. Retorna L/100km por fila,
+    idéntico a llamar la función escalar fila por fila.
+
+    Para filas que son tramos de un mismo viaje:
+    - trip_distance_km: distancia usada para el ajuste de trayecto
+      corto (default distance_km de la fila)
+    - ndigits=None: sin redondeo, para integrar sobre los tramos
+
+    engine_factor: modificador de motor ya resuelto por fila (tabla de
+    coeficientes); reemplaza a engine_type.
+    """
+    base_fc = np.asarray(base_fc, dtype=float)
+    n = base_fc.shape[0]
+
+    vehicle_weight = np.asarray(vehicle_weight, dtype=float)
+    extra_weight = np.asarray(extra_weight, dtype=float)
+    road_grade = np.asarray(road_grade, dtype=float)
+    distance_km = _column(distance_km, n)
+    climb_m = _column(climb_m, n)
+    descent_m = _column(descent_m, n)
+
+    # 1️⃣ Peso
+    total_weight = vehicle_weight + extra_weight
+    adjusted_fc = base_fc * (1 + (total_weight / 1500) * 0.10)
+
+    # 2️⃣ Pendiente (perfil de ruta si existe, si no road_grade)
+    use_profile = ~np.isnan(climb_m) & ~np.isnan(descent_m) & ~np.isnan(distance_km) & (distance_km != 0)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        climb_grade = climb_m / (distance_km * 1000) * 100
+        descent_grade = descent_m / (distance_km * 1000) * 100
+        profile_factor = 1 + (climb_grade / 100) - (descent_grade / 200)
+
+    grade_factor = np.where(
+        road_grade > 0, 1 + (road_grade / 100),
+        np.where(road_grade < 0, 1 + (road_grade / 200), 1.0),
+    )
+    adjusted_fc *= np.where(use_profile, profile_factor, grade_factor)
+
+    # 3️⃣ Clima
+    adjusted_fc *= _category_factors(climate, CLIMATE_MODIFIERS, n)
+
+    # 4️⃣ Trayectos cortos
+    short_km = distance_km if trip_distance_km is None else _column(trip_distance_km, n)
+    adjusted_fc *= np.where(short_km < SHORT_TRIP_KM, SHORT_TRIP_FACTOR, 1.0)
+
+    # 5️⃣ Tipo de motor
+    if engine_factor is not None:
+        adjusted_fc *= np.asarray(engine_factor, dtype=float)
+    else:
+        adjusted_fc *= _category_factors(engine_type, ENGINE_MODIFIERS, n, lower=True)
+
+    if ndigits is None:
+        return adjusted_fc
+
+    return round_like_python(adjusted_fc, ndigits)
@@ -0,0 +1,103 @@
+import threading
+import time
+from collections import OrderedDict
+from backend.utils.single_flight import SingleFlight
+
+_MISSING = object()
+
+
+class TTLCache:
+    """
+    Caché en memoria thread-safe con expiración (TTL) y desalojo LRU.
+
+    - maxsize: máximo de entradas; al superarlo se expulsa la menos usada
+    - ttl: segundos de vida de cada entrada
+    """
+
+    def __init__(self, maxsize: int, ttl: float, name: str = "cache"):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.name = name
+
+        self._data = OrderedDict()  # key → (expires_at, value)
+        self._flights = SingleFlight()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, default=None):
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self._data.get(key)
+
+            if entry is None:
+                self.misses += 1
+                return default
+
+            expires_at, value = entry
+            if expires_at <= now:
+                del self._data[key]
+                self.misses += 1
+                return default
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value):
+        if self.maxsize <= 0:
+            return
+
+        expires_at = time.monotonic() + self.ttl
+
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_load(self, key, loader, cacheable=None):
+        """
+        Retorna el valor cacheado o lo carga con `loader()`.
+
+        Si varios hilos piden la misma clave ausente a la vez,
+        solo uno ejecuta `loader`; el resto espera y reutiliza
+        su resultado (o su excepción).
+
+        cacheable(value) → bool decide si el resultado se guarda.
+        """
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+
+        def store(loaded):
+            if cacheable is None or cacheable(loaded):
+                self.set(key, loaded)
+
+        return self._flights.do(key, loader, on_success=store)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "name": self.name,
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "ttl_seconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
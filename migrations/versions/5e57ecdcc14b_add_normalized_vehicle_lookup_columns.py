@@ -0,0 +1,74 @@
+"""add normalized vehicle lookup columns
+
+Revision ID: 5e57ecdcc14b
+Revises: a44c94f3be53
+Create Date: 2026-10-18 10:12:41.118204
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+from backend.utils.text_utils import normalize
+
+
+# revision identifiers, used by Alembic.
+revision = '5e57ecdcc14b'
+down_revision = 'a44c94f3be53'
+branch_labels = None
+depends_on = None
+
+BACKFILL_BATCH = 1000
+
+
+def upgrade():
+    # =========================
+    # NUEVAS COLUMNAS (nullable para el backfill)
+    # =========================
+    with op.batch_alter_table('vehicle', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('make_normalized', sa.String(length=100), nullable=True))
+        batch_op.add_column(sa.Column('model_normalized', sa.String(length=100), nullable=True))
+
+    # =========================
+    # BACKFILL con las mismas reglas de normalize()
+    # =========================
+    conn = op.get_bind()
+    vehicle = sa.table(
+        'vehicle',
+        sa.column('id', sa.Integer),
+        sa.column('make', sa.String),
+        sa.column('model', sa.String),
+        sa.column('make_normalized', sa.String),
+        sa.column('model_normalized', sa.String),
+    )
+
+    rows = conn.execute(sa.select(vehicle.c.id, vehicle.c.make, vehicle.c.model)).fetchall()
+    update = (
+        vehicle.update()
+        .where(vehicle.c.id == sa.bindparam('vehicle_id'))
+        .values(make_normalized=sa.bindparam('make_n'), model_normalized=sa.bindparam('model_n'))
+    )
+
+    for start in range(0, len(rows), BACKFILL_BATCH):
+        conn.execute(update, [
+            {'vehicle_id': r.id, 'make_n': normalize(r.make), 'model_n': normalize(r.model)}
+            for r in rows[start:start + BACKFILL_BATCH]
+        ])
+
+    # =========================
+    # NOT NULL + ÍNDICE DE BÚSQUEDA
+    # =========================
+    with op.batch_alter_table('vehicle', schema=None) as batch_op:
+        batch_op.alter_column('make_normalized', existing_type=sa.String(length=100), nullable=False)
+        batch_op.alter_column('model_normalized', existing_type=sa.String(length=100), nullable=False)
+        batch_op.create_index(
+            'ix_vehicle_normalized_lookup',
+            ['make_normalized', 'model_normalized', 'year'],
+            unique=False
+        )
+
+
+def downgrade():
+    with op.batch_alter_table('vehicle', schema=None) as batch_op:
+        batch_op.drop_index('ix_vehicle_normalized_lookup')
+        batch_op.drop_column('model_normalized')
+        batch_op.drop_column('make_normalized')
@@ -0,0 +1,28 @@
+"""add trip (user_id, id) index
+
+Revision ID: 9b3f2d7c41e8
+Revises: 5e57ecdcc14b
+Create Date: 2026-10-18 11:02:37.540912
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '9b3f2d7c41e8'
+down_revision = '5e57ecdcc14b'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # =========================
+    # TRIP: historial keyset por usuario
+    # =========================
+    with op.batch_alter_table('trip', schema=None) as batch_op:
+        batch_op.create_index('ix_trip_user_id_id', ['user_id', 'id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('trip', schema=None) as batch_op:
+        batch_op.drop_index('ix_trip_user_id_id')
@@ -0,0 +1,117 @@
+"""add trip summary table
+
+Revision ID: c7d4e1a93f20
+Revises: 9b3f2d7c41e8
+Create Date: 2026-10-18 11:40:05.318227
+"""
+
+from datetime import date, datetime
+
+from alembic import op
+import sqlalchemy as sa
+
+from backend.utils.text_utils import normalize
+
+
+# revision identifiers, used by Alembic.
+revision = 'c7d4e1a93f20'
+down_revision = '9b3f2d7c41e8'
+branch_labels = None
+depends_on = None
+
+BACKFILL_BATCH = 1000
+
+# Mismo valor que trip_summary_service.UNDATED_MONTH
+UNDATED_MONTH = datetime(1970, 1, 1)
+
+
+def upgrade():
+    # =========================
+    # TRIP_SUMMARY TABLE
+    # =========================
+    op.create_table(
+        'trip_summary',
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('month', sa.Date(), nullable=False),
+        sa.Column('brand', sa.String(length=100), nullable=False),
+        sa.Column('model', sa.String(length=100), nullable=False),
+        sa.Column('year', sa.Integer(), nullable=False),
+        sa.Column('trips', sa.Integer(), nullable=False),
+        sa.Column('distance_km', sa.Float(), nullable=False),
+        sa.Column('fuel_litres', sa.Float(), nullable=False),
+        sa.Column('total_cost', sa.Float(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['user.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('user_id', 'month', 'brand', 'model', 'year')
+    )
+
+    # =========================
+    # BACKFILL desde el historial (keyset por id)
+    # =========================
+    # Viajes sin created_at van al mes UNDATED_MONTH (COALESCE): no se
+    # reescribe el historial y forget_trip usa la misma clave al borrarlos
+    conn = op.get_bind()
+    trip = sa.table(
+        'trip',
+        sa.column('id', sa.Integer),
+        sa.column('user_id', sa.Integer),
+        sa.column('brand', sa.String),
+        sa.column('model', sa.String),
+        sa.column('year', sa.Integer),
+        sa.column('distance', sa.Float),
+        sa.column('fuel_consumed', sa.Float),
+        sa.column('total_cost', sa.Float),
+        sa.column('created_at', sa.DateTime),
+    )
+    summary = sa.table(
+        'trip_summary',
+        sa.column('user_id', sa.Integer),
+        sa.column('month', sa.Date),
+        sa.column('brand', sa.String),
+        sa.column('model', sa.String),
+        sa.column('year', sa.Integer),
+        sa.column('trips', sa.Integer),
+        sa.column('distance_km', sa.Float),
+        sa.column('fuel_litres', sa.Float),
+        sa.column('total_cost', sa.Float),
+    )
+
+    created_at = sa.func.coalesce(
+        trip.c.created_at, sa.literal(UNDATED_MONTH, sa.DateTime), type_=sa.DateTime
+    ).label('created_at')
+
+    groups = {}
+    last_id = 0
+
+    while True:
+        rows = conn.execute(
+            sa.select(trip.c.id, trip.c.user_id, trip.c.brand, trip.c.model, trip.c.year,
+                      trip.c.distance, trip.c.fuel_consumed, trip.c.total_cost, created_at)
+            .where(trip.c.id > last_id).order_by(trip.c.id).limit(BACKFILL_BATCH)
+        ).fetchall()
+        if not rows:
+            break
+
+        for r in rows:
+            key = (r.user_id, date(r.created_at.year, r.created_at.month, 1),
+                   normalize(r.brand), normalize(r.model), r.year)
+            totals = groups.setdefault(key, [0, 0.0, 0.0, 0.0])
+            totals[0] += 1
+            totals[1] += r.distance or 0
+            totals[2] += r.fuel_consumed or 0
+            totals[3] += r.total_cost or 0
+
+        last_id = rows[-1].id
+
+    values = [
+        {
+            'user_id': key[0], 'month': key[1], 'brand': key[2], 'model': key[3], 'year': key[4],
+            'trips': t[0], 'distance_km': t[1], 'fuel_litres': t[2], 'total_cost': t[3],
+        }
+        for key, t in groups.items()
+    ]
+    for start in range(0, len(values), BACKFILL_BATCH):
+        conn.execute(summary.insert(), values[start:start + BACKFILL_BATCH])
+
+
+def downgrade():
+    op.drop_table('trip_summary')
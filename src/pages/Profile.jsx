@@ -5,10 +5,22 @@ import { API_BASE_URL } from "../config/api";
 import TripCard from "../components/TripCard";
 import "../styles/Profile.css";
 
+// Historial paginado: una página por pedido; el cursor de la
+// siguiente llega en el header X-Next-Cursor
+const fetchTripsPage = async (headers, cursor = null) => {
+  const res = await axios.get(`${API_BASE_URL}/api/trips`, {
+    headers,
+    params: cursor ? { cursor } : {},
+  });
+  return { page: res.data, cursor: res.headers["x-next-cursor"] || null };
+};
+
 const Profile = () => {
   const [user, setUser] = useState(null);
   const [trips, setTrips] = useState([]);
   const [sortBy, setSortBy] = useState("reciente");
+  const [nextCursor, setNextCursor] = useState(null);
+  const [loadingMore, setLoadingMore] = useState(false);
   const navigate = useNavigate();
 
   useEffect(() => {
@@ -19,13 +31,14 @@ const Profile = () => {
       try {
         const headers = { Authorization: `Bearer ${token}` };
 
-        const [userRes, tripsRes] = await Promise.all([
+        const [userRes, firstPage] = await Promise.all([
           axios.get(`${API_BASE_URL}/api/user`, { headers }),
-          axios.get(`${API_BASE_URL}/api/trips`, { headers }),
+          fetchTripsPage(headers),
         ]);
 
         setUser(userRes.data);
-        setTrips(tripsRes.data);
+        setTrips(firstPage.page);
+        setNextCursor(firstPage.cursor);
       } catch (error) {
         console.error("Error al cargar datos:", error);
         localStorage.removeItem("token");
@@ -36,6 +49,25 @@ const Profile = () => {
     fetchUserAndTrips();
   }, [navigate]);
 
+  const handleLoadMore = async () => {
+    const token = localStorage.getItem("token");
+    if (!token) return navigate("/login");
+
+    setLoadingMore(true);
+    try {
+      const { page, cursor } = await fetchTripsPage(
+        { Authorization: `Bearer ${token}` },
+        nextCursor
+      );
+      setTrips((prev) => [...prev, ...page]);
+      setNextCursor(cursor);
+    } catch (error) {
+      console.error("Error al cargar más viajes:", error);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   const sortedTrips = [...trips].sort((a, b) => {
     if (sortBy === "costo") return b.total_cost - a.total_cost;
     if (sortBy === "distancia") return b.distance - a.distance;
@@ -88,6 +120,16 @@ const Profile = () => {
                 ))}
               </div>
             )}
+
+            {nextCursor && (
+              <button
+                className="btn-load-more"
+                onClick={handleLoadMore}
+                disabled={loadingMore}
+              >
+                {loadingMore ? "Cargando..." : "Cargar más viajes"}
+              </button>
+            )}
           </div>
 
           <button className="btn-back" onClick={() => navigate("/")}>